@@ -1,6 +1,7 @@
 # backend/app/api/endpoints/auth.py
-from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pymongo.database import Database
 from bson import ObjectId
@@ -8,30 +9,93 @@ from bson import ObjectId
 from ...models.user import User
 from ...schemas.auth import Token, LoginRequest
 from ...schemas.user import UserCreate, UserResponse
-from ...core.security import create_access_token, get_password_hash, verify_password
-from ...core.auth import get_current_user, get_current_admin
+from ...core.security import create_access_token, password_hasher
+from ...core.auth import get_current_user, get_current_admin, invalidate_principal
+from ...core.metrics import LOGIN_THROTTLED
+from ...services import throttle_service
 from ...dependencies import get_database
 from ...config import settings
 
 router = APIRouter()
 
+async def authenticate(db: Database, username: str, password: str):
+    """
+    Find a user by username or email and check the password.
+    
+    The stored hash is upgraded if it uses deprecated settings.
+    
+    Args:
+        db: MongoDB database instance
+        username: Username or email
+        password: Password in plain text
+
+    Returns:
+        User document, or None if the credentials are wrong
+    """
+    # Try to find user by username
+    user = await db.users.find_one({"username": username})
+    
+    # If not found, try by email
+    if not user:
+        user = await db.users.find_one({"email": username})
+    
+    if not user:
+        return None
+    
+    verified, new_hash = await password_hasher.verify(password, user["hashed_password"])
+    if not verified:
+        return None
+    
+    if new_hash:
+        await db.users.update_one(
+            {"_id": user["_id"]},
+            {"$set": {"hashed_password": new_hash, "updated_at": datetime.utcnow()}},
+        )
+        invalidate_principal(user["_id"])
+    
+    return user
+
+async def throttle_login(db: Database, request: Request, username: str) -> None:
+    """
+    Reject a login attempt when its client IP or username is out of attempts.
+    
+    Runs before the user lookup and the password hash check, which is
+    what a burst of attempts would otherwise spend its CPU on.
+    
+    Args:
+        db: MongoDB database instance
+        request: Incoming request
+        username: Username or email as submitted
+
+    Raises:
+        HTTPException: 429 with Retry-After
+    """
+    client_ip = throttle_service.client_address(
+        request.client.host if request.client else None, request.headers.get("x-forwarded-for")
+    )
+    wait = await throttle_service.check_login(db, client_ip, username)
+    if wait:
+        LOGIN_THROTTLED.inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Try again later.",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Database = Depends(get_database),
 ):
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    # Try to find user by username
-    user = await db.users.find_one({"username": form_data.username})
+    await throttle_login(db, request, form_data.username)
+    user = await authenticate(db, form_data.username, form_data.password)
     
-    # If not found, try by email
+    # If not found or password doesn't match, raise error
     if not user:
-        user = await db.users.find_one({"email": form_data.username})
-    
-    # If still not found or password doesn't match, raise error
-    if not user or not verify_password(form_data.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -48,21 +112,18 @@ async def login(
 
 @router.post("/login/json", response_model=Token)
 async def login_json(
+    request: Request,
     login_data: LoginRequest,
     db: Database = Depends(get_database),
 ):
     """
     JSON login endpoint, alternative to the OAuth2 compatible endpoint.
     """
-    # Try to find user by username
-    user = await db.users.find_one({"username": login_data.username})
+    await throttle_login(db, request, login_data.username)
+    user = await authenticate(db, login_data.username, login_data.password)
     
-    # If not found, try by email
+    # If not found or password doesn't match, raise error
     if not user:
-        user = await db.users.find_one({"email": login_data.username})
-    
-    # If still not found or password doesn't match, raise error
-    if not user or not verify_password(login_data.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -104,7 +165,7 @@ async def register(
     
     # Create user with hashed password
     user_dict = user_data.dict()
-    user_dict["hashed_password"] = get_password_hash(user_dict.pop("password"))
+    user_dict["hashed_password"] = await password_hasher.hash(user_dict.pop("password"))
     
     # Set first user as admin if no users exist
     count = await db.users.count_documents({})
@@ -150,7 +211,7 @@ async def init_admin(
     admin_user = {
         "username": settings.ADMIN_USERNAME,
         "email": settings.ADMIN_EMAIL,
-        "hashed_password": get_password_hash(settings.ADMIN_PASSWORD),
+        "hashed_password": await password_hasher.hash(settings.ADMIN_PASSWORD),
         "is_admin": True,
         "full_name": "Admin User",
     }
@@ -0,0 +1,79 @@
+# backend/app/api/endpoints/feeds.py
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response, StreamingResponse
+from pymongo.database import Database
+
+from ...core import http_cache
+from ...config import settings
+from ...dependencies import get_database
+from ...services import feed_service, post_service
+
+router = APIRouter()
+
+def _headers(etag: str, last_modified: datetime) -> dict:
+    return {
+        "ETag": etag,
+        "Last-Modified": feed_service.http_date(last_modified),
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}",
+    }
+
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return http_cache.etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= since
+    return False
+
+async def _serve(name: str, media_type: str, generate, request: Request, db: Database) -> Response:
+    """
+    Answer a feed request from the cached document, with a 304, or by
+    streaming a fresh document that is cached once complete.
+    """
+    await post_service.sync(db)
+    
+    document = feed_service.cached(name)
+    if document is not None:
+        headers = _headers(document.etag, document.last_modified)
+        if _not_modified(request, document.etag, document.last_modified):
+            return Response(status_code=304, headers=headers)
+        return Response(content=document.body, media_type=media_type, headers=headers)
+    
+    generation = post_service.generation()
+    updated = await feed_service.last_modified(db)
+    etag = http_cache.make_etag([name, post_service.version(), updated.isoformat()])
+    headers = _headers(etag, updated)
+    if _not_modified(request, etag, updated):
+        return Response(status_code=304, headers=headers)
+    
+    async def stream():
+        chunks = []
+        async for chunk in generate(db, updated):
+            chunks.append(chunk)
+            yield chunk
+        feed_service.store(name, feed_service.Document(b"".join(chunks), etag, updated, generation))
+    
+    return StreamingResponse(stream(), media_type=media_type, headers=headers)
+
+@router.get("/feed.xml")
+async def rss_feed(request: Request, db: Database = Depends(get_database)):
+    """
+    RSS 2.0 feed of the latest published posts.
+    Cached until the next post write; conditional requests get a 304.
+    """
+    return await _serve("feed", "application/rss+xml", feed_service.rss, request, db)
+
+@router.get("/sitemap.xml")
+async def sitemap(request: Request, db: Database = Depends(get_database)):
+    """
+    Sitemap of the published posts.
+    Cached until the next post write; conditional requests get a 304.
+    """
+    return await _serve("sitemap", "application/xml", feed_service.sitemap, request, db)
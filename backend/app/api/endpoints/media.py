@@ -0,0 +1,49 @@
+# backend/app/api/endpoints/media.py
+import os
+from fastapi import APIRouter, HTTPException, Query
+
+from ...schemas.media import ImageVariants
+from ...config import settings
+from ...services import media_service
+
+router = APIRouter()
+
+@router.get("/variants", response_model=ImageVariants)
+async def get_image_variants(
+    url: str = Query(..., description="URL returned by the image upload, e.g. /media/images/<name>.jpg"),
+):
+    """
+    Get the responsive variants of an uploaded image.
+    Variants are generated in the background after upload; until they are
+    ready the status is "pending" and the original should be used. It is
+    "failed" for images that could not be processed.
+    """
+    filename = os.path.basename(url)
+    if url != f"/media/{media_service.IMAGES_DIR}/{filename}" or not media_service.is_original(filename):
+        raise HTTPException(status_code=400, detail="Not an uploaded image URL")
+    
+    if not os.path.exists(os.path.join(settings.MEDIA_ROOT, media_service.IMAGES_DIR, filename)):
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    status, manifest = media_service.get_variants(filename)
+    
+    # Files uploaded before variants existed (or through another worker) get
+    # queued here; failed images are not retried and queueing is bounded
+    if status == "unavailable" and media_service.schedule_variants(filename):
+        status, manifest = media_service.get_variants(filename)
+    
+    if manifest is None:
+        return ImageVariants(url=url, status=status)
+    
+    srcset = {}
+    for variant in manifest["variants"]:
+        srcset.setdefault(variant["media_type"], []).append(f"{variant['url']} {variant['width']}w")
+    
+    return ImageVariants(
+        url=url,
+        status=status,
+        width=manifest["width"],
+        height=manifest["height"],
+        variants=manifest["variants"],
+        srcset={media_type: ", ".join(entries) for media_type, entries in srcset.items()},
+    )
@@ -1,95 +1,262 @@
 # backend/app/api/endpoints/posts.py
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Form, status
+from fastapi.responses import StreamingResponse
 from pymongo.database import Database
 from bson import ObjectId
+import asyncio
 import slugify
-import os
-import shutil
 from datetime import datetime
 
 from ...models.user import User
 from ...models.post import Post
-from ...schemas.post import PostCreate, PostUpdate, PostResponse, PostList
+from ...schemas.post import PostCreate, PostUpdate, PostResponse, PostList, PostImportResult, PostBatch, PostBatchResult, RelatedPosts
+from ...core import http_cache, serialization
 from ...core.auth import get_current_admin, get_current_user, get_optional_current_user
 from ...dependencies import get_database
 from ...config import settings
+from ...services import batch_service, media_service, post_service, related_service, render_service, transfer_service
+from ...services.search_service import search_index
 
 router = APIRouter()
 
+def _listing_response(request: Request, viewer: str, listing: dict, generation: int):
+    """
+    Serialize a listing (shaped like PostList) into the response cache,
+    with an ETag keyed off its posts' updated_at.
+    """
+    etag = http_cache.make_etag(
+        [viewer, listing["total"], listing["page"], listing["page_size"], listing["next_cursor"]]
+        + [f"{post['_id']}:{post['updated_at']}" for post in listing["posts"]]
+    )
+    return http_cache.store(
+        request,
+        viewer,
+        serialization.dumps(listing),
+        etag,
+        cacheable=generation == post_service.generation(),
+    )
+
 @router.get("/", response_model=PostList)
 async def list_posts(
+    request: Request,
     db: Database = Depends(get_database),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     tag: Optional[str] = None,
     search: Optional[str] = None,
+    after: Optional[str] = Query(None, alias="cursor"),
+    count: Literal["exact", "estimated", "none"] = "exact",
+    view: Literal["full", "summary"] = "full",
     current_user: Optional[User] = Depends(get_optional_current_user),
 ):
     """
     List all published posts with pagination.
     If authenticated as admin, show all posts including unpublished ones.
+    
+    Pass the `next_cursor` of a previous response as `cursor` to fetch the
+    following page with a range query instead of skipping documents;
+    `page` is ignored in that case.
+    
+    Totals are cached until the next write. `count=estimated` uses the
+    collection metadata count when no filter applies, and `count=none`
+    skips counting and only reports `has_more`.
+    
+    `view=summary` leaves post content out (it is never read from MongoDB),
+    for pages that only show titles, summaries, tags and dates.
+    
+    Responses are cached per query and viewer class until the next write,
+    and carry an ETag so revalidation is answered with 304.
     """
     skip = (page - 1) * page_size
+    is_admin = bool(current_user and current_user.is_admin)
+    
+    # Pick up posts written through other workers
+    await post_service.sync(db)
+    
+    # Serve from the response cache if possible
+    viewer = http_cache.viewer_class(current_user)
+    cached = http_cache.lookup(request, viewer)
+    if cached is not None:
+        return cached
+    generation = post_service.generation()
+    projection = post_service.SUMMARY_PROJECTION if view == "summary" else None
+    fields = serialization.SUMMARY_FIELDS if view == "summary" else serialization.POST_FIELDS
+    
+    # Search is answered by the in-process index; only the page is fetched
+    if search:
+        if after:
+            raise HTTPException(
+                status_code=400,
+                detail="Cursor pagination is not supported for search",
+            )
+        
+        result = search_index.search(search, published_only=not is_admin, tag=tag)
+        hits = result.hits[skip:skip + page_size]
+        
+        cursor = db.posts.find({"_id": {"$in": [ObjectId(hit.post_id) for hit in hits]}}, projection)
+        docs = {str(post["_id"]): post for post in await cursor.to_list(length=page_size)}
+        posts = [
+            serialization.post_document(
+                docs[hit.post_id], fields, highlight=search_index.snippet(hit.post_id, result.terms)
+            )
+            for hit in hits
+            if hit.post_id in docs
+        ]
+        
+        listing = {
+            "posts": posts,
+            "total": result.total,
+            "page": page,
+            "page_size": page_size,
+            "pages": (result.total + page_size - 1) // page_size,
+            "has_more": skip + page_size < result.total,
+            "next_cursor": None,
+        }
+        return _listing_response(request, viewer, listing, generation)
     
     # Build the filter
     filter_query = {}
     
     # Only show published posts unless the user is an admin
-    if not current_user or not current_user.is_admin:
+    if not is_admin:
         filter_query["is_published"] = True
     
     # Filter by tag if provided
     if tag:
         filter_query["tags"] = tag
     
-    # Add search if provided
-    if search:
-        filter_query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"content": {"$regex": search, "$options": "i"}},
-            {"summary": {"$regex": search, "$options": "i"}},
-        ]
-    
-    # Get total count
-    total = await db.posts.count_documents(filter_query)
+    # Get paginated posts, one extra to know whether another page follows
+    if after:
+        try:
+            range_query = {**filter_query, **post_service.after_cursor(after)}
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        cursor = db.posts.find(range_query, projection).sort(post_service.LISTING_SORT).limit(page_size + 1)
+    else:
+        cursor = db.posts.find(filter_query, projection).sort(post_service.LISTING_SORT).skip(skip).limit(page_size + 1)
     
-    # Get paginated posts
-    cursor = db.posts.find(filter_query).sort("created_at", -1).skip(skip).limit(page_size)
-    posts = [Post(**post) for post in await cursor.to_list(length=page_size)]
+    # Get total count (usually cached) alongside the page
+    if count == "none":
+        total = None
+        docs = await cursor.to_list(length=page_size + 1)
+    else:
+        total, docs = await asyncio.gather(
+            post_service.count_posts(db, filter_query, estimated=count == "estimated"),
+            cursor.to_list(length=page_size + 1),
+        )
+    # Documents go straight to JSON; they were validated when written
+    posts = [serialization.post_document(post, fields) for post in docs[:page_size]]
+    has_more = len(docs) > page_size
     
     # Calculate total pages
-    pages = (total + page_size - 1) // page_size
-    
-    return PostList(
-        posts=posts,
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=pages,
+    pages = (total + page_size - 1) // page_size if total is not None else None
+    
+    listing = {
+        "posts": posts,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": pages,
+        "has_more": has_more,
+        "next_cursor": post_service.encode_cursor(docs[page_size - 1]) if has_more else None,
+    }
+    return _listing_response(request, viewer, listing, generation)
+
+# Under "/-/", which no slug can be, so it never hides a post (slugify drops a lone "-")
+@router.get("/-/export")
+async def export_posts(
+    db: Database = Depends(get_database),
+    current_user: User = Depends(get_current_admin),
+):
+    """
+    Export every post as NDJSON, one document per line (admin only).
+    The response is streamed from the database cursor.
+    """
+    filename = f"posts-{datetime.utcnow():%Y%m%d%H%M%S}.ndjson"
+    return StreamingResponse(
+        transfer_service.export_posts(db),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 @router.get("/{slug}", response_model=PostResponse)
 async def get_post(
     slug: str,
+    request: Request,
     db: Database = Depends(get_database),
     current_user: Optional[User] = Depends(get_optional_current_user),
 ):
     """
     Get a post by slug.
     If not published, only the admin can view it.
+    
+    Responses are cached until the next write, with an ETag derived from
+    the post's updated_at.
     """
+    await post_service.sync(db)
+    
+    viewer = http_cache.viewer_class(current_user)
+    cached = http_cache.lookup(request, viewer)
+    if cached is not None:
+        return cached
+    generation = post_service.generation()
+    
     post = await db.posts.find_one({"slug": slug})
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    post_obj = Post(**post)
-    
     # Check if post is published or user is admin
-    if not post_obj.is_published and (not current_user or not current_user.is_admin):
+    if not post.get("is_published") and (not current_user or not current_user.is_admin):
         raise HTTPException(status_code=404, detail="Post not found")
     
-    return post_obj
+    return http_cache.store(
+        request,
+        viewer,
+        serialization.dumps(serialization.post_document(post)),
+        http_cache.make_etag([post["_id"], post["updated_at"].isoformat()]),
+        cacheable=generation == post_service.generation(),
+    )
+
+@router.get("/{slug}/related", response_model=RelatedPosts)
+async def get_related_posts(
+    slug: str,
+    request: Request,
+    limit: int = Query(settings.RELATED_POSTS_K, ge=1, le=settings.RELATED_POSTS_K),
+    db: Database = Depends(get_database),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+):
+    """
+    Get published posts similar to a post, best match first.
+    Neighbours are precomputed in the background when posts change, so
+    this only reads them; the list is empty until they are computed.
+    """
+    post = await db.posts.find_one({"slug": slug}, {"_id": 1, "is_published": 1})
+    if not post or (not post.get("is_published") and (not current_user or not current_user.is_admin)):
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    neighbours = await related_service.get_related(db, post["_id"], limit)
+    scores = {n["_id"]: n["score"] for n in neighbours}
+    docs = await db.posts.find(
+        {"_id": {"$in": list(scores)}, "is_published": True}, post_service.SUMMARY_PROJECTION
+    ).to_list(None)
+    docs.sort(key=lambda doc: -scores[doc["_id"]])
+    
+    posts = []
+    for doc in docs:
+        item = serialization.post_document(doc, serialization.SUMMARY_FIELDS)
+        item["score"] = scores[doc["_id"]]
+        posts.append(item)
+    
+    # Not kept in the response cache: neighbours change when the
+    # background refresh finishes, not when a post is written
+    return http_cache.store(
+        request,
+        http_cache.viewer_class(current_user),
+        serialization.dumps({"posts": posts}),
+        http_cache.make_etag([f"{item['_id']}:{item['score']}:{item['updated_at']}" for item in posts]),
+        cacheable=False,
+    )
 
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
 async def create_post(
@@ -112,9 +279,13 @@ async def create_post(
             detail=f"Post with slug '{post.slug}' already exists",
         )
     
+    # Render once here so reads never convert Markdown
+    rendered = await render_service.render_post(post.content)
+    
     # Create new post
     new_post = Post(
         **post.dict(),
+        **rendered,
         author_id=ObjectId(current_user.id),
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
@@ -125,9 +296,47 @@ async def create_post(
     
     # Get the created post
     created_post = await db.posts.find_one({"_id": result.inserted_id})
+    await post_service.post_saved(db, created_post)
     
     return Post(**created_post)
 
+@router.post("/import", response_model=PostImportResult)
+async def import_posts(
+    request: Request,
+    db: Database = Depends(get_database),
+    current_user: User = Depends(get_current_admin),
+):
+    """
+    Import posts from an NDJSON request body, as produced by /-/export (admin only).
+    Posts are upserted by slug in batches; invalid lines are reported
+    and skipped.
+    """
+    try:
+        result = await transfer_service.import_posts(db, request.stream(), ObjectId(current_user.id))
+    except transfer_service.ImportLineTooLongError as exc:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Line {exc.line} is too long. Maximum size is {settings.MAX_UPLOAD_SIZE} bytes",
+        )
+    finally:
+        # Part of the stream may have been written even if it failed later
+        await post_service.posts_changed(db)
+    
+    return result
+
+@router.post("/batch", response_model=PostBatchResult)
+async def batch_posts(
+    batch: PostBatch,
+    db: Database = Depends(get_database),
+    current_user: User = Depends(get_current_admin),
+):
+    """
+    Publish, unpublish, retag or delete many posts at once (admin only).
+    Posts are selected by ids or by a filter; the result reports what
+    happened to each of them.
+    """
+    return await batch_service.run_batch(db, batch)
+
 @router.put("/{post_id}", response_model=PostResponse)
 async def update_post(
     post_id: str,
@@ -158,6 +367,11 @@ async def update_post(
                 detail=f"Post with slug '{update_data['slug']}' already exists",
             )
     
+    # Re-render only when the content actually changed
+    if update_data.get("content") is not None:
+        if render_service.content_hash(update_data["content"]) != existing.get("content_hash"):
+            update_data.update(await render_service.render_post(update_data["content"]))
+    
     # Add updated_at timestamp
     update_data["updated_at"] = datetime.utcnow()
     
@@ -168,6 +382,7 @@ async def update_post(
     
     # Get the updated post
     updated_post = await db.posts.find_one({"_id": ObjectId(post_id)})
+    await post_service.post_saved(db, updated_post, existing)
     
     return Post(**updated_post)
 
@@ -187,6 +402,7 @@ async def delete_post(
     
     # Delete from database
     await db.posts.delete_one({"_id": ObjectId(post_id)})
+    await post_service.post_deleted(db, existing)
     
     return None
 
@@ -197,6 +413,8 @@ async def upload_image(
 ):
     """
     Upload an image for a post (admin only).
+    Files are stored by content hash, so uploading the same file again
+    returns the existing URL.
     """
     # Validate file extension
     extension = file.filename.split(".")[-1].lower()
@@ -206,18 +424,20 @@ async def upload_image(
             detail=f"File extension not allowed. Allowed extensions: {settings.ALLOWED_UPLOAD_EXTENSIONS}",
         )
     
-    # Create uploads directory if it doesn't exist
-    upload_dir = os.path.join(settings.MEDIA_ROOT, "images")
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # Generate unique filename
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-    filename = f"{timestamp}_{file.filename}"
-    file_path = os.path.join(upload_dir, filename)
+    # Stream to disk, deduplicating by content
+    try:
+        url, existing = await media_service.save_upload(file, extension)
+    except media_service.UploadTooLargeError:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE} bytes",
+        )
     
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Resized variants and compressed copies are generated in the background;
+    # see GET /api/media/variants
+    filename = url.rsplit("/", 1)[-1]
+    has_variants = media_service.schedule_variants(filename)
+    media_service.schedule_precompression(filename)
     
     # Return the URL
-    return {"url": f"/media/images/{filename}"}
\ No newline at end of file
+    return {"url": url, "existing": existing, "has_variants": has_variants}
\ No newline at end of file
@@ -0,0 +1,29 @@
+# backend/app/api/endpoints/profiles.py
+import os
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from ...models.user import User
+from ...core.auth import get_current_admin
+from ...core.profiling import PROFILE_NAME_RE, profile_names
+from ...config import settings
+
+router = APIRouter()
+
+@router.get("/", response_model=List[str])
+async def list_profiles(current_user: User = Depends(get_current_admin)):
+    """
+    List stored request profiles, newest first (admin only).
+    """
+    return profile_names()
+
+@router.get("/{name}")
+async def get_profile(name: str, current_user: User = Depends(get_current_admin)):
+    """
+    Download a request profile in speedscope format (admin only).
+    """
+    path = os.path.join(settings.PROFILE_DIR, name)
+    if not PROFILE_NAME_RE.match(name) or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=name)
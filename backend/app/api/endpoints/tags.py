@@ -0,0 +1,46 @@
+# backend/app/api/endpoints/tags.py
+from typing import Optional
+from fastapi import APIRouter, Depends, Request
+from pymongo.database import Database
+
+from ...models.user import User
+from ...schemas.tag import TagList
+from ...core import http_cache, serialization
+from ...core.auth import get_optional_current_user
+from ...dependencies import get_database
+from ...services import post_service, tag_service
+
+router = APIRouter()
+
+@router.get("/", response_model=TagList)
+async def list_tags(
+    request: Request,
+    db: Database = Depends(get_database),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+):
+    """
+    List tags with the number of posts using them, most used first.
+    The public list only counts published posts; the admin also sees
+    tags used only by drafts, with their total counts.
+    """
+    await post_service.sync(db)
+    
+    viewer = http_cache.viewer_class(current_user)
+    cached = http_cache.lookup(request, viewer)
+    if cached is not None:
+        return cached
+    generation = post_service.generation()
+    
+    admin = viewer == "admin"
+    tags = [
+        {"name": tag["_id"], "published": tag["published"], "total": tag["total"] if admin else None}
+        for tag in await tag_service.list_tags(db, published_only=not admin)
+    ]
+    
+    return http_cache.store(
+        request,
+        viewer,
+        serialization.dumps({"tags": tags}),
+        http_cache.make_etag([viewer] + [f"{t['name']}:{t['published']}:{t['total']}" for t in tags]),
+        cacheable=generation == post_service.generation(),
+    )
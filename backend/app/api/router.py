@@ -1,9 +1,12 @@
 # backend/app/api/router.py
 from fastapi import APIRouter
-from .endpoints import posts, auth
+from .endpoints import posts, auth, media, tags, profiles
 
 api_router = APIRouter()
 
 # Include routers from endpoints
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(posts.router, prefix="/posts", tags=["posts"])
\ No newline at end of file
+api_router.include_router(posts.router, prefix="/posts", tags=["posts"])
+api_router.include_router(media.router, prefix="/media", tags=["media"])
+api_router.include_router(tags.router, prefix="/tags", tags=["tags"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
\ No newline at end of file
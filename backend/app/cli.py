@@ -0,0 +1,57 @@
+# backend/app/cli.py
+"""
+Maintenance commands, run from the backend directory:
+
+    python -m app.cli rebuild-tags
+    python -m app.cli rebuild-related
+    python -m app.cli build-snapshot
+"""
+import argparse
+import asyncio
+
+from pymongo.database import Database
+
+from . import dependencies
+from .config import settings
+from .services import related_service, snapshot_service, tag_service
+
+async def rebuild_tags(database: Database) -> None:
+    """Recompute the tags collection from the posts."""
+    count = await tag_service.rebuild(database)
+    print(f"Rebuilt {count} tags")
+
+async def rebuild_related(database: Database) -> None:
+    """Recompute the related posts of every post."""
+    count = await related_service.refresh(database)
+    print(f"Computed related posts for {count} posts")
+
+async def build_snapshot(database: Database) -> None:
+    """Rewrite the static snapshot of published content from scratch."""
+    if not snapshot_service.enabled():
+        raise SystemExit("SNAPSHOT_ROOT is not set")
+    stats = await snapshot_service.build(database)
+    print(f"Snapshot in {settings.SNAPSHOT_ROOT}: {stats['written']} written, "
+          f"{stats['unchanged']} unchanged, {stats['removed']} removed")
+
+COMMANDS = {
+    "rebuild-tags": rebuild_tags,
+    "rebuild-related": rebuild_related,
+    "build-snapshot": build_snapshot,
+}
+
+async def run(command) -> None:
+    """Run a command with a client of its own, closed afterwards."""
+    database = dependencies.connect()
+    try:
+        await command(database)
+    finally:
+        dependencies.disconnect()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Portfolio maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+    asyncio.run(run(COMMANDS[args.command]))
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,19 @@ class Settings(BaseModel):
     SECRET_KEY: str = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))  # hashes with other rounds are upgraded at login
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))  # concurrent bcrypt hashes per worker
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+    PRINCIPAL_CACHE_TTL: float = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))  # seconds
+    # Login throttling per client IP and per username, shared by workers (see services/throttle_service.py).
+    # The client IP is the last X-Forwarded-For entry not appended by one of these proxies
+    # (addresses or CIDR ranges); entries further left come from the client and are ignored.
+    LOGIN_IP_BURST: int = int(os.getenv("LOGIN_IP_BURST", "20"))  # attempts at once, 0 = no IP limit
+    LOGIN_IP_PER_MINUTE: float = float(os.getenv("LOGIN_IP_PER_MINUTE", "10"))  # attempts regained per minute
+    LOGIN_USER_BURST: int = int(os.getenv("LOGIN_USER_BURST", "10"))  # attempts at once, 0 = no username limit
+    LOGIN_USER_PER_MINUTE: float = float(os.getenv("LOGIN_USER_PER_MINUTE", "5"))
+    TRUSTED_PROXIES: List[str] = [p.strip() for p in os.getenv("TRUSTED_PROXIES", "127.0.0.1,::1").split(",") if p.strip()]
+    LOGIN_THROTTLE_CACHE_SIZE: int = int(os.getenv("LOGIN_THROTTLE_CACHE_SIZE", "10000"))  # empty buckets remembered per worker
     
     # CORS - Development mode
     CORS_ORIGINS: List[str] = [
@@ -26,11 +39,77 @@ class Settings(BaseModel):
     # MongoDB
     MONGODB_URI: str = os.getenv("MONGODB_URI", "mongodb://mongodb:27017")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "academic_portfolio")
+    # Connection pool, per worker process
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "4"))  # opened at startup and kept open
+    MONGODB_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+    MONGODB_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))  # wait for a free connection
+    MONGODB_READY_TIMEOUT_MS: int = int(os.getenv("MONGODB_READY_TIMEOUT_MS", "1000"))  # /ready ping deadline
+    READY_MAX_POOL_SATURATION: float = float(os.getenv("READY_MAX_POOL_SATURATION", "1.0"))  # share of the pool in use
+    
+    # Request every GET route once at worker startup, before accepting traffic (see core/warmup.py)
+    STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+    # Page sizes the frontend lists posts with (Home.jsx 6, api.js default 10); their first summary page is primed
+    WARMUP_PAGE_SIZES: List[int] = [int(n) for n in os.getenv("WARMUP_PAGE_SIZES", "6,10").split(",") if n]
+    
+    # Metrics
+    LOOP_LAG_INTERVAL: float = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))  # seconds between event loop lag samples
+    
+    # Request profiling (see core/profiling.py)
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_SAMPLE_RATE: int = int(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # profile 1 in N requests, 0 = off
+    PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", "200"))  # oldest profiles are deleted beyond this
+    PROFILE_INTERVAL: float = float(os.getenv("PROFILE_INTERVAL", "0.001"))  # seconds between samples
+    
+    # Posts
+    POSTS_SYNC_INTERVAL: float = float(os.getenv("POSTS_SYNC_INTERVAL", "2"))  # seconds between cross-worker checks
+    POSTS_SYNC_MAX_CHANGES: int = int(os.getenv("POSTS_SYNC_MAX_CHANGES", "500"))  # beyond this a sync reloads everything
+    POST_CHANGES_TTL: int = int(os.getenv("POST_CHANGES_TTL", "86400"))  # seconds the change log is kept
+    COUNT_CACHE_SIZE: int = int(os.getenv("COUNT_CACHE_SIZE", "512"))
+    RENDER_CACHE_SIZE: int = int(os.getenv("RENDER_CACHE_SIZE", "256"))  # rendered bodies kept by content hash
+    RELATED_POSTS_K: int = int(os.getenv("RELATED_POSTS_K", "5"))  # neighbours stored per post
+    RELATED_TAG_WEIGHT: float = float(os.getenv("RELATED_TAG_WEIGHT", "0.3"))  # share of tag Jaccard vs TF-IDF cosine
+    RELATED_MAX_FEATURES: int = int(os.getenv("RELATED_MAX_FEATURES", "5000"))  # TF-IDF vocabulary size
+    # Static JSON snapshot of published content for nginx/CDN; disabled when empty
+    SNAPSHOT_ROOT: str = os.getenv("SNAPSHOT_ROOT", "")
+    SNAPSHOT_PAGE_SIZE: int = int(os.getenv("SNAPSHOT_PAGE_SIZE", "10"))  # listing page size, as the frontend requests
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))  # posts per bulk_write
+    READING_WORDS_PER_MINUTE: int = int(os.getenv("READING_WORDS_PER_MINUTE", "200"))
+    
+    # HTTP response cache for post reads
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))  # seconds
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: int = int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", "300"))
+    
+    # Response compression; the level/quality settings are the CPU budget per response
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))  # bytes
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))  # 0-11
+    COMPRESSION_CACHE_MAX_BYTES: int = int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
     
     # File uploads
     MEDIA_ROOT: str = os.getenv("MEDIA_ROOT", "media")
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10 MB
     ALLOWED_UPLOAD_EXTENSIONS: List[str] = ["jpg", "jpeg", "png", "gif", "pdf"]
+    MEDIA_MAX_AGE: int = int(os.getenv("MEDIA_MAX_AGE", "3600"))  # seconds, for files that may change
+    # Internal nginx location to hand media transfers to (X-Accel-Redirect), e.g. /_media in nginx/nginx.conf
+    MEDIA_ACCEL_REDIRECT: str = os.getenv("MEDIA_ACCEL_REDIRECT", "")
+    
+    # Responsive image variants generated in the background after upload
+    IMAGE_VARIANT_WIDTHS: List[int] = [
+        int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "480,960,1600").split(",") if w
+    ]
+    IMAGE_VARIANT_WORKERS: int = int(os.getenv("IMAGE_VARIANT_WORKERS", "1"))
+    IMAGE_VARIANT_QUEUE_SIZE: int = int(os.getenv("IMAGE_VARIANT_QUEUE_SIZE", "16"))  # images queued per worker
+    WEBP_QUALITY: int = int(os.getenv("WEBP_QUALITY", "80"))
+    JPEG_QUALITY: int = int(os.getenv("JPEG_QUALITY", "82"))
+    
+    # Feeds and sitemap
+    SITE_URL: str = os.getenv("SITE_URL", "http://localhost:3000")  # public frontend address
+    SITE_DESCRIPTION: str = os.getenv("SITE_DESCRIPTION", "Academic Blog and Portfolio")
+    FEED_SIZE: int = int(os.getenv("FEED_SIZE", "20"))  # posts in /feed.xml
     
     # Admin user
     ADMIN_EMAIL: str = os.getenv("ADMIN_EMAIL", "admin@example.com")
@@ -86,9 +86,50 @@ from ..config import settings
 from ..models.user import User
 from ..schemas.auth import TokenData
 from ..dependencies import get_database
+from .cache import LRUCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/login")
 
+# Users resolved from tokens, keyed by user id. The TTL bounds how long a
+# change made through another worker can go unnoticed.
+principal_cache = LRUCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL
+)
+
+def invalidate_principal(user_id: str) -> None:
+    """
+    Drop a cached user; call whenever a user record changes.
+    
+    Args:
+        user_id: User id
+    """
+    principal_cache.pop(str(user_id))
+
+async def get_user_by_id(db: Database, user_id: str) -> Optional[User]:
+    """
+    Load a user by id, served from the principal cache when possible.
+    
+    Args:
+        db: MongoDB database instance
+        user_id: User id from the token subject
+
+    Returns:
+        User model, or None if there is no such user
+    """
+    user = principal_cache.get(user_id)
+    if user is not None:
+        return user
+    
+    if not ObjectId.is_valid(user_id):
+        return None
+    user_doc = await db.users.find_one({"_id": ObjectId(user_id)})
+    if user_doc is None:
+        return None
+    
+    user = User(**user_doc)
+    principal_cache.set(user_id, user)
+    return user
+
 # Create an optional OAuth2 scheme that doesn't require authentication
 class OAuth2PasswordBearerOptional(OAuth2PasswordBearer):
     """
@@ -142,11 +183,11 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = await db.users.find_one({"_id": ObjectId(token_data.user_id)})
+    user = await get_user_by_id(db, token_data.user_id)
     if user is None:
         raise credentials_exception
     
-    return User(**user)
+    return user
 
 async def get_optional_current_user(
     db: Database = Depends(get_database), token: str = Depends(oauth2_scheme_optional)
@@ -176,11 +217,7 @@ async def get_optional_current_user(
     except JWTError:
         return None
     
-    user = await db.users.find_one({"_id": ObjectId(token_data.user_id)})
-    if user is None:
-        return None
-    
-    return User(**user)
+    return await get_user_by_id(db, token_data.user_id)
 
 async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
     """
@@ -0,0 +1,60 @@
+# backend/app/core/body_limit.py
+"""
+Request body size limits enforced before the body is read.
+
+Starlette parses a multipart form, spooling every file in it to a
+temporary file, before the endpoint or any of its dependencies (even
+authentication) runs, so a size check in the endpoint comes too late to
+spare the disk and the time. BodyLimitMiddleware answers 413 from the
+Content-Length header alone, and stops a body sent without one (chunked)
+as soon as it grows past the limit.
+"""
+from typing import Iterable
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Allowance for the multipart boundaries and part headers around a file
+MULTIPART_OVERHEAD = 64 * 1024
+
+class BodyLimitMiddleware:
+    """
+    Reject request bodies larger than max_size on the given paths with 413.
+    """
+    def __init__(self, app: ASGIApp, max_size: int, paths: Iterable[str]):
+        self.app = app
+        self.max_size = max_size
+        self.paths = frozenset(paths)
+
+    def _too_large(self) -> str:
+        return f"Request body too large. Maximum size is {self.max_size} bytes"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        length = Headers(scope=scope).get("content-length")
+        if length is not None:
+            if not length.isdigit():
+                await JSONResponse({"detail": "Invalid Content-Length"}, status_code=400)(scope, receive, send)
+                return
+            if int(length) > self.max_size:
+                await JSONResponse({"detail": self._too_large()}, status_code=413)(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    # Raised inside the endpoint's body parsing, so FastAPI answers it
+                    raise HTTPException(status_code=413, detail=self._too_large())
+            return message
+
+        await self.app(scope, limited_receive, send)
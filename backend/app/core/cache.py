@@ -0,0 +1,104 @@
+# backend/app/core/cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Bounded in-process cache evicting the least recently used entries.
+
+    The size of the cache is the number of entries, or the sum of
+    getsizeof(value) when getsizeof is given (e.g. to bound bytes).
+    Entries optionally expire ttl seconds after they were stored.
+    """
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        getsizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.getsizeof = getsizeof
+        self.currsize = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires, _ = entry
+        if expires is not None and expires <= time.monotonic():
+            self.pop(key)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting least recently used entries to make room.
+
+        Values larger than the whole cache are not stored.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        size = self.getsizeof(value) if self.getsizeof else 1
+        self.pop(key)
+        if size > self.maxsize:
+            return
+
+        while self._data and self.currsize + size > self.maxsize:
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.currsize -= evicted_size
+
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (value, expires, size)
+        self.currsize += size
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+            default: Value returned if the key is not cached
+
+        Returns:
+            The removed value, or default
+        """
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        self.currsize -= entry[2]
+        return entry[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.currsize = 0
@@ -0,0 +1,179 @@
+# backend/app/core/compression.py
+import gzip
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from .cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/xml",
+    "application/atom+xml",
+    "application/rss+xml",
+    "application/javascript",
+    "application/x-ndjson",
+    "image/svg+xml",
+    "text/",
+)
+
+# Bodies above this size are compressed in the thread pool
+THREADPOOL_THRESHOLD = 64 * 1024
+
+def _accepted_codings(accept_encoding: str) -> set:
+    codings = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "").lower() in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        codings.add(name.strip().lower())
+    return codings
+
+def choose_coding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the response coding for an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Request header value
+
+    Returns:
+        "br", "gzip", or None to send the body uncompressed
+    """
+    codings = _accepted_codings(accept_encoding)
+    if brotli is not None and "br" in codings:
+        return "br"
+    if "gzip" in codings:
+        return "gzip"
+    return None
+
+def compress(body: bytes, coding: str) -> bytes:
+    """
+    Compress a body with the configured CPU budget (gzip level / brotli quality).
+
+    Args:
+        body: Uncompressed body
+        coding: "br" or "gzip"
+
+    Returns:
+        Compressed body
+    """
+    if coding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli/gzip compression for complete (non-streaming) responses.
+
+    Responses carrying a strong ETag are the same bytes for every reader
+    until the ETag changes, so their compressed bodies are memoized per
+    URL, ETag and coding instead of being recompressed for each request.
+    The ETag of a compressed response is sent weak, which keeps
+    If-None-Match revalidation working for every coding, and a 304
+    answering that weak ETag repeats it unchanged.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, memo_max_bytes: int = 16 * 1024 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.memo = LRUCache(maxsize=memo_max_bytes, getsizeof=len)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = choose_coding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the headers back until we know whether to compress
+                start_message = message
+                return
+
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            if message["type"] != "http.response.body" or message.get("more_body", False):
+                # Streaming responses are passed through untouched
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if start["status"] == 304:
+                self._match_validator(scope, headers)
+                await send(start)
+                await send(message)
+                return
+            if not self._should_compress(start["status"], headers, body):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self._compress(scope, headers.get("etag"), body, coding)
+            headers["content-encoding"] = coding
+            headers["content-length"] = str(len(compressed))
+            vary = headers.get("vary")
+            headers["vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["etag"] = f"W/{etag}"
+
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _match_validator(self, scope: Scope, headers: MutableHeaders) -> None:
+        # A 304 carries the ETag of the 200 the client holds: the weak one
+        # if that 200 was compressed here, which the 304 itself never is
+        etag = headers.get("etag")
+        if not etag or etag.startswith("W/"):
+            return
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+        if f"W/{etag}" in (tag.strip() for tag in if_none_match.split(",")):
+            headers["etag"] = f"W/{etag}"
+
+    def _should_compress(self, status: int, headers: MutableHeaders, body: bytes) -> bool:
+        if status < 200 or status in (204, 206, 304) or len(body) < self.minimum_size:
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def _compress(self, scope: Scope, etag: Optional[str], body: bytes, coding: str) -> bytes:
+        key = None
+        if etag and not etag.startswith("W/"):
+            key = (scope["path"], scope.get("query_string", b""), etag, coding)
+            compressed = self.memo.get(key)
+            if compressed is not None:
+                return compressed
+
+        if len(body) > THREADPOOL_THRESHOLD:
+            compressed = await run_in_threadpool(compress, body, coding)
+        else:
+            compressed = compress(body, coding)
+
+        if key is not None:
+            self.memo.set(key, compressed)
+        return compressed
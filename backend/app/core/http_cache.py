@@ -0,0 +1,147 @@
+# backend/app/core/http_cache.py
+import hashlib
+from typing import Iterable, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ..config import settings
+from ..models.user import User
+from .cache import LRUCache
+
+class CachedResponse:
+    """
+    A serialized JSON response together with its validator.
+    """
+    __slots__ = ("body", "etag", "cache_control")
+
+    def __init__(self, body: bytes, etag: str, cache_control: str):
+        self.body = body
+        self.etag = etag
+        self.cache_control = cache_control
+
+    def to_response(self, request: Request) -> Response:
+        """
+        Build the response for a request, answering 304 if the client's copy is current.
+
+        Args:
+            request: Incoming request
+
+        Returns:
+            200 response with the cached body, or an empty 304
+        """
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Authorization",
+        }
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+# Serialized responses, bounded by total body size
+response_cache = LRUCache(
+    maxsize=settings.RESPONSE_CACHE_MAX_BYTES,
+    getsizeof=lambda entry: len(entry.body),
+)
+
+def viewer_class(user: Optional[User]) -> str:
+    """
+    Group viewers that are shown the same representation.
+
+    Args:
+        user: Current user, if any
+
+    Returns:
+        "admin" or "public"
+    """
+    return "admin" if user and user.is_admin else "public"
+
+def cache_key(request: Request, viewer: str) -> tuple:
+    """
+    Cache key for a request: route, normalized query and viewer class.
+
+    Args:
+        request: Incoming request
+        viewer: Result of viewer_class()
+
+    Returns:
+        Hashable cache key
+    """
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())), viewer)
+
+def make_etag(parts: Iterable[object]) -> str:
+    """
+    Build a strong ETag from the values that identify a representation.
+
+    Args:
+        parts: Values such as post ids and updated_at timestamps
+
+    Returns:
+        Quoted ETag
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, RFC 9110).
+
+    Args:
+        if_none_match: Header value, if sent
+        etag: Current ETag
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def store(
+    request: Request, viewer: str, body: bytes, etag: str, cacheable: bool = True
+) -> Response:
+    """
+    Cache a serialized response and return it for the current request.
+
+    Args:
+        request: Incoming request
+        viewer: Result of viewer_class()
+        body: JSON body
+        etag: ETag of the body
+        cacheable: False if the data may already be stale (a write happened meanwhile)
+
+    Returns:
+        Response for the current request
+    """
+    if viewer == "public":
+        cache_control = (
+            f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, "
+            f"stale-while-revalidate={settings.HTTP_CACHE_STALE_WHILE_REVALIDATE}"
+        )
+    else:
+        cache_control = "private, no-cache"
+
+    entry = CachedResponse(body, etag, cache_control)
+    if cacheable:
+        response_cache.set(cache_key(request, viewer), entry)
+    return entry.to_response(request)
+
+def lookup(request: Request, viewer: str) -> Optional[Response]:
+    """
+    Answer a request from the cache if possible.
+
+    Args:
+        request: Incoming request
+        viewer: Result of viewer_class()
+
+    Returns:
+        Cached (or 304) response, or None on a miss
+    """
+    entry = response_cache.get(cache_key(request, viewer))
+    if entry is None:
+        return None
+    return entry.to_response(request)
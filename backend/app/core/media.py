@@ -0,0 +1,245 @@
+# backend/app/core/media.py
+import os
+import re
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from mimetypes import guess_type
+from typing import Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from ..config import settings
+
+# Uploads named after their content hash (optionally a resized variant)
+# or with the legacy timestamp prefix never change once written.
+IMMUTABLE_NAME_RE = re.compile(r"^(?:[0-9a-f]{32}(?:-\d+w)?|\d{14}_.+)\.[A-Za-z0-9]+$")
+CONTENT_HASH_RE = re.compile(r"^([0-9a-f]{32}(?:-\d+w)?)\.")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Precompressed siblings in order of preference
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() == coding:
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header.
+
+    Returns:
+        (start, end) inclusive, or None if the header should be ignored
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # Multiple or malformed ranges: serve the whole file
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Unsatisfiable range")
+    return start, end
+
+class MediaFileResponse(Response):
+    """
+    Sends a file, or a byte range of it.
+
+    Uses the ASGI zero-copy extension when the server offers it; otherwise
+    the file is read in chunks off the event loop, yielding between chunks
+    so large downloads do not monopolize the worker.
+    """
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        length: int,
+        status_code: int,
+        headers: dict,
+        media_type: Optional[str],
+        send_body: bool = True,
+    ):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.send_body = send_body
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        if not self.send_body or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            # The server sends from the open file (sendfile) before send() returns
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # The file shrank underneath us; end the response anyway
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+class MediaFiles(StaticFiles):
+    """
+    StaticFiles for uploads with caching, precompression and range support.
+
+    - Content-hashed and timestamp-named uploads are served as immutable
+      with a one year max-age; other files revalidate after MEDIA_MAX_AGE.
+    - ETags are strong: the content hash when the name carries one,
+      otherwise mtime and size.
+    - A `.br` or `.gz` sibling is served with Content-Encoding when the
+      client accepts it.
+    - Single byte ranges (and If-Range) are honored, for large PDFs.
+    - With MEDIA_ACCEL_REDIRECT set, the transfer is handed to nginx via
+      X-Accel-Redirect so it can use sendfile (the internal location is in
+      nginx/nginx.conf).
+    """
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        # Never serve dotfiles such as in-progress uploads
+        if any(part.startswith(".") for part in path.replace("\\", "/").split("/")):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def _precompressed(self, full_path: str, accept_encoding: str) -> Tuple[Optional[str], str, Optional[os.stat_result]]:
+        for coding, suffix in PRECOMPRESSED:
+            if not _accepts(accept_encoding, coding):
+                continue
+            try:
+                stat_result = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if stat.S_ISREG(stat_result.st_mode):
+                return coding, full_path + suffix, stat_result
+        return None, full_path, None
+
+    def file_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        filename = os.path.basename(full_path)
+        send_body = scope["method"] != "HEAD"
+
+        hash_match = CONTENT_HASH_RE.match(filename)
+        base_tag = hash_match.group(1) if hash_match else f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
+
+        headers = {
+            "accept-ranges": "bytes",
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "vary": "Accept-Encoding",
+            "cache-control": (
+                IMMUTABLE_CACHE_CONTROL if IMMUTABLE_NAME_RE.match(filename)
+                else f"public, max-age={settings.MEDIA_MAX_AGE}"
+            ),
+        }
+        media_type = guess_type(filename)[0] or "application/octet-stream"
+        range_header = request_headers.get("range")
+
+        # Precompressed siblings only for whole-file responses
+        coding, body_path, body_stat = None, full_path, stat_result
+        if not range_header:
+            coding, body_path, sibling_stat = self._precompressed(
+                full_path, request_headers.get("accept-encoding", "")
+            )
+            if coding:
+                body_stat = sibling_stat
+                headers["content-encoding"] = coding
+
+        etag = f'"{base_tag}-{coding}"' if coding else f'"{base_tag}"'
+        headers["etag"] = etag
+
+        if self._not_modified(request_headers, etag, stat_result):
+            return Response(status_code=304, headers={k: v for k, v in headers.items() if k != "content-encoding"})
+
+        size = body_stat.st_size
+        offset, length = 0, size
+        if range_header and self._if_range_matches(request_headers, etag, headers["last-modified"]):
+            try:
+                byte_range = _parse_range(range_header, size)
+            except ValueError:
+                return Response(status_code=416, headers={"content-range": f"bytes */{size}"})
+            if byte_range:
+                start, end = byte_range
+                offset, length = start, end - start + 1
+                status_code = 206
+                headers["content-range"] = f"bytes {start}-{end}/{size}"
+        headers["content-length"] = str(length)
+
+        if settings.MEDIA_ACCEL_REDIRECT and send_body:
+            # nginx serves the bytes (and ranges) itself with sendfile
+            relative = os.path.relpath(body_path, os.path.realpath(self.directory))
+            headers.pop("content-length")
+            headers.pop("content-range", None)
+            headers["x-accel-redirect"] = settings.MEDIA_ACCEL_REDIRECT.rstrip("/") + "/" + relative
+            return Response(status_code=200, headers=headers, media_type=media_type)
+
+        return MediaFileResponse(
+            body_path, offset, length, status_code, headers, media_type, send_body=send_body
+        )
+
+    def _not_modified(self, request_headers: Headers, etag: str, stat_result: os.stat_result) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _if_range_matches(self, request_headers: Headers, etag: str, last_modified: str) -> bool:
+        if_range = request_headers.get("if-range")
+        if if_range is None:
+            return True
+        return if_range.strip() in (etag, last_modified)
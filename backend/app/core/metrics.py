@@ -0,0 +1,263 @@
+# backend/app/core/metrics.py
+"""
+Prometheus metrics for requests, MongoDB commands, password hashing and
+the event loop.
+
+Under gunicorn, gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR before the
+workers start: every worker then writes its samples to files there and
+/metrics, whichever worker answers it, reports the sum over all of them.
+Without it (a single uvicorn process) the in-memory registry is used.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+# Requests that matched no route share one label value
+UNMATCHED_ROUTE = "<unmatched>"
+
+# ASGI scope extension marking the in-process requests of startup warm-up
+WARMUP_EXTENSION = "app.warmup"
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled", multiprocess_mode="livesum"
+)
+MONGO_COMMANDS = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command round-trip time",
+    ["collection", "command"], buckets=MONGO_BUCKETS,
+)
+MONGO_FAILURES = Counter(
+    "mongodb_command_failures_total", "Failed MongoDB commands", ["collection", "command"]
+)
+MONGO_POOL_WAIT = Histogram(
+    "mongodb_pool_wait_seconds", "Time spent waiting to check a connection out of the pool",
+    buckets=MONGO_BUCKETS,
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "mongodb_pool_checked_out_connections", "Connections currently checked out", multiprocess_mode="livesum"
+)
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Delay of a timer on the event loop beyond its due time", buckets=LAG_BUCKETS
+)
+LOOP_LAG_LAST = Gauge(
+    "event_loop_lag_last_seconds", "Most recent event loop lag sample", multiprocess_mode="livemax"
+)
+PASSWORD_HASHES_IN_FLIGHT = Gauge(
+    "password_hashes_in_flight", "bcrypt hashes and verifications running", multiprocess_mode="livesum"
+)
+PASSWORD_HASHES_WAITING = Gauge(
+    "password_hashes_waiting", "bcrypt hashes and verifications waiting for a pool thread", multiprocess_mode="livesum"
+)
+PASSWORD_HASHES = Counter("password_hashes_total", "bcrypt hashes and verifications completed")
+LOGIN_THROTTLED = Counter("login_throttled_total", "Login attempts rejected before checking the password")
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds", "Duration of each startup phase of a worker", ["phase"], multiprocess_mode="liveall"
+)
+
+def render() -> Tuple[bytes, str]:
+    """
+    Serialize every metric in the Prometheus text format.
+
+    Returns:
+        (body, content type), aggregated over all workers in multiprocess mode
+    """
+    # prometheus_client writes per-process files whenever the variable is
+    # set, into the working directory if it is empty
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=os.environ["PROMETHEUS_MULTIPROC_DIR"] or ".")
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+# Route path by endpoint, built from the app's routes on first use
+_templates: Dict[object, str] = {}
+
+def is_warmup(scope: Scope) -> bool:
+    """
+    Whether a request is one of startup warm-up's, which no middleware should count or profile.
+
+    Args:
+        scope: ASGI scope
+
+    Returns:
+        True if warmup.request() sent it
+    """
+    return WARMUP_EXTENSION in scope.get("extensions", {})
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the route that handled a request, e.g. /api/posts/{slug}.
+
+    Routing leaves the matched endpoint in the scope; it is mapped back to
+    its route's path.
+
+    Args:
+        scope: ASGI scope after routing
+
+    Returns:
+        Route path, or UNMATCHED_ROUTE
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    if not _templates:
+        for route in getattr(scope.get("app"), "routes", ()):
+            _templates.setdefault(getattr(route, "endpoint", None) or getattr(route, "app", None), route.path)
+    return _templates.get(endpoint, UNMATCHED_ROUTE)
+
+class MetricsMiddleware:
+    """
+    Record latency and status counts per route template.
+
+    Labels use the route template rather than the raw path so that
+    /api/posts/{slug} is one series, not one per post.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or is_warmup(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            route = route_template(scope)
+            REQUEST_LATENCY.labels(scope["method"], route).observe(time.perf_counter() - started)
+            REQUESTS.labels(scope["method"], route, str(status)).inc()
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Time MongoDB commands per collection and command name.
+
+    Pass an instance in the client's event_listeners.
+    """
+    def __init__(self):
+        self._collections: Dict[Tuple[int, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        self._collections[(event.request_id, event.operation_id)] = target if isinstance(target, str) else ""
+
+    def _collection(self, event) -> str:
+        return self._collections.pop((event.request_id, event.operation_id), "")
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGO_COMMANDS.labels(self._collection(event), event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._collection(event)
+        MONGO_COMMANDS.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_FAILURES.labels(collection, event.command_name).inc()
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Measure connection pool wait time and connections in use.
+
+    Pass an instance in the client's event_listeners. `checked_out` is
+    this process's count, for readiness checks; the gauge is summed
+    over workers.
+    """
+    def __init__(self):
+        # Check-out start times by thread, for drivers that report no duration
+        self._started: Dict[int, float] = {}
+        self.checked_out = 0
+
+    def connection_check_out_started(self, event) -> None:
+        self._started[threading.get_ident()] = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        started = self._started.pop(threading.get_ident(), None)
+        duration: Optional[float] = getattr(event, "duration", None)
+        if duration is None and started is not None:
+            duration = time.perf_counter() - started
+        if duration is not None:
+            MONGO_POOL_WAIT.observe(duration)
+        self.checked_out += 1
+        MONGO_POOL_CHECKED_OUT.inc()
+
+    def connection_check_out_failed(self, event) -> None:
+        self._started.pop(threading.get_ident(), None)
+
+    def connection_checked_in(self, event) -> None:
+        self.checked_out -= 1
+        MONGO_POOL_CHECKED_OUT.dec()
+
+    # Remaining pool events are not measured
+    def connection_created(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+async def monitor_loop_lag(interval: float) -> None:
+    """
+    Sample event loop lag forever: how late a sleep of `interval` wakes up.
+
+    Run it as a background task.
+
+    Args:
+        interval: Seconds between samples
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        LOOP_LAG.observe(lag)
+        LOOP_LAG_LAST.set(lag)
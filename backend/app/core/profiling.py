@@ -0,0 +1,133 @@
+# backend/app/core/profiling.py
+"""
+Sampling profiles of individual requests, in speedscope's flamegraph format.
+
+A request is profiled when an admin asks for it with an `X-Profile`
+header or a `profile=1` query parameter, or, with PROFILE_SAMPLE_RATE = N,
+for one in every N requests. pyinstrument samples the stack of the
+request's own async context, so the time spent awaiting Motor, validating
+and serializing is attributed to that request only. Profiles are written
+to PROFILE_DIR, which keeps the newest PROFILE_MAX_FILES; open them at
+https://www.speedscope.app.
+"""
+import itertools
+import os
+import re
+import time
+import uuid
+from typing import List
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import HTTPException
+from fastapi.security.utils import get_authorization_scheme_param
+from pyinstrument import Profiler
+from pyinstrument.renderers import SpeedscopeRenderer
+from pyinstrument.session import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from ..dependencies import get_database
+from .auth import get_current_admin, get_current_user
+from .metrics import is_warmup
+
+PROFILE_HEADER = "x-profile"
+PROFILE_PARAM = "profile"
+PROFILE_SUFFIX = ".speedscope.json"
+PROFILE_NAME_RE = re.compile(r"^[0-9]{8}T[0-9]{6}-[A-Z]+-[A-Za-z0-9_.-]*-[0-9a-f]{8}\.speedscope\.json$")
+
+def profile_names() -> List[str]:
+    """
+    Stored profiles, newest first.
+
+    Returns:
+        File names in PROFILE_DIR
+    """
+    try:
+        with os.scandir(settings.PROFILE_DIR) as entries:
+            found = [
+                (entry.stat().st_mtime_ns, entry.name)
+                for entry in entries if PROFILE_NAME_RE.match(entry.name)
+            ]
+    except FileNotFoundError:
+        return []
+    return [name for _, name in sorted(found, reverse=True)]
+
+def _write(session: Session, name: str) -> None:
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    path = os.path.join(settings.PROFILE_DIR, name)
+    with open(path + ".tmp", "w") as f:
+        f.write(SpeedscopeRenderer().render(session))
+    os.replace(path + ".tmp", path)
+
+    # Rotate: keep only the newest profiles
+    for old in profile_names()[settings.PROFILE_MAX_FILES:]:
+        try:
+            os.remove(os.path.join(settings.PROFILE_DIR, old))
+        except FileNotFoundError:
+            pass
+
+def _profile_name(scope: Scope) -> str:
+    path = re.sub(r"[^A-Za-z0-9_.-]+", "_", scope["path"]).strip("_")[:80]
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+    return f"{stamp}-{scope['method']}-{path}-{uuid.uuid4().hex[:8]}{PROFILE_SUFFIX}"
+
+async def _is_admin(scope: Scope, headers: Headers) -> bool:
+    scheme, token = get_authorization_scheme_param(headers.get("authorization"))
+    if scheme.lower() != "bearer" or not token:
+        return False
+    # Honor dependency overrides, as the endpoints do
+    overrides = getattr(scope.get("app"), "dependency_overrides", {})
+    db = await overrides.get(get_database, get_database)()
+    try:
+        await get_current_admin(await get_current_user(db, token))
+    except HTTPException:
+        return False
+    return True
+
+class ProfilingMiddleware:
+    """
+    Profile admin-requested and sampled requests.
+
+    The `profile` query parameter is removed before the request reaches
+    the app, so a profiled request is handled exactly like any other.
+    Admin-requested profiles are named in an `X-Profile` response header
+    and can be downloaded from /api/profiles/{name}.
+    """
+    def __init__(self, app: ASGIApp, sample_rate: int = 0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self._counter = itertools.count(1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or is_warmup(scope):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        query = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+        flag = any(key == PROFILE_PARAM for key, _ in query)
+        if flag:
+            scope = dict(scope, query_string=urlencode([(k, v) for k, v in query if k != PROFILE_PARAM]).encode())
+
+        requested = (flag or PROFILE_HEADER in headers) and await _is_admin(scope, headers)
+        sampled = self.sample_rate > 0 and next(self._counter) % self.sample_rate == 0
+        if not (requested or sampled):
+            await self.app(scope, receive, send)
+            return
+
+        name = _profile_name(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            if requested and message["type"] == "http.response.start":
+                message = dict(message, headers=list(message["headers"]) + [(b"x-profile", name.encode())])
+            await send(message)
+
+        profiler = Profiler(interval=settings.PROFILE_INTERVAL, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            await run_in_threadpool(_write, session, name)
@@ -1,11 +1,72 @@
 # backend/app/core/security.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from ..config import settings
+from . import metrics
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated thread pool so hashing never blocks the event loop.
+    
+    At most max_workers hashes run at once; further callers wait on a
+    semaphore. Running and waiting hashes are exported to /metrics
+    (password_hashes_in_flight, password_hashes_waiting).
+    """
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._slots = asyncio.Semaphore(max_workers)
+    
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        metrics.PASSWORD_HASHES_WAITING.inc()
+        try:
+            await self._slots.acquire()
+        finally:
+            metrics.PASSWORD_HASHES_WAITING.dec()
+        
+        metrics.PASSWORD_HASHES_IN_FLIGHT.inc()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            metrics.PASSWORD_HASHES_IN_FLIGHT.dec()
+            metrics.PASSWORD_HASHES.inc()
+            self._slots.release()
+    
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password off the event loop.
+        
+        Args:
+            password: Password in plain text
+
+        Returns:
+            Hashed password
+        """
+        return await self._run(pwd_context.hash, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password off the event loop.
+        
+        Args:
+            plain_password: Password in plain text
+            hashed_password: Stored hash
+
+        Returns:
+            (matches, new_hash) where new_hash is set when the stored hash
+            uses deprecated settings (e.g. fewer rounds) and should be replaced
+        """
+        return await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+password_hasher = PasswordHasher(max_workers=settings.PASSWORD_HASH_WORKERS)
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
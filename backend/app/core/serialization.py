@@ -0,0 +1,78 @@
+# backend/app/core/serialization.py
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Optional, Tuple
+
+from bson import ObjectId
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder produces the same JSON
+    orjson = None
+
+# Output fields of PostResponse / PostSummary with the defaults the schemas
+# would fill in, in schema order
+POST_FIELDS: Tuple[Tuple[str, Any], ...] = (
+    ("title", None),
+    ("content", None),
+    ("summary", None),
+    ("tags", ()),
+    ("featured_image", None),
+    ("is_published", False),
+    ("_id", None),
+    ("author_id", None),
+    ("slug", None),
+    ("content_html", None),
+    ("toc", ()),
+    ("word_count", 0),
+    ("reading_time", 0),
+    ("created_at", None),
+    ("updated_at", None),
+)
+SUMMARY_FIELDS = tuple(f for f in POST_FIELDS if f[0] not in ("content", "content_html", "toc"))
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as JSON bytes, handling ObjectId and datetime natively.
+
+    Args:
+        value: Value made of dicts, lists and scalars
+
+    Returns:
+        UTF-8 JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+def post_document(
+    doc: dict,
+    fields: Iterable[Tuple[str, Any]] = POST_FIELDS,
+    highlight: Optional[str] = None,
+) -> dict:
+    """
+    Shape a raw post document from MongoDB like a PostResponse without validating it.
+
+    Documents are only ever written through the validated post models, so
+    the read path can skip building Post and PostResponse objects.
+
+    Args:
+        doc: Post document as stored in MongoDB
+        fields: POST_FIELDS or SUMMARY_FIELDS
+        highlight: Search snippet, if any
+
+    Returns:
+        Dict ready for dumps()
+    """
+    out = {name: doc.get(name, default) for name, default in fields}
+    out["_id"] = str(out["_id"])
+    out["author_id"] = str(out["author_id"])
+    out["highlight"] = highlight
+    return out
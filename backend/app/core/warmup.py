@@ -0,0 +1,208 @@
+# backend/app/core/warmup.py
+"""
+Startup warm-up: make a worker's first real requests as fast as the rest.
+
+A fresh worker pays on its first requests for building the middleware
+stack and the OpenAPI schema, for each serializer's first use, and for
+filling the response and compression caches. The lifespan runs
+exercise_routes() before the worker accepts connections, sending one
+in-process GET to every route that can be called without side effects.
+
+The app is safe to import in gunicorn's master with --preload: nothing
+opened at import time (threads, clients, event loops) has to survive the
+fork, and the schema built by prepare() is shared with the workers.
+"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote, urlencode
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from starlette.routing import NoMatchFound
+from starlette.types import Message
+
+from ..config import settings
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# The startup report goes with the server's own startup messages, whose
+# handlers and level uvicorn and gunicorn's UvicornWorker configure
+server_logger = logging.getLogger("uvicorn.error")
+
+# Route whose first summary pages the frontend requests (Home.jsx),
+# primed in the response cache for each of WARMUP_PAGE_SIZES
+LISTING_ROUTE = "list_posts"
+
+WARMUP_HEADERS = [
+    (b"host", b"localhost"),
+    (b"accept", b"application/json"),
+    (b"accept-encoding", b"gzip, deflate, br"),
+    (b"user-agent", b"startup-warmup"),
+]
+
+class StartupTimer:
+    """
+    Durations of the startup phases of this worker, logged and exported to /metrics.
+    """
+    def __init__(self, import_seconds: float, import_pid: int):
+        self.phases: Dict[str, float] = {}
+        # Under --preload the master imported the app once for every worker
+        self.preloaded = import_pid != os.getpid()
+        self.record("import", import_seconds)
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = seconds
+        metrics.STARTUP_SECONDS.labels(phase).set(seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def report(self) -> None:
+        """Log how long startup took, phase by phase."""
+        warmup = sum(seconds for phase, seconds in self.phases.items() if phase != "import")
+        metrics.STARTUP_SECONDS.labels("warmup").set(warmup)
+        server_logger.info(
+            "Worker %d ready after %.3fs of warm-up (%s); import took %.3fs%s",
+            os.getpid(),
+            warmup,
+            ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in self.phases.items() if phase != "import"),
+            self.phases["import"],
+            " in the master (--preload)" if self.preloaded else "",
+        )
+
+def prepare(app: FastAPI) -> None:
+    """
+    Do the fork-safe part of warming up at import time.
+
+    Builds the OpenAPI schema, which walks every route and model; under
+    --preload this happens once in the master.
+
+    Args:
+        app: The application, with all routes included
+    """
+    app.openapi()
+
+def warmup_paths(app: FastAPI, slug: Optional[str]) -> List[str]:
+    """
+    Paths to request: the frontend's first listings, then every GET route once.
+
+    Routes with a {slug} parameter use the newest published post; other
+    parameterized routes are skipped. Routes that need authentication
+    still run up to their auth dependency.
+
+    Args:
+        app: The application
+        slug: Slug of the newest published post, if any
+
+    Returns:
+        Paths with query strings, without duplicates
+    """
+    paths = []
+    try:
+        listing = app.url_path_for(LISTING_ROUTE)
+    except NoMatchFound:
+        listing = None
+    if listing is not None:
+        for page_size in settings.WARMUP_PAGE_SIZES:
+            paths.append(f"{listing}?{urlencode({'page': 1, 'page_size': page_size, 'view': 'summary'})}")
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        names = set(route.param_convertors)
+        if not names:
+            paths.append(route.path_format)
+        elif names == {"slug"} and slug:
+            paths.append(route.path_format.replace("{slug}", quote(slug)))
+    return list(dict.fromkeys(paths))
+
+async def request(app: FastAPI, path: str) -> int:
+    """
+    Send a GET request through the whole middleware stack, in-process.
+
+    The request is marked with metrics.WARMUP_EXTENSION, so it is left out
+    of request metrics and never profiled.
+
+    Args:
+        app: The application
+        path: Path with optional query string
+
+    Returns:
+        Response status code
+    """
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": WARMUP_HEADERS,
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+        "extensions": {metrics.WARMUP_EXTENSION: {}},
+    }
+    status = 0
+    sent = False
+    finished = asyncio.Event()
+
+    async def receive() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses listen for a disconnect until they are done
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            finished.set()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        finished.set()
+    return status
+
+async def exercise_routes(app: FastAPI, slug: Optional[str]) -> Dict[str, int]:
+    """
+    Request every path of warmup_paths() once, one after the other.
+
+    Failures are logged; warm-up never stops the worker from starting.
+
+    Args:
+        app: The application
+        slug: Slug of the newest published post, if any
+
+    Returns:
+        Status code by path (0 if the request raised)
+    """
+    statuses = {}
+    for path in warmup_paths(app, slug):
+        try:
+            statuses[path] = await request(app, path)
+        except Exception:
+            logger.exception("Warm-up request to %s failed", path)
+            statuses[path] = 0
+        else:
+            if statuses[path] >= 500:
+                logger.warning("Warm-up request to %s answered %d", path, statuses[path])
+    return statuses
@@ -1,17 +1,95 @@
 # backend/app/dependencies.py
+import asyncio
+import time
+from typing import Optional
+
 import motor.motor_asyncio
 from pymongo.database import Database
 from .config import settings
+from .core.metrics import CommandMetrics, PoolMetrics
+
+# Created per process by connect(), in the app's lifespan: after gunicorn
+# has forked the worker and inside the event loop that will use it
+client: Optional[motor.motor_asyncio.AsyncIOMotorClient] = None
+database: Optional[Database] = None
+
+# Connection pool usage of this process, for /ready; also feeds /metrics
+pool_metrics = PoolMetrics()
+
+def create_client() -> motor.motor_asyncio.AsyncIOMotorClient:
+    """
+    Create a MongoDB client with the pool settings from Settings.
+
+    Returns:
+        Client; no connection is opened until it is used
+    """
+    return motor.motor_asyncio.AsyncIOMotorClient(
+        settings.MONGODB_URI,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+        connectTimeoutMS=settings.MONGODB_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        event_listeners=[CommandMetrics(), pool_metrics],
+    )
+
+def connect() -> Database:
+    """
+    Create the process's client, unless one was installed beforehand (as the benchmarks do).
 
-# Create MongoDB client
-client = motor.motor_asyncio.AsyncIOMotorClient(settings.MONGODB_URI)
-database = client[settings.MONGODB_DB_NAME]
+    Returns:
+        The application database
+    """
+    global client, database
+    if client is None:
+        client = create_client()
+    database = client[settings.MONGODB_DB_NAME]
+    return database
+
+async def warm_up() -> None:
+    """
+    Open the first MONGODB_MIN_POOL_SIZE connections with concurrent pings.
+
+    The driver would otherwise open them on the first requests, which
+    would then pay for server selection, the TCP/TLS handshake and
+    authentication.
+
+    Raises:
+        PyMongoError: If MongoDB cannot be reached
+    """
+    await asyncio.gather(*(database.command("ping") for _ in range(max(1, settings.MONGODB_MIN_POOL_SIZE))))
+
+def disconnect() -> None:
+    """
+    Close the client and its pooled connections.
+    """
+    global client, database
+    if client is not None:
+        client.close()
+    client = None
+    database = None
+
+async def ping() -> float:
+    """
+    Round-trip a ping to MongoDB.
+
+    Returns:
+        Latency in seconds
+
+    Raises:
+        PyMongoError: If MongoDB cannot be reached
+        asyncio.TimeoutError: If it takes longer than MONGODB_READY_TIMEOUT_MS
+    """
+    started = time.perf_counter()
+    await asyncio.wait_for(database.command("ping"), settings.MONGODB_READY_TIMEOUT_MS / 1000)
+    return time.perf_counter() - started
 
 async def get_database() -> Database:
     """
     Get MongoDB database dependency.
-    
+
     Returns:
         MongoDB database instance
     """
-    return database
\ No newline at end of file
+    return database
@@ -1,12 +1,103 @@
 # backend/app/main.py
-from fastapi import FastAPI
+import time
+IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+import logging
 import os
 from .config import settings
 from .api.router import api_router
+from .api.endpoints import feeds
+from .core import metrics
+from .core.body_limit import MULTIPART_OVERHEAD, BodyLimitMiddleware
+from .core.compression import CompressionMiddleware
+from .core.profiling import ProfilingMiddleware
+from .core.media import MediaFiles
+from .core import warmup
+from . import dependencies
+from .services import change_service, post_service, related_service, snapshot_service, tag_service, throttle_service
+
+logger = logging.getLogger(__name__)
+
+# The process that imported the app: the master under gunicorn --preload
+IMPORT_PID = os.getpid()
+
+async def load_posts(database) -> None:
+    """Create indexes and build the in-process search index before serving requests."""
+    try:
+        await post_service.ensure_indexes(database)
+        await change_service.ensure_indexes(database)
+        await tag_service.ensure_indexes(database)
+        await throttle_service.ensure_indexes(database)
+        await post_service.load(database)
+        # First deployment: nothing has computed related posts yet; one worker does
+        if not await database.related.find_one({}, {"_id": 1}) and await related_service.claim_rebuild(database):
+            related_service.schedule_refresh(database)
+        # Catch up with writes made while no worker was running
+        snapshot_service.schedule_build(database, [])
+    except Exception:
+        # The index is built on the first request instead
+        logger.exception("Could not load posts at startup")
+
+async def warm_up_routes(database) -> None:
+    """Request every side-effect-free GET route once, with the newest post for /{slug} routes."""
+    try:
+        newest = await database.posts.find_one(
+            {"is_published": True}, {"slug": 1}, sort=post_service.LISTING_SORT
+        )
+    except Exception:
+        logger.exception("Could not find a post to warm up with")
+        newest = None
+    await warmup.exercise_routes(app, newest["slug"] if newest else None)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open this worker's MongoDB connections before serving and close them on shutdown.
 
-app = FastAPI(title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION)
+    Runs in each worker after gunicorn forks it, so no connection is
+    shared between processes. The worker accepts no request until the
+    warm-up below is done; each phase is timed in app_startup_seconds.
+    """
+    timer = warmup.StartupTimer(IMPORT_SECONDS, IMPORT_PID)
+    database = dependencies.connect()
+    reachable = True
+    with timer.phase("database"):
+        try:
+            # Connect now rather than on the first user request
+            await dependencies.warm_up()
+        except Exception:
+            # Not fatal: /ready reports the database until it is reachable
+            logger.exception("Could not reach MongoDB at startup")
+            reachable = False
+    with timer.phase("posts"):
+        await load_posts(database)
+    # Without MongoDB every warm-up request would only wait for its timeout
+    if settings.STARTUP_WARMUP and reachable:
+        with timer.phase("routes"):
+            await warm_up_routes(database)
+    timer.report()
+
+    # Sample event loop lag in the background for /metrics
+    loop_monitor = asyncio.create_task(metrics.monitor_loop_lag(settings.LOOP_LAG_INTERVAL))
+    try:
+        yield
+    finally:
+        loop_monitor.cancel()
+        dependencies.disconnect()
+
+app = FastAPI(title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION, lifespan=lifespan)
+
+# Refuse oversized uploads before Starlette spools them to disk; inside
+# CORS, so browsers can read the 413
+app.add_middleware(
+    BodyLimitMiddleware,
+    max_size=settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD,
+    paths=[f"{settings.API_PREFIX}/posts/upload-image"],
+)
 
 # Configure CORS
 app.add_middleware(
@@ -17,21 +108,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON and text responses
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    memo_max_bytes=settings.COMPRESSION_CACHE_MAX_BYTES,
+)
+
+# Profiles cover everything below the metrics middleware
+app.add_middleware(ProfilingMiddleware, sample_rate=settings.PROFILE_SAMPLE_RATE)
+
+# Outermost, so latencies include compression and CORS
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Set up API routes
 app.include_router(api_router, prefix=settings.API_PREFIX)
 
+# Feeds and sitemap live at the site root, where readers and crawlers look
+app.include_router(feeds.router, tags=["feeds"])
+
 # Create media directory if it doesn't exist
 os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
 os.makedirs(os.path.join(settings.MEDIA_ROOT, "images"), exist_ok=True)
 
-# Mount static files for media uploads
-app.mount("/media", StaticFiles(directory=settings.MEDIA_ROOT), name="media")
+# Mount static files for media uploads (caching, precompression, ranges)
+app.mount("/media", MediaFiles(directory=settings.MEDIA_ROOT), name="media")
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness: the process is up and its event loop responds. Does not touch MongoDB."""
     return {"status": "ok"}
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness: MongoDB answers a ping in time and the connection pool has room.
+    Responds 503 otherwise, so the load balancer sends traffic elsewhere.
+    """
+    checked_out = dependencies.pool_metrics.checked_out
+    saturation = checked_out / settings.MONGODB_MAX_POOL_SIZE
+    pool = {"checked_out": checked_out, "max_size": settings.MONGODB_MAX_POOL_SIZE, "saturation": saturation}
+    
+    try:
+        latency = await dependencies.ping()
+    except Exception as exc:
+        # The message names internal hosts; it goes to the log only
+        logger.warning("Readiness check failed: %r", exc)
+        raise HTTPException(
+            status_code=503,
+            detail={"status": "unavailable", "database": {"error": type(exc).__name__}, "pool": pool},
+        )
+    
+    result = {"status": "ready", "database": {"latency_ms": round(latency * 1000, 3)}, "pool": pool}
+    if saturation >= settings.READY_MAX_POOL_SATURATION:
+        raise HTTPException(status_code=503, detail=dict(result, status="saturated"))
+    return result
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics, summed over all workers."""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -40,4 +178,9 @@ async def root():
         "version": settings.PROJECT_VERSION,
         "description": "Academic Blog and Portfolio API",
         "docs_url": "/docs",
-    }
\ No newline at end of file
+    }
+
+# Fork-safe part of the warm-up; under --preload it runs once in the master
+warmup.prepare(app)
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
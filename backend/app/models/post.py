@@ -15,6 +15,12 @@ class Post(MongoBaseModel):
     tags: List[str] = []
     featured_image: Optional[str] = None
     is_published: bool = False
+    # Derived from content at write time by render_service
+    content_html: Optional[str] = None
+    toc: List[dict] = []
+    word_count: int = 0
+    reading_time: int = 0
+    content_hash: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
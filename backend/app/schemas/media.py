@@ -0,0 +1,18 @@
+# backend/app/schemas/media.py
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    media_type: str
+
+class ImageVariants(BaseModel):
+    url: str
+    status: str  # "ready", "pending", "failed" or "unavailable"
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: List[ImageVariant] = []
+    # Ready-made srcset attribute values keyed by media type
+    srcset: Dict[str, str] = {}
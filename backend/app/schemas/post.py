@@ -1,7 +1,7 @@
 # backend/app/schemas/post.py
 from datetime import datetime
-from typing import List, Optional, Any
-from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional, Any, Union
+from pydantic import BaseModel, Field, field_validator, model_validator
 from bson import ObjectId
 
 class PostBase(BaseModel):
@@ -24,10 +24,83 @@ class PostUpdate(BaseModel):
     is_published: Optional[bool] = None
     slug: Optional[str] = None
 
+class TocEntry(BaseModel):
+    level: int
+    id: str
+    name: str
+    children: List["TocEntry"] = []
+
+class PostImport(PostBase):
+    """
+    One line of an NDJSON import; posts are matched by slug.
+    """
+    id: Optional[str] = Field(None, alias="_id")
+    slug: Optional[str] = None  # Will be generated from title if not provided
+    author_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        populate_by_name = True
+
+class PostImportError(BaseModel):
+    line: int
+    slug: Optional[str] = None
+    detail: str
+
+class PostImportResult(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    errors: List[PostImportError] = []
+
+class PostBatchFilter(BaseModel):
+    tag: Optional[str] = None
+    is_published: Optional[bool] = None
+
+class PostBatch(BaseModel):
+    """
+    A batch operation on the posts selected by ids or by a filter.
+    """
+    action: Literal["publish", "unpublish", "retag", "delete"]
+    ids: Optional[List[str]] = Field(None, max_length=1000)
+    filter: Optional[PostBatchFilter] = None
+    # Tag changes for action=retag
+    add_tags: List[str] = []
+    remove_tags: List[str] = []
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "PostBatch":
+        """
+        Require exactly one non-empty selection, and tag changes for retag.
+        """
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter must have at least one condition")
+        if self.action == "retag" and not (self.add_tags or self.remove_tags):
+            raise ValueError("retag needs add_tags or remove_tags")
+        return self
+
+class PostBatchItem(BaseModel):
+    id: str
+    # "updated", "unchanged", "deleted", "not_found" or "invalid_id"
+    status: str
+
+class PostBatchResult(BaseModel):
+    action: str
+    matched: int
+    modified: int
+    results: List[PostBatchItem]
+
 class PostInDB(PostBase):
     id: str = Field(..., alias="_id")
     author_id: str
     slug: str
+    content_html: Optional[str] = None
+    toc: List[TocEntry] = []
+    word_count: int = 0
+    reading_time: int = 0  # minutes
     created_at: datetime
     updated_at: datetime
 
@@ -36,6 +109,9 @@ class PostInDB(PostBase):
         from_attributes = True
 
 class PostResponse(PostInDB):
+    # HTML snippet with <mark>ed query terms, only set for search results
+    highlight: Optional[str] = None
+    
     @field_validator('id', "author_id", mode='before')
     @classmethod
     def convert_objectid_to_str(cls, v: Any) -> str:
@@ -54,9 +130,53 @@ class PostResponse(PostInDB):
     
     pass
 
+class PostSummary(BaseModel):
+    """
+    Listing representation of a post without its content.
+    """
+    id: str = Field(..., alias="_id")
+    title: str
+    summary: Optional[str] = None
+    slug: str
+    author_id: str
+    tags: List[str] = []
+    featured_image: Optional[str] = None
+    is_published: bool = False
+    word_count: int = 0
+    reading_time: int = 0  # minutes
+    created_at: datetime
+    updated_at: datetime
+    # HTML snippet with <mark>ed query terms, only set for search results
+    highlight: Optional[str] = None
+
+    class Config:
+        populate_by_name = True
+        from_attributes = True
+
+    @field_validator('id', "author_id", mode='before')
+    @classmethod
+    def convert_objectid_to_str(cls, v: Any) -> str:
+        """
+        Convert MongoDB ObjectId to string if needed.
+        """
+        if isinstance(v, ObjectId):
+            return str(v)
+        return v
+
+class RelatedPost(PostSummary):
+    score: float
+
+class RelatedPosts(BaseModel):
+    posts: List[RelatedPost]
+
 class PostList(BaseModel):
-    posts: List[PostResponse]
-    total: int
+    # PostSummary items when listing with view=summary
+    posts: List[Union[PostResponse, PostSummary]]
+    # total and pages are None when counting was skipped (count=none)
+    total: Optional[int]
     page: int
     page_size: int
-    pages: int
\ No newline at end of file
+    pages: Optional[int]
+    has_more: bool = False
+    # Opaque cursor for the next page, None on the last page
+    next_cursor: Optional[str] = None
\ No newline at end of file
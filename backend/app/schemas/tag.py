@@ -0,0 +1,12 @@
+# backend/app/schemas/tag.py
+from typing import List, Optional
+from pydantic import BaseModel
+
+class TagCount(BaseModel):
+    name: str
+    published: int
+    # Including drafts; only shown to the admin
+    total: Optional[int] = None
+
+class TagList(BaseModel):
+    tags: List[TagCount]
@@ -0,0 +1,110 @@
+# backend/app/services/batch_service.py
+from datetime import datetime
+from typing import Dict, List
+
+from bson import ObjectId
+from pymongo import UpdateMany
+from pymongo.database import Database
+
+from ..schemas.post import PostBatch
+from . import post_service
+
+# Enough of each post to decide its per-item result
+_STATE_PROJECTION = {"_id": 1, "tags": 1, "is_published": 1}
+
+def _retagged(tags: List[str], add: List[str], remove: List[str]) -> List[str]:
+    kept = [tag for tag in tags if tag not in remove]
+    return kept + [tag for tag in add if tag not in kept]
+
+def _clean_tags(tags: List[str]) -> List[str]:
+    return list(dict.fromkeys(tag.strip() for tag in tags if tag.strip()))
+
+async def run_batch(db: Database, batch: PostBatch) -> dict:
+    """
+    Apply a batch operation with as few writes as possible.
+
+    The selected posts are read once; posts already in the requested
+    state are left alone, the others are written with a single
+    update_many / delete_many (or, for retag, an ordered bulk_write of
+    $pull then $addToSet). In-process caches and the cross-worker version
+    are refreshed once for the whole batch.
+
+    Args:
+        db: MongoDB database instance
+        batch: Validated batch request
+
+    Returns:
+        Result shaped like PostBatchResult
+    """
+    statuses: Dict[str, str] = {}
+    if batch.ids is not None:
+        object_ids = []
+        for raw in batch.ids:
+            if not ObjectId.is_valid(raw):
+                statuses[raw] = "invalid_id"
+                continue
+            # Keyed (and echoed) in canonical form, as the results for the
+            # selected posts are: hex ids are case-insensitive
+            object_id = ObjectId(raw)
+            if str(object_id) not in statuses:
+                object_ids.append(object_id)
+                statuses[str(object_id)] = "not_found"
+        query = {"_id": {"$in": object_ids}}
+    else:
+        query = batch.filter.model_dump(exclude_none=True)
+        if "tag" in query:
+            query["tags"] = query.pop("tag")
+
+    selected = await db.posts.find(query, _STATE_PROJECTION).to_list(None)
+    now = datetime.utcnow()
+    changed: List[ObjectId] = []
+
+    if batch.action in ("publish", "unpublish"):
+        value = batch.action == "publish"
+        changed = [post["_id"] for post in selected if post.get("is_published", False) != value]
+        if changed:
+            await db.posts.update_many(
+                {"_id": {"$in": changed}},
+                {"$set": {"is_published": value, "updated_at": now}},
+            )
+    elif batch.action == "retag":
+        add, remove = _clean_tags(batch.add_tags), _clean_tags(batch.remove_tags)
+        changed = [
+            post["_id"] for post in selected
+            if _retagged(post.get("tags", []), add, remove) != post.get("tags", [])
+        ]
+        operations = []
+        if changed and remove:
+            operations.append(UpdateMany(
+                {"_id": {"$in": changed}},
+                {"$pull": {"tags": {"$in": remove}}, "$set": {"updated_at": now}},
+            ))
+        if changed and add:
+            operations.append(UpdateMany(
+                {"_id": {"$in": changed}},
+                {"$addToSet": {"tags": {"$each": add}}, "$set": {"updated_at": now}},
+            ))
+        if operations:
+            await db.posts.bulk_write(operations, ordered=True)
+    elif batch.action == "delete":
+        changed = [post["_id"] for post in selected]
+        if changed:
+            await db.posts.delete_many({"_id": {"$in": changed}})
+
+    changed_set = set(changed)
+    done = "deleted" if batch.action == "delete" else "updated"
+    for post in selected:
+        statuses[str(post["_id"])] = done if post["_id"] in changed_set else "unchanged"
+
+    if changed and batch.action == "delete":
+        await post_service.posts_deleted(db, selected)
+    elif changed:
+        saved = await db.posts.find({"_id": {"$in": changed}}).to_list(None)
+        await post_service.posts_saved(db, saved, {post["_id"]: post for post in selected})
+
+    return {
+        "action": batch.action,
+        "matched": len(selected),
+        "modified": len(changed),
+        "results": [{"id": post_id, "status": status} for post_id, status in statuses.items()],
+    }
@@ -0,0 +1,109 @@
+# backend/app/services/change_service.py
+"""
+Shared post version and the log of which posts each version changed.
+
+Every post write bumps a counter stored in MongoDB and records the ids
+it touched in `post_changes`, under the new version. A worker whose
+in-process state was built from version v catches up with other workers
+by re-reading only the posts changed after v, instead of every post.
+
+The counter document also keeps the time of the latest write, which,
+unlike the posts' updated_at, advances on deletes and unpublishes.
+
+Entries expire through a TTL index after POST_CHANGES_TTL seconds. A
+worker that fell further behind, or finds an entry missing (a writer
+between its two steps, or one that died there), rebuilds in full.
+"""
+from datetime import datetime
+from typing import Iterable, Optional, Set
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.database import Database
+
+from ..config import settings
+
+VERSION_ID = "posts"
+
+async def ensure_indexes(db: Database) -> None:
+    """
+    Create the TTL index that removes old log entries.
+
+    Args:
+        db: MongoDB database instance
+    """
+    await db.post_changes.create_index("at", expireAfterSeconds=settings.POST_CHANGES_TTL)
+
+async def current(db: Database) -> int:
+    """
+    Read the shared post version.
+
+    Args:
+        db: MongoDB database instance
+
+    Returns:
+        Version counter, 0 before the first write
+    """
+    doc = await db.meta.find_one({"_id": VERSION_ID})
+    return doc["version"] if doc else 0
+
+async def last_changed(db: Database) -> Optional[datetime]:
+    """
+    Read the time of the latest post write, deletes included.
+
+    Args:
+        db: MongoDB database instance
+
+    Returns:
+        Naive UTC datetime, None before the first recorded write
+    """
+    doc = await db.meta.find_one({"_id": VERSION_ID}, {"at": 1})
+    return doc.get("at") if doc else None
+
+async def record(db: Database, post_ids: Optional[Iterable[ObjectId]]) -> int:
+    """
+    Bump the shared version and log the posts the write changed.
+
+    Args:
+        db: MongoDB database instance
+        post_ids: Posts written or deleted; None when a bulk write may
+            have changed any post
+
+    Returns:
+        The new version
+    """
+    now = datetime.utcnow()
+    doc = await db.meta.find_one_and_update(
+        {"_id": VERSION_ID},
+        {"$inc": {"version": 1}, "$max": {"at": now}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    await db.post_changes.insert_one({
+        "_id": doc["version"],
+        "posts": None if post_ids is None else list(set(post_ids)),
+        "at": now,
+    })
+    return doc["version"]
+
+async def since(db: Database, version: int, until: int) -> Optional[Set[ObjectId]]:
+    """
+    Collect the posts changed after one version, up to another.
+
+    Args:
+        db: MongoDB database instance
+        version: Version the caller's state was built from
+        until: Version to catch up to, as read with current()
+
+    Returns:
+        Ids of the changed posts, or None if the log cannot tell (an entry
+        is missing or records a bulk write) and everything must be reloaded
+    """
+    changed: Set[ObjectId] = set()
+    entries = 0
+    async for entry in db.post_changes.find({"_id": {"$gt": version, "$lte": until}}):
+        if entry["posts"] is None:
+            return None
+        changed.update(entry["posts"])
+        entries += 1
+    return changed if entries == until - version else None
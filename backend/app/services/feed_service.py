@@ -0,0 +1,180 @@
+# backend/app/services/feed_service.py
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from pymongo import DESCENDING
+from pymongo.database import Database
+
+from ..config import settings
+from . import change_service, post_service
+
+EPOCH = datetime(1970, 1, 1)
+
+# Bytes streamed per chunk; items are small so a few are grouped together
+CHUNK_SIZE = 16 * 1024
+
+class Document:
+    """
+    A complete feed or sitemap together with its validators.
+    """
+    __slots__ = ("body", "etag", "last_modified", "generation")
+
+    def __init__(self, body: bytes, etag: str, last_modified: datetime, generation: int):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.generation = generation
+
+# Generated documents by name; valid while the post cache generation is unchanged
+_documents: Dict[str, Document] = {}
+
+def cached(name: str) -> Optional[Document]:
+    """
+    Look up a generated document that no post write has invalidated.
+
+    Args:
+        name: "feed" or "sitemap"
+
+    Returns:
+        The document, or None if it must be generated
+    """
+    document = _documents.get(name)
+    if document is not None and document.generation == post_service.generation():
+        return document
+    return None
+
+def store(name: str, document: Document) -> None:
+    """
+    Keep a generated document until the next post write.
+
+    Args:
+        name: "feed" or "sitemap"
+        document: Document generated during document.generation
+    """
+    if document.generation == post_service.generation():
+        _documents[name] = document
+
+async def last_modified(db: Database) -> datetime:
+    """
+    Time the feeds last changed: the latest post write, or the latest
+    update time of a published post if that is later (imports keep the
+    exported one). The write time also moves for deletes and unpublishes,
+    which remove entries without updating any published post.
+
+    Args:
+        db: MongoDB database instance
+
+    Returns:
+        Naive UTC datetime, the epoch before the first write
+    """
+    post = await db.posts.find_one(
+        {"is_published": True}, {"updated_at": 1}, sort=[("updated_at", DESCENDING)]
+    )
+    changed = await change_service.last_changed(db)
+    return max(post["updated_at"] if post else EPOCH, changed or EPOCH)
+
+def _url(path: str) -> str:
+    return settings.SITE_URL.rstrip("/") + path
+
+def http_date(value: datetime) -> str:
+    """
+    Format a naive UTC datetime for HTTP headers and RSS.
+
+    Args:
+        value: Naive UTC datetime
+
+    Returns:
+        RFC 7231 / RFC 822 date
+    """
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+def _w3c_date(value: datetime) -> str:
+    return value.replace(microsecond=0).isoformat() + "Z"
+
+async def _chunked(parts: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    buffer = []
+    size = 0
+    async for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+async def _rss_parts(db: Database, updated: datetime) -> AsyncIterator[str]:
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/">\n<channel>\n'
+        f"<title>{escape(settings.PROJECT_NAME)}</title>\n"
+        f"<link>{escape(_url('/'))}</link>\n"
+        f"<description>{escape(settings.SITE_DESCRIPTION)}</description>\n"
+        f'<atom:link href="{escape(_url("/feed.xml"))}" rel="self" type="application/rss+xml"/>\n'
+        f"<lastBuildDate>{http_date(updated)}</lastBuildDate>\n"
+    )
+    cursor = db.posts.find(
+        {"is_published": True},
+        {"title": 1, "slug": 1, "summary": 1, "content_html": 1, "tags": 1, "created_at": 1},
+    ).sort(post_service.LISTING_SORT).limit(settings.FEED_SIZE)
+    async for post in cursor:
+        link = escape(_url(f"/post/{quote(post['slug'])}"))
+        item = [
+            "<item>\n",
+            f"<title>{escape(post['title'])}</title>\n",
+            f"<link>{link}</link>\n",
+            f'<guid isPermaLink="false">{post["_id"]}</guid>\n',
+            f"<pubDate>{http_date(post['created_at'])}</pubDate>\n",
+        ]
+        if post.get("summary"):
+            item.append(f"<description>{escape(post['summary'])}</description>\n")
+        for tag in post.get("tags") or ():
+            item.append(f"<category>{escape(tag)}</category>\n")
+        if post.get("content_html"):
+            html = post["content_html"].replace("]]>", "]]]]><![CDATA[>")
+            item.append(f"<content:encoded><![CDATA[{html}]]></content:encoded>\n")
+        item.append("</item>\n")
+        yield "".join(item)
+    yield "</channel>\n</rss>\n"
+
+async def _sitemap_parts(db: Database, updated: datetime) -> AsyncIterator[str]:
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        f"<url><loc>{escape(_url('/'))}</loc><lastmod>{_w3c_date(updated)}</lastmod></url>\n"
+    )
+    cursor = db.posts.find({"is_published": True}, {"slug": 1, "updated_at": 1}).sort(post_service.LISTING_SORT)
+    async for post in cursor:
+        loc = escape(_url(f"/post/{quote(post['slug'])}"))
+        yield f"<url><loc>{loc}</loc><lastmod>{_w3c_date(post['updated_at'])}</lastmod></url>\n"
+    yield "</urlset>\n"
+
+def rss(db: Database, updated: datetime) -> AsyncIterator[bytes]:
+    """
+    Stream the RSS 2.0 feed of the latest FEED_SIZE published posts.
+
+    Args:
+        db: MongoDB database instance
+        updated: Result of last_modified()
+
+    Returns:
+        Body chunks
+    """
+    return _chunked(_rss_parts(db, updated))
+
+def sitemap(db: Database, updated: datetime) -> AsyncIterator[bytes]:
+    """
+    Stream the sitemap of the home page and every published post.
+
+    Args:
+        db: MongoDB database instance
+        updated: Result of last_modified()
+
+    Returns:
+        Body chunks
+    """
+    return _chunked(_sitemap_parts(db, updated))
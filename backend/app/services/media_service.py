@@ -0,0 +1,339 @@
+# backend/app/services/media_service.py
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Set, Tuple
+
+from fastapi import UploadFile
+from PIL import Image, ImageOps
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..core.compression import brotli
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+IMAGES_DIR = "images"
+
+# Names save_upload() gives uploaded images; variants and other files never match
+ORIGINAL_NAME_RE = re.compile(r"^[0-9a-f]{32}\.(jpg|jpeg|png|webp|gif)$")
+
+# Re-encoded formats for each source extension: WebP plus a fallback
+# every browser understands. GIFs (animation) and PDFs are left alone.
+VARIANT_FORMATS = {
+    "jpg": ("WEBP", "JPEG"),
+    "jpeg": ("WEBP", "JPEG"),
+    "png": ("WEBP", "PNG"),
+}
+FORMAT_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg", "PNG": "png"}
+FORMAT_MEDIA_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg", "PNG": "image/png"}
+
+MANIFEST_SUFFIX = ".variants.json"
+
+# Uploads worth storing precompressed; images are already compressed
+PRECOMPRESS_EXTENSIONS = {"pdf", "svg"}
+# Keep a compressed sibling only if it saves at least this fraction
+PRECOMPRESS_MIN_SAVING = 0.1
+
+# Variants are generated here, never in the request path. Pillow releases
+# the GIL while resizing and encoding, so threads do not stall the loop.
+_variant_pool = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_VARIANT_WORKERS, thread_name_prefix="image-variants"
+)
+_pending: Set[str] = set()
+_tasks: Set[asyncio.Future] = set()
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_SIZE."""
+
+def _open_temp(directory: str):
+    return tempfile.NamedTemporaryFile(dir=directory, prefix=".upload-", delete=False)
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+async def save_upload(file: UploadFile, extension: str) -> Tuple[str, bool]:
+    """
+    Stream an upload to disk under a name derived from its SHA-256.
+
+    Starlette has already spooled the whole multipart body to a temporary
+    file by the time this runs; BodyLimitMiddleware keeps that body within
+    MAX_UPLOAD_SIZE plus the multipart overhead. The file is copied from
+    the spool in chunks off the event loop and hashed on the way; the copy
+    stops once the file itself exceeds MAX_UPLOAD_SIZE. A file whose
+    content is already stored is not written again.
+
+    Args:
+        file: Uploaded file
+        extension: Validated, lowercase file extension
+
+    Returns:
+        (public URL, True if an identical file already existed)
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds MAX_UPLOAD_SIZE
+    """
+    upload_dir = os.path.join(settings.MEDIA_ROOT, IMAGES_DIR)
+    os.makedirs(upload_dir, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    temp = await run_in_threadpool(_open_temp, upload_dir)
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_SIZE:
+                raise UploadTooLargeError()
+            digest.update(chunk)
+            await run_in_threadpool(temp.write, chunk)
+        await run_in_threadpool(temp.close)
+    except BaseException:
+        await run_in_threadpool(temp.close)
+        await run_in_threadpool(_discard, temp.name)
+        raise
+
+    # 128 bits of the digest are plenty to tell uploads apart
+    filename = f"{digest.hexdigest()[:32]}.{extension}"
+    file_path = os.path.join(upload_dir, filename)
+    url = f"/media/{IMAGES_DIR}/{filename}"
+
+    if os.path.exists(file_path):
+        await run_in_threadpool(_discard, temp.name)
+        return url, True
+
+    os.chmod(temp.name, 0o644)
+    os.replace(temp.name, file_path)
+    return url, False
+
+def is_original(filename: str) -> bool:
+    """
+    Whether a name is that of an uploaded image, as opposed to a variant or anything else.
+
+    Args:
+        filename: File name without directory
+
+    Returns:
+        True if variants may be generated from it
+    """
+    return ORIGINAL_NAME_RE.match(filename) is not None
+
+def _stem(filename: str) -> str:
+    return filename.rsplit(".", 1)[0]
+
+def manifest_path(filename: str) -> str:
+    """
+    Path of the variants manifest stored next to an uploaded image.
+
+    Args:
+        filename: Name of the original file in the images directory
+
+    Returns:
+        Manifest path
+    """
+    return os.path.join(settings.MEDIA_ROOT, IMAGES_DIR, _stem(filename) + MANIFEST_SUFFIX)
+
+def _save_image(image: Image.Image, path: str, fmt: str) -> None:
+    options = {}
+    if fmt == "WEBP":
+        options = {"quality": settings.WEBP_QUALITY, "method": 4}
+    elif fmt == "JPEG":
+        options = {"quality": settings.JPEG_QUALITY, "optimize": True, "progressive": True}
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+    elif fmt == "PNG":
+        options = {"optimize": True}
+
+    temp = path + ".tmp"
+    image.save(temp, fmt, **options)
+    os.replace(temp, path)
+
+def generate_variants(filename: str) -> Optional[dict]:
+    """
+    Write resized, re-encoded variants of an uploaded image and their manifest.
+
+    Runs synchronously; call it through schedule_variants(). If the image
+    cannot be processed, a manifest marking the failure is written
+    instead, so it is not queued again.
+
+    Args:
+        filename: Name of the original file in the images directory
+
+    Returns:
+        The manifest, or None if the file type has no variants
+    """
+    extension = filename.rsplit(".", 1)[-1].lower()
+    formats = VARIANT_FORMATS.get(extension)
+    if formats is None:
+        return None
+
+    try:
+        return _write_variants(filename, formats)
+    except Exception:
+        _write_manifest(filename, {"failed": True})
+        raise
+
+def _write_manifest(filename: str, manifest: dict) -> None:
+    path = manifest_path(filename)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+def _write_variants(filename: str, formats: Tuple[str, str]) -> dict:
+    image_dir = os.path.join(settings.MEDIA_ROOT, IMAGES_DIR)
+    with Image.open(os.path.join(image_dir, filename)) as source:
+        source = ImageOps.exif_transpose(source)
+        source.load()
+
+    width, height = source.size
+    widths = sorted({w for w in settings.IMAGE_VARIANT_WIDTHS if w < width} | {width})
+
+    # The original is the full-width entry for the fallback format
+    variants = [{
+        "url": f"/media/{IMAGES_DIR}/{filename}",
+        "width": width,
+        "height": height,
+        "media_type": FORMAT_MEDIA_TYPES[formats[1]],
+    }]
+    for target_width in widths:
+        target_height = max(1, round(height * target_width / width))
+        resized = source if target_width == width else source.resize(
+            (target_width, target_height), Image.LANCZOS
+        )
+        for fmt in formats:
+            if target_width == width and fmt != "WEBP":
+                continue
+            name = f"{_stem(filename)}-{target_width}w.{FORMAT_EXTENSIONS[fmt]}"
+            _save_image(resized, os.path.join(image_dir, name), fmt)
+            variants.append({
+                "url": f"/media/{IMAGES_DIR}/{name}",
+                "width": target_width,
+                "height": target_height,
+                "media_type": FORMAT_MEDIA_TYPES[fmt],
+            })
+
+    manifest = {"width": width, "height": height, "variants": variants}
+    _write_manifest(filename, manifest)
+    return manifest
+
+def _variants_done(filename: str, future: asyncio.Future) -> None:
+    _pending.discard(filename)
+    _tasks.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Generating variants of %s failed", filename, exc_info=future.exception())
+
+def schedule_variants(filename: str) -> bool:
+    """
+    Queue variant generation for an uploaded image in the background pool.
+
+    Nothing is queued for an image that is already queued, that has a
+    manifest (of its variants or of a failure), or while
+    IMAGE_VARIANT_QUEUE_SIZE images are queued; get_variants() then still
+    reports it as "unavailable", and a later call can queue it.
+
+    Args:
+        filename: Name of the original file in the images directory
+
+    Returns:
+        True if the file type gets variants
+    """
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension not in VARIANT_FORMATS:
+        return False
+    if filename in _pending or os.path.exists(manifest_path(filename)):
+        return True
+    if len(_pending) >= settings.IMAGE_VARIANT_QUEUE_SIZE:
+        logger.warning("Variant queue full, not queueing %s", filename)
+        return True
+
+    _pending.add(filename)
+    future = asyncio.get_running_loop().run_in_executor(_variant_pool, generate_variants, filename)
+    _tasks.add(future)
+    future.add_done_callback(lambda f: _variants_done(filename, f))
+    return True
+
+def get_variants(filename: str) -> Tuple[str, Optional[dict]]:
+    """
+    Look up the variants of an uploaded image.
+
+    Args:
+        filename: Name of the original file in the images directory
+
+    Returns:
+        (status, manifest) where status is "ready", "pending", "failed"
+        (the image could not be processed) or "unavailable"
+    """
+    path = manifest_path(filename)
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest.get("failed"):
+            return "failed", None
+        return "ready", manifest
+    if filename in _pending:
+        return "pending", None
+    return "unavailable", None
+
+def precompress(filename: str) -> bool:
+    """
+    Write gzip and brotli siblings (<name>.gz, <name>.br) of an upload for MediaFiles to serve.
+
+    Runs synchronously; call it through schedule_precompression().
+
+    Args:
+        filename: Name of the original file in the images directory
+
+    Returns:
+        True if a sibling was written
+    """
+    path = os.path.join(settings.MEDIA_ROOT, IMAGES_DIR, filename)
+    with open(path, "rb") as f:
+        data = f.read()
+
+    compressed = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed[".br"] = brotli.compress(data, quality=11)
+
+    written = False
+    for suffix, body in compressed.items():
+        if len(body) > len(data) * (1 - PRECOMPRESS_MIN_SAVING):
+            continue
+        with open(path + suffix + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(path + suffix + ".tmp", path + suffix)
+        written = True
+    return written
+
+def schedule_precompression(filename: str) -> bool:
+    """
+    Queue precompression of a compressible upload in the background pool.
+
+    Args:
+        filename: Name of the original file in the images directory
+
+    Returns:
+        True if the file type is compressible
+    """
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension not in PRECOMPRESS_EXTENSIONS:
+        return False
+    if os.path.exists(os.path.join(settings.MEDIA_ROOT, IMAGES_DIR, filename + ".gz")):
+        return True
+
+    future = asyncio.get_running_loop().run_in_executor(_variant_pool, precompress, filename)
+    _tasks.add(future)
+    future.add_done_callback(_tasks.discard)
+    return True
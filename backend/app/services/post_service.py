@@ -0,0 +1,310 @@
+# backend/app/services/post_service.py
+import asyncio
+import base64
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.database import Database
+
+from ..config import settings
+from ..core.cache import LRUCache
+from ..core.http_cache import response_cache
+from . import change_service, related_service, snapshot_service, tag_service
+from .search_service import PROJECTION as SEARCH_PROJECTION, search_index
+
+logger = logging.getLogger(__name__)
+
+# Every post write bumps a version counter stored in MongoDB and logs the
+# posts it changed (change_service). Each worker remembers the version its
+# in-process state was built from and, when another worker has moved the
+# counter on, re-reads the posts changed since.
+_local_version: Optional[int] = None
+_last_sync = 0.0
+# Full reload running in the background, while the current state is served
+_reload: Optional[asyncio.Task] = None
+
+# Listing counts keyed by the normalized filter
+_counts = LRUCache(maxsize=settings.COUNT_CACHE_SIZE)
+
+# Bumped whenever cached post data is invalidated, so a result computed
+# before a write is not stored after it
+_generation = 0
+
+# Listing order; _id breaks ties between posts created in the same millisecond
+LISTING_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# Fields left in MongoDB for view=summary listings
+SUMMARY_PROJECTION = {"content": 0, "content_html": 0, "toc": 0}
+
+async def ensure_indexes(db: Database) -> None:
+    """
+    Create the indexes the post queries rely on.
+
+    Args:
+        db: MongoDB database instance
+    """
+    await db.posts.create_index("slug")
+    await db.posts.create_index(LISTING_SORT)
+    await db.posts.create_index([("is_published", ASCENDING)] + LISTING_SORT)
+    await db.posts.create_index([("tags", ASCENDING)] + LISTING_SORT)
+    await db.posts.create_index([("is_published", ASCENDING), ("updated_at", DESCENDING)])
+
+def encode_cursor(post: dict) -> str:
+    """
+    Encode the listing position right after a post as an opaque cursor.
+
+    Args:
+        post: Last post document of a page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{post['created_at'].isoformat()}|{post['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        (created_at, _id) of the last post of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, post_id = raw.split("|")
+        return datetime.fromisoformat(created_at), ObjectId(post_id)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+def after_cursor(cursor: str) -> dict:
+    """
+    Build the range predicate selecting posts that come after a cursor in LISTING_SORT order.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        MongoDB filter
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, post_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": post_id}},
+        ]
+    }
+
+def generation() -> int:
+    """
+    Current cache generation; compare before and after building a cacheable result.
+
+    Returns:
+        Generation counter
+    """
+    return _generation
+
+def version() -> Optional[int]:
+    """
+    Shared post version this worker's state was built from.
+
+    Workers that have synced to the same version serve the same content,
+    so it can go into validators that must agree across workers.
+
+    Returns:
+        Version counter, None before the first load
+    """
+    return _local_version
+
+def _invalidate() -> None:
+    global _generation
+    _counts.clear()
+    response_cache.clear()
+    _generation += 1
+
+async def count_posts(db: Database, filter_query: dict, estimated: bool = False) -> int:
+    """
+    Count the posts matching a listing filter, caching the result until the next write.
+
+    Args:
+        db: MongoDB database instance
+        filter_query: Listing filter made of plain equality conditions
+        estimated: Use the collection metadata count when the filter is empty
+
+    Returns:
+        Number of matching posts
+    """
+    estimated = estimated and not filter_query
+    key = (estimated,) + tuple(sorted(filter_query.items()))
+    total = _counts.get(key)
+    if total is not None:
+        return total
+
+    started = _generation
+    if estimated:
+        total = await db.posts.estimated_document_count()
+    else:
+        total = await db.posts.count_documents(filter_query)
+    if started == _generation:
+        _counts.set(key, total)
+    return total
+
+async def _bump_version(db: Database, post_ids: Optional[List[ObjectId]]) -> None:
+    global _local_version
+    version = await change_service.record(db, post_ids)
+    # If another worker wrote in between, leave our version stale so the
+    # next sync() picks up its changes too.
+    if _local_version is not None and version == _local_version + 1:
+        _local_version = version
+
+async def load(db: Database) -> None:
+    """
+    Build the in-process post state (search index, caches) from MongoDB.
+
+    Args:
+        db: MongoDB database instance
+    """
+    global _local_version, _last_sync
+    version = await change_service.current(db)
+    await search_index.rebuild(db)
+    _invalidate()
+    _local_version = version
+    _last_sync = time.monotonic()
+
+async def _reload_posts(db: Database) -> None:
+    global _reload
+    try:
+        await load(db)
+    except Exception:
+        logger.exception("Reloading posts failed")
+    finally:
+        _reload = None
+
+async def _catch_up(db: Database, changed: Set[ObjectId], version: int) -> None:
+    global _local_version
+    posts = await db.posts.find({"_id": {"$in": list(changed)}}, SEARCH_PROJECTION).to_list(None)
+    for post in posts:
+        search_index.add(post)
+    for post_id in changed - {post["_id"] for post in posts}:
+        search_index.remove(str(post_id))
+    _invalidate()
+    _local_version = version
+
+async def sync(db: Database) -> None:
+    """
+    Refresh the in-process post state if another worker changed posts.
+
+    The shared version is checked at most once every
+    POSTS_SYNC_INTERVAL seconds. Posts changed since this worker's
+    version are re-read and re-indexed in place. When the change log
+    cannot tell which posts changed, or more than POSTS_SYNC_MAX_CHANGES
+    did, everything is reloaded in the background and the current state
+    is served until the new one is swapped in.
+
+    Args:
+        db: MongoDB database instance
+    """
+    global _last_sync, _reload
+    if _local_version is None:
+        # Nothing to serve meanwhile: the startup load failed
+        await load(db)
+        return
+    now = time.monotonic()
+    if now - _last_sync < settings.POSTS_SYNC_INTERVAL or _reload is not None:
+        return
+    _last_sync = now
+
+    version = await change_service.current(db)
+    if version == _local_version:
+        return
+    changed = await change_service.since(db, _local_version, version)
+    if changed is not None and len(changed) <= settings.POSTS_SYNC_MAX_CHANGES:
+        await _catch_up(db, changed, version)
+    else:
+        _reload = asyncio.get_running_loop().create_task(_reload_posts(db))
+
+async def post_saved(db: Database, post: dict, previous: Optional[dict] = None) -> None:
+    """
+    Update the in-process post state after a post was created or updated.
+
+    Args:
+        db: MongoDB database instance
+        post: Post document as stored in MongoDB
+        previous: Post document before an update, None for a new post
+    """
+    await posts_saved(db, [post], {previous["_id"]: previous} if previous else None)
+
+async def post_deleted(db: Database, post: dict) -> None:
+    """
+    Update the in-process post state after a post was deleted.
+
+    Args:
+        db: MongoDB database instance
+        post: Post document as it was before deletion
+    """
+    await posts_deleted(db, [post])
+
+async def posts_saved(db: Database, posts: List[dict], previous: Optional[Dict[ObjectId, dict]] = None) -> None:
+    """
+    Update the post state after a batch of posts was written.
+
+    Tag counts are adjusted from the tag and publish changes; caches are
+    invalidated and the shared version bumped once for the whole batch.
+
+    Args:
+        db: MongoDB database instance
+        posts: Post documents as stored in MongoDB
+        previous: Documents (at least tags and is_published) before the
+            write, by _id; posts missing from it are new
+    """
+    previous = previous or {}
+    await tag_service.apply(db, [(previous.get(post["_id"]), post) for post in posts])
+    for post in posts:
+        search_index.add(post)
+    _invalidate()
+    await _bump_version(db, [post["_id"] for post in posts])
+    related_service.schedule_refresh(db, [post["_id"] for post in posts])
+    snapshot_service.schedule_build(db, [post["_id"] for post in posts])
+
+async def posts_deleted(db: Database, posts: List[dict]) -> None:
+    """
+    Update the in-process post state after a batch of posts was deleted.
+
+    Args:
+        db: MongoDB database instance
+        posts: Post documents (at least tags and is_published) as they were
+            before deletion
+    """
+    await tag_service.apply(db, [(post, None) for post in posts])
+    for post in posts:
+        search_index.remove(str(post["_id"]))
+    _invalidate()
+    await _bump_version(db, [post["_id"] for post in posts])
+    related_service.schedule_refresh(db, [post["_id"] for post in posts])
+    snapshot_service.schedule_build(db, [post["_id"] for post in posts])
+
+async def posts_changed(db: Database) -> None:
+    """
+    Refresh the post state after a bulk write touched many posts.
+
+    Args:
+        db: MongoDB database instance
+    """
+    await tag_service.rebuild(db)
+    await search_index.rebuild(db)
+    _invalidate()
+    await _bump_version(db, None)
+    related_service.schedule_refresh(db)
+    snapshot_service.schedule_build(db)
@@ -0,0 +1,386 @@
+# backend/app/services/related_service.py
+import asyncio
+import logging
+import math
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from bson import ObjectId
+from pymongo import ReplaceOne
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from . import change_service
+from .search_service import plain_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Field repetitions when building term counts, so title words weigh more
+FIELD_WEIGHTS = (("title", 3), ("summary", 2), ("content", 1))
+
+# Rows of the similarity matrix computed at a time during a full rebuild
+BLOCK_ROWS = 256
+
+# Share of the posts rewritten since the corpus was built beyond which its
+# vocabulary and IDF are recomputed from every post
+REBUILD_FRACTION = 0.25
+
+# Lease on the first full rebuild of a deployment, in the meta collection
+REBUILD_LOCK_ID = "related-rebuild"
+REBUILD_LEASE = timedelta(minutes=10)
+
+_CORPUS_PROJECTION = {"title": 1, "summary": 1, "content": 1, "tags": 1, "is_published": 1}
+
+# Post ids waiting for a refresh; None in the set means a full rebuild
+_pending: Set[Optional[ObjectId]] = set()
+_task: Optional[asyncio.Task] = None
+
+# This worker's corpus, kept between refreshes and brought up to date from
+# the post change log, so a write only re-reads the posts that changed
+_corpus: Optional["Corpus"] = None
+
+_EMPTY_INDICES = np.zeros(0, dtype=np.int32)
+_EMPTY_VALUES = np.zeros(0, dtype=np.float32)
+
+class Corpus:
+    """
+    TF-IDF and tag vectors of every post, as sparse SciPy matrices.
+
+    Rows of `vectors` are L2-normalized, so cosine similarity is a dot
+    product. The vocabulary is limited to RELATED_MAX_FEATURES terms that
+    occur in at least two posts; rarer terms cannot make posts similar.
+
+    Vocabulary and IDF are fixed when the corpus is built. update()
+    recomputes the rows of changed posts against them, so a write costs
+    its own posts, not the corpus; stale() tells when enough has changed
+    that they should be recomputed from every post.
+    """
+    def __init__(self, posts: List[dict], version: int):
+        self.version = version
+        self.updated = 0
+        self.ids: List[Optional[ObjectId]] = []
+        self.index: Dict[ObjectId, int] = {}
+        self._published: List[bool] = []
+        self._term_rows: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._tag_rows: List[np.ndarray] = []
+        self._tag_columns: Dict[str, int] = {}
+
+        counts = [self._term_counts(post) for post in posts]
+        df = Counter(term for terms in counts for term in terms)
+        vocabulary = [term for term, n in df.most_common(settings.RELATED_MAX_FEATURES) if n >= 2]
+        self._columns = {term: i for i, term in enumerate(vocabulary)}
+        n = len(posts)
+        self._idf = np.array([math.log((1 + n) / (1 + df[term])) + 1 for term in vocabulary], dtype=np.float32)
+
+        for post, terms in zip(posts, counts):
+            self._set(post, terms)
+        self._pack()
+
+    @staticmethod
+    def _term_counts(post: dict) -> Counter:
+        counts = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            text = plain_text(post.get(field)) if field == "content" else post.get(field)
+            for term in tokenize(text):
+                counts[term] += weight
+        return counts
+
+    def _set(self, post: dict, terms: Counter) -> None:
+        row = self.index.get(post["_id"])
+        if row is None:
+            row = self.index[post["_id"]] = len(self.ids)
+            self.ids.append(post["_id"])
+            self._published.append(False)
+            self._term_rows.append((_EMPTY_INDICES, _EMPTY_VALUES))
+            self._tag_rows.append(_EMPTY_INDICES)
+
+        columns = []
+        tfs = []
+        for term, tf in terms.items():
+            column = self._columns.get(term)
+            if column is not None:
+                columns.append(column)
+                tfs.append(tf)
+        indices = np.array(columns, dtype=np.int32)
+        values = (1 + np.log(np.array(tfs, dtype=np.float32))) * self._idf[indices]
+        norm = np.linalg.norm(values)
+        if norm > 0:
+            values /= norm
+        self._term_rows[row] = (indices, values)
+
+        tags = {self._tag_columns.setdefault(tag, len(self._tag_columns)) for tag in post.get("tags") or ()}
+        self._tag_rows[row] = np.array(sorted(tags), dtype=np.int32)
+        self._published[row] = bool(post.get("is_published"))
+
+    def _drop(self, post_id: ObjectId) -> None:
+        row = self.index.pop(post_id, None)
+        if row is None:
+            return
+        # The row stays, empty, so other rows keep their positions
+        self.ids[row] = None
+        self._published[row] = False
+        self._term_rows[row] = (_EMPTY_INDICES, _EMPTY_VALUES)
+        self._tag_rows[row] = _EMPTY_INDICES
+
+    def _pack(self) -> None:
+        n = len(self.ids)
+        lengths = [len(indices) for indices, _ in self._term_rows]
+        self.vectors = sp.csr_matrix(
+            (
+                np.concatenate([values for _, values in self._term_rows] or [_EMPTY_VALUES]),
+                np.concatenate([indices for indices, _ in self._term_rows] or [_EMPTY_INDICES]),
+                np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))),
+            ),
+            shape=(n, len(self._columns)),
+        )
+        tag_lengths = [len(tags) for tags in self._tag_rows]
+        self.tags = sp.csr_matrix(
+            (
+                np.ones(sum(tag_lengths), dtype=np.float32),
+                np.concatenate(self._tag_rows or [_EMPTY_INDICES]),
+                np.concatenate(([0], np.cumsum(tag_lengths, dtype=np.int64))),
+            ),
+            shape=(n, len(self._tag_columns)),
+        )
+        self.tag_sizes = np.array(tag_lengths, dtype=np.float32)
+        self.published = np.array(self._published, dtype=bool)
+
+    def update(self, posts: List[dict], changed: Set[ObjectId], version: int) -> None:
+        """
+        Recompute the rows of changed posts with the corpus's vocabulary and IDF.
+
+        Args:
+            posts: Current documents of the changed posts that still exist
+            changed: Ids of every changed post; those missing from `posts` were deleted
+            version: Shared post version the posts were read at
+        """
+        present = set()
+        for post in posts:
+            self._set(post, self._term_counts(post))
+            present.add(post["_id"])
+        for post_id in changed - present:
+            self._drop(post_id)
+        self._pack()
+        self.updated += len(changed)
+        self.version = version
+
+    def stale(self) -> bool:
+        """
+        Whether more than REBUILD_FRACTION of the posts were rewritten since the corpus was built.
+
+        Returns:
+            True if it should be rebuilt from every post
+        """
+        return self.updated > REBUILD_FRACTION * max(1, len(self.index))
+
+    def similarities(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Blended similarity of some posts to every post.
+
+        Args:
+            rows: Row indices
+
+        Returns:
+            len(rows) x N matrix of TF-IDF cosine blended with tag Jaccard
+        """
+        weight = settings.RELATED_TAG_WEIGHT
+        cosine = (self.vectors[rows] @ self.vectors.T).toarray()
+        shared = (self.tags[rows] @ self.tags.T).toarray()
+        union = self.tag_sizes[rows][:, None] + self.tag_sizes[None, :] - shared
+        jaccard = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+        return (1 - weight) * cosine + weight * jaccard
+
+    def neighbours(self, row: int, scores: np.ndarray) -> List[dict]:
+        """
+        Top RELATED_POSTS_K published posts for one row of similarities.
+
+        Args:
+            row: Row index of the post
+            scores: Its row of similarities()
+
+        Returns:
+            [{"_id", "score"}] best first
+        """
+        scores = np.where(self.published, scores, 0)
+        scores[row] = 0
+        k = min(settings.RELATED_POSTS_K, len(scores))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [{"_id": self.ids[j], "score": round(float(scores[j]), 4)} for j in best if scores[j] > 0]
+
+def _rows(corpus: Corpus, rows: Iterable[int]) -> Dict[ObjectId, List[dict]]:
+    rows = np.fromiter(rows, dtype=np.intp)
+    result = {}
+    for start in range(0, len(rows), BLOCK_ROWS):
+        block = rows[start:start + BLOCK_ROWS]
+        for row, scores in zip(block, corpus.similarities(block)):
+            result[corpus.ids[row]] = corpus.neighbours(int(row), scores)
+    return result
+
+def _affected(corpus: Corpus, changed: Set[ObjectId], stored: Dict[ObjectId, List[dict]]) -> Set[int]:
+    """
+    Rows whose neighbours may differ after the changed posts were written.
+
+    A row is affected if it is a changed post, lists a changed post as a
+    neighbour, or now scores a changed post above its weakest neighbour.
+    """
+    changed_rows = np.array([corpus.index[post_id] for post_id in changed if post_id in corpus.index], dtype=np.intp)
+    affected = set(changed_rows.tolist())
+    columns = corpus.similarities(changed_rows).max(axis=0) if len(changed_rows) else None
+
+    for post_id, row in corpus.index.items():
+        neighbours = stored.get(post_id)
+        if neighbours is None or any(n["_id"] in changed for n in neighbours):
+            affected.add(row)
+        elif columns is not None and corpus.published[changed_rows].any():
+            weakest = neighbours[-1]["score"] if len(neighbours) >= settings.RELATED_POSTS_K else 0
+            if columns[row] > weakest:
+                affected.add(row)
+    return affected
+
+async def _load_corpus(db: Database, changed: Optional[Set[ObjectId]]) -> Corpus:
+    """
+    This worker's corpus, up to date with MongoDB.
+
+    Only the posts changed since the corpus was built or last updated are
+    read, as listed in the post change log. Every post is read, and the
+    corpus rebuilt, for a full rebuild, on the first refresh, when the
+    corpus is stale() or when the log cannot tell what changed.
+    """
+    global _corpus
+    version = await change_service.current(db)
+    corpus = _corpus
+    if changed is not None and corpus is not None and not corpus.stale():
+        logged = await change_service.since(db, corpus.version, version)
+        if logged is not None:
+            logged |= changed
+            posts = await db.posts.find({"_id": {"$in": list(logged)}}, _CORPUS_PROJECTION).to_list(None)
+            try:
+                await run_in_threadpool(corpus.update, posts, logged, version)
+            except Exception:
+                # Possibly half updated: rebuild next time
+                _corpus = None
+                raise
+            return corpus
+
+    posts = await db.posts.find({}, _CORPUS_PROJECTION).to_list(None)
+    _corpus = await run_in_threadpool(Corpus, posts, version)
+    return _corpus
+
+async def refresh(db: Database, changed: Optional[Set[ObjectId]] = None) -> int:
+    """
+    Recompute stored neighbours, for every post or only where a change matters.
+
+    Other posts' rows are not recomputed for IDF drift caused by a single
+    write; a full rebuild (or the next change nearby) picks that up.
+
+    Args:
+        db: MongoDB database instance
+        changed: Ids of posts written or deleted since the last refresh;
+            None for a full rebuild
+
+    Returns:
+        Number of rows written
+    """
+    corpus = await _load_corpus(db, changed)
+
+    if changed is None:
+        rows = list(corpus.index.values())
+        gone = {"_id": {"$nin": list(corpus.index)}}
+    else:
+        stored = {
+            doc["_id"]: doc["neighbours"]
+            async for doc in db.related.find({}, {"neighbours": 1})
+        }
+        rows = await run_in_threadpool(_affected, corpus, changed, stored)
+        gone = {"_id": {"$in": [post_id for post_id in changed if post_id not in corpus.index]}}
+
+    neighbours = await run_in_threadpool(_rows, corpus, rows)
+    now = datetime.utcnow()
+    if neighbours:
+        await db.related.bulk_write(
+            [
+                ReplaceOne({"_id": post_id}, {"neighbours": items, "computed_at": now}, upsert=True)
+                for post_id, items in neighbours.items()
+            ],
+            ordered=False,
+        )
+    await db.related.delete_many(gone)
+    return len(neighbours)
+
+async def claim_rebuild(db: Database) -> bool:
+    """
+    Take the lease on a deployment's first full rebuild, so one worker runs it.
+
+    The lease expires after REBUILD_LEASE; until then other workers only
+    refresh around their own writes.
+
+    Args:
+        db: MongoDB database instance
+
+    Returns:
+        True if this worker took the lease, False if another one holds it
+    """
+    now = datetime.utcnow()
+    try:
+        await db.meta.update_one(
+            {"_id": REBUILD_LOCK_ID, "expires_at": {"$lte": now}},
+            {"$set": {"expires_at": now + REBUILD_LEASE}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+async def _run(db: Database) -> None:
+    global _task
+    try:
+        while _pending:
+            changed = None if None in _pending else set(_pending)
+            _pending.clear()
+            try:
+                await refresh(db, changed)
+            except Exception:
+                logger.exception("Refreshing related posts failed")
+    finally:
+        _task = None
+
+def schedule_refresh(db: Database, post_ids: Optional[Iterable[ObjectId]] = None) -> None:
+    """
+    Queue a background refresh of related posts.
+
+    Changes arriving while a refresh runs are batched into the next one.
+
+    Args:
+        db: MongoDB database instance
+        post_ids: Posts that were written or deleted; None for a full rebuild
+    """
+    global _task
+    if post_ids is None:
+        _pending.add(None)
+    else:
+        _pending.update(post_ids)
+    if _task is None and _pending:
+        _task = asyncio.get_running_loop().create_task(_run(db))
+
+async def get_related(db: Database, post_id: ObjectId, limit: int) -> List[dict]:
+    """
+    Read the stored neighbours of a post.
+
+    Args:
+        db: MongoDB database instance
+        post_id: Post id
+        limit: Maximum number of neighbours
+
+    Returns:
+        [{"_id", "score"}] best first, empty until the first refresh
+    """
+    doc = await db.related.find_one({"_id": post_id})
+    return doc["neighbours"][:limit] if doc else []
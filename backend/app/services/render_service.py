@@ -0,0 +1,165 @@
+# backend/app/services/render_service.py
+import hashlib
+import html
+import math
+import re
+import secrets
+from typing import List, Tuple
+
+import markdown
+import nh3
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..core.cache import LRUCache
+from .search_service import plain_text
+
+MARKDOWN_EXTENSIONS = ["toc", "fenced_code", "tables", "sane_lists"]
+
+# Attributes kept by the sanitizer on top of nh3's defaults: heading ids
+# for the table of contents and classes for code highlighting
+ALLOWED_ATTRIBUTES = {tag: set(attrs) for tag, attrs in nh3.ALLOWED_ATTRIBUTES.items()}
+ALLOWED_ATTRIBUTES.setdefault("*", set()).update({"id", "class"})
+ALLOWED_ATTRIBUTES["a"].add("title")
+ALLOWED_ATTRIBUTES["img"].add("title")
+
+# Code spans are matched first so dollar signs inside code are left alone;
+# math is pulled out before Markdown runs and put back after sanitizing,
+# wrapped in KaTeX auto-render delimiters. Placeholders carry a random
+# nonce per render, so text in a post can never pass for one.
+_CODE_OR_MATH_RE = re.compile(
+    r"(?P<code>```.*?```|`[^`\n]+`)"
+    r"|\$\$(?P<display>.+?)\$\$"
+    r"|(?<![\\$\w])\$(?P<inline>[^$\n]+?)\$(?!\w)",
+    re.DOTALL,
+)
+_PLACEHOLDER = "MATH{nonce}P{index}X"
+# Markdown output Markdown treats as code (fenced, indented, inline), where
+# math found by the regex above is put back as the source text it was
+_CODE_HTML_RE = re.compile(r"<pre\b.*?</pre>|<code\b.*?</code>", re.DOTALL)
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Rendered artifacts keyed by content hash
+_rendered = LRUCache(maxsize=settings.RENDER_CACHE_SIZE)
+
+def content_hash(content: str) -> str:
+    """
+    Hash identifying a post body.
+
+    Args:
+        content: Post content
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def _extract_math(source: str, nonce: str) -> Tuple[str, List[Tuple[str, str]]]:
+    formulas: List[Tuple[str, str]] = []
+
+    def replace(match: re.Match) -> str:
+        if match.group("code"):
+            return match.group("code")
+        if match.group("display") is not None:
+            span = f'<span class="math math-display">\\[{html.escape(match.group("display"))}\\]</span>'
+        else:
+            span = f'<span class="math math-inline">\\({html.escape(match.group("inline"))}\\)</span>'
+        formulas.append((span, match.group(0)))
+        return _PLACEHOLDER.format(nonce=nonce, index=len(formulas) - 1)
+
+    return _CODE_OR_MATH_RE.sub(replace, source), formulas
+
+def _restore_math(body: str, toc: List[dict], nonce: str, formulas: List[Tuple[str, str]]) -> str:
+    """
+    Put the extracted math back into the sanitized HTML and the table of contents.
+
+    Placeholders inside code get the source text back; heading ids, which
+    the toc extension derived from a placeholder, get a stable "math<n>".
+    """
+    placeholder_re = re.compile(_PLACEHOLDER.format(nonce=nonce, index=r"(\d+)"))
+    slug_re = re.compile(_PLACEHOLDER.format(nonce=nonce, index=r"(\d+)").lower())
+
+    def restore(match: re.Match, as_source: bool) -> str:
+        index = int(match.group(1))
+        if index >= len(formulas):
+            return match.group(0)
+        span, source = formulas[index]
+        return html.escape(source, quote=False) if as_source else span
+
+    def restore_code(code: re.Match) -> str:
+        return placeholder_re.sub(lambda match: restore(match, True), code.group(0))
+
+    def restore_toc(tokens: List[dict]) -> None:
+        for token in tokens:
+            token["id"] = slug_re.sub(r"math\1", token["id"])
+            token["name"] = placeholder_re.sub(lambda match: formulas[int(match.group(1))][1], token["name"])
+            restore_toc(token["children"])
+
+    body = _CODE_HTML_RE.sub(restore_code, body)
+    body = placeholder_re.sub(lambda match: restore(match, False), body)
+    restore_toc(toc)
+    return slug_re.sub(r"math\1", body)
+
+def _clean_toc(tokens: List[dict]) -> List[dict]:
+    return [
+        {
+            "level": token["level"],
+            "id": token["id"],
+            "name": token["name"],
+            "children": _clean_toc(token["children"]),
+        }
+        for token in tokens
+    ]
+
+def render(content: str) -> dict:
+    """
+    Render post content to sanitized HTML and derive its metadata.
+
+    Markdown (or the HTML produced by the editor) is converted and
+    sanitized; LaTeX is kept for KaTeX auto-render on the client. Results
+    are cached by content hash. This is CPU bound; call it from a thread.
+
+    Args:
+        content: Post content
+
+    Returns:
+        Fields to store on the post: content_html, toc, word_count,
+        reading_time (minutes) and content_hash
+    """
+    digest = content_hash(content)
+    rendered = _rendered.get(digest)
+    if rendered is not None:
+        return dict(rendered)
+
+    nonce = secrets.token_hex(8)
+    source, formulas = _extract_math(content, nonce)
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    body = nh3.clean(md.convert(source), attributes=ALLOWED_ATTRIBUTES)
+    toc = _clean_toc(md.toc_tokens)
+    body = _restore_math(body, toc, nonce, formulas)
+
+    word_count = len(_WORD_RE.findall(plain_text(nh3.clean(content, tags=set()))))
+    rendered = {
+        "content_html": body,
+        "toc": toc,
+        "word_count": word_count,
+        "reading_time": max(1, math.ceil(word_count / settings.READING_WORDS_PER_MINUTE)),
+        "content_hash": digest,
+    }
+    _rendered.set(digest, rendered)
+    return dict(rendered)
+
+async def render_post(content: str) -> dict:
+    """
+    Render post content off the event loop, skipping the thread hop on a cache hit.
+
+    Args:
+        content: Post content
+
+    Returns:
+        Fields to store on the post, as returned by render()
+    """
+    rendered = _rendered.get(content_hash(content))
+    if rendered is not None:
+        return dict(rendered)
+    return await run_in_threadpool(render, content)
@@ -0,0 +1,349 @@
+# backend/app/services/search_service.py
+import html
+import math
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from pymongo.database import Database
+
+# Indexed fields and their BM25F boosts
+FIELDS = ("title", "tags", "summary", "content")
+FIELD_BOOSTS = (3.0, 2.5, 1.5, 1.0)
+FIELD_B = (0.5, 0.3, 0.75, 0.75)
+K1 = 1.2
+
+# Fields of a post document the index reads
+PROJECTION = {f: 1 for f in ("title", "tags", "summary", "content", "is_published", "created_at")}
+
+# Weight of terms reached through prefix expansion of the last query word
+PREFIX_WEIGHT = 0.6
+MAX_PREFIX_EXPANSIONS = 50
+
+SNIPPET_LENGTH = 200
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to with".split()
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_CODE_FENCE_RE = re.compile(r"```[^\n]*\n?")
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_MARKUP_RE = re.compile(r"[#*_>`~|]+")
+_SPACE_RE = re.compile(r"\s+")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms, stopwords removed
+    """
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+def plain_text(markdown: Optional[str]) -> str:
+    """
+    Strip the most common Markdown syntax so the text can be used in snippets.
+
+    Args:
+        markdown: Markdown source
+
+    Returns:
+        Plain text with collapsed whitespace
+    """
+    if not markdown:
+        return ""
+    text = _CODE_FENCE_RE.sub(" ", markdown)
+    text = _IMAGE_RE.sub(r"\1", text)
+    text = _LINK_RE.sub(r"\1", text)
+    text = _MARKUP_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+@dataclass
+class _IndexedPost:
+    created_at: float
+    is_published: bool
+    tags: Tuple[str, ...]
+    lengths: Tuple[int, ...]
+    terms: Tuple[str, ...]
+    summary: str
+    text: str
+
+@dataclass
+class SearchHit:
+    post_id: str
+    score: float
+
+@dataclass
+class SearchResult:
+    hits: List[SearchHit] = field(default_factory=list)
+    # Query terms after prefix expansion, used to highlight snippets
+    terms: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.hits)
+
+class SearchIndex:
+    """
+    In-process inverted index over posts with BM25F ranking.
+
+    Postings map a term to the per-field term frequencies of every post
+    containing it, so a query only touches the posts that match it.
+    """
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._posts: Dict[str, _IndexedPost] = {}
+        self._field_totals = [0] * len(FIELDS)
+        self._vocabulary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._posts)
+
+    def __contains__(self, post_id: str) -> bool:
+        return post_id in self._posts
+
+    def add(self, post: dict) -> None:
+        """
+        Index a post, replacing any previous version of it.
+
+        Args:
+            post: Post document as stored in MongoDB
+        """
+        post_id = str(post["_id"])
+        self.remove(post_id)
+
+        tags = tuple(post.get("tags") or [])
+        field_terms = (
+            tokenize(post.get("title")),
+            tokenize(" ".join(tags)),
+            tokenize(post.get("summary")),
+            tokenize(post.get("content")),
+        )
+
+        for i, terms in enumerate(field_terms):
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    self._vocabulary = None
+                postings.setdefault(post_id, [0] * len(FIELDS))[i] += 1
+            self._field_totals[i] += len(terms)
+
+        self._posts[post_id] = _IndexedPost(
+            created_at=post["created_at"].timestamp() if post.get("created_at") else 0.0,
+            is_published=bool(post.get("is_published")),
+            tags=tags,
+            lengths=tuple(len(terms) for terms in field_terms),
+            terms=tuple({t for terms in field_terms for t in terms}),
+            summary=post.get("summary") or "",
+            text=plain_text(post.get("content")),
+        )
+
+    def remove(self, post_id: str) -> None:
+        """
+        Drop a post from the index if present.
+
+        Args:
+            post_id: Post id
+        """
+        indexed = self._posts.pop(post_id, None)
+        if indexed is None:
+            return
+
+        for term in indexed.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(post_id, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+
+        for i, length in enumerate(indexed.lengths):
+            self._field_totals[i] -= length
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._posts.clear()
+        self._field_totals = [0] * len(FIELDS)
+        self._vocabulary = None
+
+    async def rebuild(self, db: Database) -> None:
+        """
+        Rebuild the index from every post in MongoDB.
+
+        The new index is built off to the side and swapped in at the end,
+        so searches keep being served from the old one meanwhile.
+
+        Args:
+            db: MongoDB database instance
+        """
+        fresh = SearchIndex()
+        async for post in db.posts.find({}, PROJECTION):
+            fresh.add(post)
+
+        self._postings = fresh._postings
+        self._posts = fresh._posts
+        self._field_totals = fresh._field_totals
+        self._vocabulary = None
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+
+        expansions = []
+        i = bisect_left(self._vocabulary, prefix)
+        while i < len(self._vocabulary) and len(expansions) < MAX_PREFIX_EXPANSIONS:
+            term = self._vocabulary[i]
+            if not term.startswith(prefix):
+                break
+            if term != prefix:
+                expansions.append(term)
+            i += 1
+        return expansions
+
+    def _parse_query(self, query: str) -> List[Dict[str, float]]:
+        """
+        Turn a query into groups of weighted terms.
+
+        Every group must match for a post to be a hit. The last word is
+        treated as a prefix unless the query ends with whitespace, so
+        results keep up with a user who is still typing.
+        """
+        words = tokenize(query)
+        groups = [{word: 1.0} for word in words]
+        if groups and query[-1:].isalnum() and query.lower().endswith(words[-1]):
+            for term in self._expand_prefix(words[-1]):
+                groups[-1][term] = PREFIX_WEIGHT
+        return groups
+
+    def search(
+        self,
+        query: str,
+        published_only: bool = True,
+        tag: Optional[str] = None,
+    ) -> SearchResult:
+        """
+        Run a ranked search.
+
+        Args:
+            query: Free text query
+            published_only: Skip unpublished posts
+            tag: Only return posts carrying this tag
+
+        Returns:
+            SearchResult with hits ordered by relevance, then recency
+        """
+        groups = self._parse_query(query)
+        if not groups:
+            return SearchResult()
+
+        n_posts = len(self._posts)
+        avg_lengths = [(total / n_posts) if n_posts else 0.0 for total in self._field_totals]
+
+        scores: Optional[Dict[str, float]] = None
+        for group in groups:
+            group_scores: Dict[str, float] = {}
+            for term, weight in group.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (n_posts - df + 0.5) / (df + 0.5))
+                for post_id, tfs in postings.items():
+                    if scores is not None and post_id not in scores:
+                        continue
+                    lengths = self._posts[post_id].lengths
+                    tf = 0.0
+                    for i, count in enumerate(tfs):
+                        if count:
+                            norm = 1 - FIELD_B[i] + FIELD_B[i] * (lengths[i] / avg_lengths[i] if avg_lengths[i] else 1)
+                            tf += FIELD_BOOSTS[i] * count / norm
+                    score = weight * idf * tf / (K1 + tf)
+                    if score > group_scores.get(post_id, 0.0):
+                        group_scores[post_id] = score
+
+            if scores is None:
+                scores = group_scores
+            else:
+                scores = {pid: scores[pid] + s for pid, s in group_scores.items()}
+            if not scores:
+                return SearchResult()
+
+        hits = []
+        for post_id, score in scores.items():
+            indexed = self._posts[post_id]
+            if published_only and not indexed.is_published:
+                continue
+            if tag and tag not in indexed.tags:
+                continue
+            hits.append((score, indexed.created_at, post_id))
+
+        hits.sort(reverse=True)
+        return SearchResult(
+            hits=[SearchHit(post_id=pid, score=score) for score, _, pid in hits],
+            terms=[term for group in groups for term in group],
+        )
+
+    def snippet(self, post_id: str, terms: List[str]) -> Optional[str]:
+        """
+        Build an HTML-escaped snippet around the first match with <mark> highlighting.
+
+        Args:
+            post_id: Post id
+            terms: Terms to highlight
+
+        Returns:
+            Snippet HTML, or None if the post is not indexed
+        """
+        indexed = self._posts.get(post_id)
+        if indexed is None:
+            return None
+
+        pattern = re.compile(
+            r"\b(" + "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)) + r")\w*",
+            re.IGNORECASE,
+        )
+
+        for text in (indexed.text, indexed.summary):
+            match = pattern.search(text)
+            if match:
+                break
+        else:
+            text = indexed.summary or indexed.text
+            match = None
+
+        start = 0
+        if match:
+            start = max(0, match.start() - SNIPPET_LENGTH // 4)
+            if start:
+                space = text.find(" ", start)
+                start = space + 1 if 0 <= space < match.start() else start
+        end = min(len(text), start + SNIPPET_LENGTH)
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            end = space if space > start else end
+
+        window = text[start:end]
+        parts = []
+        last = 0
+        for m in pattern.finditer(window):
+            parts.append(html.escape(window[last:m.start()]))
+            parts.append(f"<mark>{html.escape(m.group(0))}</mark>")
+            last = m.end()
+        parts.append(html.escape(window[last:]))
+
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        return prefix + "".join(parts) + suffix
+
+# Index shared by every request handled in this worker
+search_index = SearchIndex()
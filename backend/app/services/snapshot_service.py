@@ -0,0 +1,287 @@
+# backend/app/services/snapshot_service.py
+"""
+Static JSON snapshot of the public, published content.
+
+Files are written under SNAPSHOT_ROOT with the same bytes the API returns
+to anonymous readers:
+
+    posts/<slug>.json              GET /api/posts/<slug>
+    posts/page/<n>.json            GET /api/posts/?view=summary&page=<n>&page_size=SNAPSHOT_PAGE_SIZE
+    tags/<tag-slug>/page/<n>.json  the same listing filtered by tag
+    tags.json                      GET /api/tags/
+    manifest.json                  content hashes, used for incremental builds,
+                                   and the directory of each tag
+
+Tags whose slugs collide ("C" and "C++" are both `c`) get the slug plus
+a short hash of the tag instead, e.g. `tags/c-3d2b1a0f/`.
+
+nginx (or a CDN origin) can serve them first and fall back to the API,
+e.g. `try_files /snapshot/posts/$slug.json @backend;`. Posts whose slug
+is not a safe file name are left to the API.
+"""
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+import slugify
+from bson import ObjectId
+from pymongo.database import Database
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..core import serialization
+from . import post_service, tag_service
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+LOCK = ".lock"
+
+SAFE_NAME_RE = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9._-]*$")
+
+# Post ids waiting for an incremental build; None in the set means a full build
+_pending: Set[Optional[ObjectId]] = set()
+# Whether a build was requested since the last one started; with no ids
+# it still writes the published posts the snapshot is missing
+_requested = False
+_task: Optional[asyncio.Task] = None
+
+def enabled() -> bool:
+    """
+    Whether snapshots are configured.
+
+    Returns:
+        True if SNAPSHOT_ROOT is set
+    """
+    return bool(settings.SNAPSHOT_ROOT)
+
+def post_path(slug: str) -> Optional[str]:
+    """
+    Snapshot path of a post, relative to SNAPSHOT_ROOT.
+
+    Args:
+        slug: Post slug
+
+    Returns:
+        Relative path, or None if the slug cannot be used as a file name
+    """
+    return f"posts/{slug}.json" if SAFE_NAME_RE.match(slug) else None
+
+def tag_dirs(tags: Iterable[str]) -> Dict[str, str]:
+    """
+    Snapshot directory of each tag's listing, relative to SNAPSHOT_ROOT.
+
+    Args:
+        tags: Tag names
+
+    Returns:
+        Directory by tag; tags without a usable slug are left out
+    """
+    by_name: Dict[str, List[str]] = {}
+    for tag in tags:
+        name = slugify.slugify(tag)
+        if name:
+            by_name.setdefault(name, []).append(tag)
+
+    dirs = {}
+    for name, named in by_name.items():
+        if len(named) == 1:
+            dirs[named[0]] = f"tags/{name}"
+            continue
+        logger.warning("Tags %s share the snapshot slug %r; adding a hash to their paths", named, name)
+        for tag in named:
+            dirs[tag] = f"tags/{name}-{hashlib.sha1(tag.encode()).hexdigest()[:8]}"
+    return dirs
+
+def _listing_files(prefix: str, docs: List[dict]) -> Dict[str, bytes]:
+    page_size = settings.SNAPSHOT_PAGE_SIZE
+    total = len(docs)
+    pages = (total + page_size - 1) // page_size
+    files = {}
+    # An empty listing still has a first page
+    for page in range(1, max(pages, 1) + 1):
+        chunk = docs[(page - 1) * page_size:page * page_size]
+        has_more = page < pages
+        listing = {
+            "posts": [serialization.post_document(doc, serialization.SUMMARY_FIELDS) for doc in chunk],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": pages,
+            "has_more": has_more,
+            "next_cursor": post_service.encode_cursor(chunk[-1]) if has_more else None,
+        }
+        files[f"{prefix}/page/{page}.json"] = serialization.dumps(listing)
+    return files
+
+def _read_manifest(root: str) -> dict:
+    try:
+        with open(os.path.join(root, MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"files": {}, "posts": {}}
+
+def _write_file(root: str, path: str, body: bytes) -> None:
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path + ".tmp", "wb") as f:
+        f.write(body)
+    os.replace(full_path + ".tmp", full_path)
+
+def _remove_file(root: str, path: str) -> None:
+    try:
+        os.remove(os.path.join(root, path))
+    except FileNotFoundError:
+        pass
+
+def _apply(root: str, files: Dict[str, bytes], post_paths: Dict[str, str], tag_paths: Dict[str, str]) -> dict:
+    """
+    Write the files whose content changed and remove the ones no longer published.
+
+    Runs in a thread, holding a file lock so workers sharing SNAPSHOT_ROOT
+    do not interleave builds.
+
+    Args:
+        root: SNAPSHOT_ROOT
+        files: Rendered files by relative path (listings, and the posts being rebuilt)
+        post_paths: Path of every published post, by id
+        tag_paths: Listing directory of every tag, by name
+
+    Returns:
+        Counts of written, unchanged and removed files
+    """
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = _read_manifest(root)
+        hashes = dict(manifest["files"])
+        stats = {"written": 0, "unchanged": 0, "removed": 0}
+
+        for path, body in files.items():
+            digest = hashlib.sha1(body).hexdigest()
+            if hashes.get(path) == digest and os.path.exists(os.path.join(root, path)):
+                stats["unchanged"] += 1
+                continue
+            _write_file(root, path, body)
+            hashes[path] = digest
+            stats["written"] += 1
+
+        # Everything that should exist: posts still published (rebuilt now
+        # or kept from before) and the listings just rendered
+        keep = set(post_paths.values()) | set(files)
+        for path in list(hashes):
+            if path not in keep:
+                _remove_file(root, path)
+                del hashes[path]
+                stats["removed"] += 1
+
+        manifest = {
+            "generated_at": datetime.utcnow().isoformat(),
+            "files": hashes,
+            "posts": post_paths,
+            "tags": tag_paths,
+        }
+        _write_file(root, MANIFEST, json.dumps(manifest).encode())
+        return stats
+
+async def build(db: Database, changed: Optional[Iterable[ObjectId]] = None) -> dict:
+    """
+    Bring the snapshot up to date with MongoDB.
+
+    Listings are cheap (summaries only) and always re-rendered, but a file
+    is only rewritten when its bytes change. Post files are rendered for
+    the changed posts only, plus published posts the snapshot is missing.
+
+    Args:
+        db: MongoDB database instance
+        changed: Ids of posts written or deleted since the last build;
+            None for a full build
+
+    Returns:
+        Counts of written, unchanged and removed files
+    """
+    root = settings.SNAPSHOT_ROOT
+    published = await db.posts.find(
+        {"is_published": True}, post_service.SUMMARY_PROJECTION
+    ).sort(post_service.LISTING_SORT).to_list(None)
+
+    files = _listing_files("posts", published)
+    by_tag: Dict[str, List[dict]] = {}
+    for doc in published:
+        for tag in dict.fromkeys(doc.get("tags") or ()):
+            by_tag.setdefault(tag, []).append(doc)
+    tag_paths = tag_dirs(by_tag)
+    for tag, path in tag_paths.items():
+        files.update(_listing_files(path, by_tag[tag]))
+
+    tags = await tag_service.list_tags(db)
+    files["tags.json"] = serialization.dumps({
+        "tags": [{"name": tag["_id"], "published": tag["published"], "total": None} for tag in tags]
+    })
+
+    post_paths = {}
+    for doc in published:
+        path = post_path(doc["slug"])
+        if path:
+            post_paths[str(doc["_id"])] = path
+
+    if changed is None:
+        rebuild = list(post_paths)
+    else:
+        manifest = await run_in_threadpool(_read_manifest, root)
+        known = manifest["posts"]
+        rebuild = [
+            post_id for post_id, path in post_paths.items()
+            if known.get(post_id) != path or path not in manifest["files"]
+        ]
+        rebuild += [str(post_id) for post_id in changed if str(post_id) in post_paths]
+
+    if rebuild:
+        cursor = db.posts.find({"_id": {"$in": [ObjectId(post_id) for post_id in set(rebuild)]}})
+        async for doc in cursor:
+            files[post_paths[str(doc["_id"])]] = serialization.dumps(serialization.post_document(doc))
+
+    return await run_in_threadpool(_apply, root, files, post_paths, tag_paths)
+
+async def _run(db: Database) -> None:
+    global _requested, _task
+    try:
+        while _requested:
+            _requested = False
+            changed = None if None in _pending else set(_pending)
+            _pending.clear()
+            try:
+                await build(db, changed)
+            except Exception:
+                logger.exception("Building the static snapshot failed")
+    finally:
+        _task = None
+
+def schedule_build(db: Database, post_ids: Optional[Iterable[ObjectId]] = None) -> None:
+    """
+    Queue a background snapshot build if snapshots are enabled.
+
+    Changes arriving while a build runs are batched into the next one.
+
+    Args:
+        db: MongoDB database instance
+        post_ids: Posts that were written or deleted, possibly none (the
+            build then only catches up with posts missing from the
+            snapshot); None for a full build
+    """
+    global _requested, _task
+    if not enabled():
+        return
+    if post_ids is None:
+        _pending.add(None)
+    else:
+        _pending.update(post_ids)
+    _requested = True
+    if _task is None:
+        _task = asyncio.get_running_loop().create_task(_run(db))
@@ -0,0 +1,125 @@
+# backend/app/services/tag_service.py
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.database import Database
+
+# One document per tag: {"_id": name, "total": n, "published": n}
+TAG_SORT = [("published", DESCENDING), ("total", DESCENDING), ("_id", ASCENDING)]
+
+async def ensure_indexes(db: Database) -> None:
+    """
+    Create the index the tag listing is sorted by.
+
+    Args:
+        db: MongoDB database instance
+    """
+    await db.tags.create_index(TAG_SORT)
+
+def _tag_sets(post: Optional[dict]) -> Tuple[set, set]:
+    if post is None:
+        return set(), set()
+    tags = set(post.get("tags") or ())
+    return tags, tags if post.get("is_published") else set()
+
+def count_changes(changes: Iterable[Tuple[Optional[dict], Optional[dict]]]) -> Tuple[Counter, Counter]:
+    """
+    Work out how tag counts move for a set of post writes.
+
+    Args:
+        changes: (before, after) post documents; before is None for new
+            posts and after is None for deleted ones
+
+    Returns:
+        (total, published) count deltas per tag, without zero entries
+    """
+    total, published = Counter(), Counter()
+    for before, after in changes:
+        tags_before, published_before = _tag_sets(before)
+        tags_after, published_after = _tag_sets(after)
+        for tag in tags_after - tags_before:
+            total[tag] += 1
+        for tag in tags_before - tags_after:
+            total[tag] -= 1
+        for tag in published_after - published_before:
+            published[tag] += 1
+        for tag in published_before - published_after:
+            published[tag] -= 1
+    return (
+        Counter({tag: n for tag, n in total.items() if n}),
+        Counter({tag: n for tag, n in published.items() if n}),
+    )
+
+async def apply(db: Database, changes: List[Tuple[Optional[dict], Optional[dict]]]) -> None:
+    """
+    Update the tags collection incrementally after posts were written.
+
+    Only tags whose counts move are touched, with one $inc upsert each in
+    a single bulk_write; tags left without posts are removed.
+
+    Args:
+        db: MongoDB database instance
+        changes: (before, after) post documents, as for count_changes()
+    """
+    total, published = count_changes(changes)
+    names = set(total) | set(published)
+    if not names:
+        return
+
+    await db.tags.bulk_write(
+        [
+            UpdateOne(
+                {"_id": name},
+                {"$inc": {"total": total.get(name, 0), "published": published.get(name, 0)}},
+                upsert=True,
+            )
+            for name in sorted(names)
+        ],
+        ordered=False,
+    )
+    await db.tags.delete_many({"_id": {"$in": sorted(names)}, "total": {"$lte": 0}})
+
+async def rebuild(db: Database) -> int:
+    """
+    Recompute the tags collection from every post.
+
+    The aggregation writes its result with $out, which replaces the
+    collection in one step.
+
+    Args:
+        db: MongoDB database instance
+
+    Returns:
+        Number of tags
+    """
+    pipeline = [
+        {"$project": {"tags": 1, "is_published": 1}},
+        {"$unwind": "$tags"},
+        # A post listing a tag twice still counts once
+        {"$group": {"_id": {"tag": "$tags", "post": "$_id"}, "is_published": {"$first": "$is_published"}}},
+        {"$group": {
+            "_id": "$_id.tag",
+            "total": {"$sum": 1},
+            "published": {"$sum": {"$cond": [{"$eq": ["$is_published", True]}, 1, 0]}},
+        }},
+        {"$out": "tags"},
+    ]
+    async for _ in db.posts.aggregate(pipeline):
+        pass
+    await ensure_indexes(db)
+    return await db.tags.count_documents({})
+
+async def list_tags(db: Database, published_only: bool = True) -> List[dict]:
+    """
+    List tags with their post counts, most used first.
+
+    Args:
+        db: MongoDB database instance
+        published_only: Only tags of published posts
+
+    Returns:
+        Tag documents
+    """
+    query = {"published": {"$gt": 0}} if published_only else {}
+    return await db.tags.find(query).sort(TAG_SORT).to_list(None)
@@ -0,0 +1,163 @@
+# backend/app/services/throttle_service.py
+"""
+Login throttling with token buckets shared by all workers through MongoDB.
+
+Each client IP and each username has a bucket of LOGIN_*_BURST attempts,
+refilled at LOGIN_*_PER_MINUTE. A bucket is one document in
+`login_throttle`, updated atomically by _id with an update pipeline, so
+all workers draw from the same tokens. Buckets expire through a TTL index
+once they would be full again, at which point they equal a fresh one.
+
+A worker that finds a bucket empty remembers until when. No other
+worker can make tokens appear sooner, so repeated attempts are rejected
+from memory, without a round trip.
+
+Behind a reverse proxy, the client IP is the X-Forwarded-For entry the
+nearest trusted proxy appended (see client_address), never one a client
+can write itself.
+
+Bucket times come from the workers' clocks, which is exact for workers
+sharing one host; elapsed time is never negative, so skew between hosts
+can only delay refills.
+"""
+import hashlib
+import ipaddress
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo import ReturnDocument
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from ..config import settings
+from ..core.cache import LRUCache
+
+# Upserts tried per attempt: one can lose the race to create a new bucket
+UPSERT_ATTEMPTS = 3
+
+# Monotonic time until which a bucket is known to be empty, by bucket id
+_empty_until = LRUCache(settings.LOGIN_THROTTLE_CACHE_SIZE)
+
+async def ensure_indexes(db: Database) -> None:
+    """
+    Create the TTL index that removes idle buckets.
+
+    Args:
+        db: MongoDB database instance
+    """
+    await db.login_throttle.create_index("expires_at", expireAfterSeconds=0)
+
+def _pipeline(now: datetime, burst: int, rate: float) -> list:
+    elapsed = {"$max": [0, {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated", now]}]}, 1000]}]}
+    refilled = {"$min": [burst, {"$add": [{"$ifNull": ["$tokens", burst]}, {"$multiply": [elapsed, rate]}]}]}
+    return [
+        {"$set": {"tokens": refilled, "updated": now}},
+        {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+        {"$set": {
+            "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+            "expires_at": now + timedelta(seconds=burst / rate),
+        }},
+    ]
+
+async def take(db: Database, bucket_id: str, burst: int, per_minute: float) -> float:
+    """
+    Take one token from a bucket.
+
+    Args:
+        db: MongoDB database instance
+        bucket_id: Bucket document id
+        burst: Bucket capacity
+        per_minute: Tokens added per minute
+
+    Returns:
+        0 if a token was taken, otherwise seconds until one is available
+    """
+    until = _empty_until.get(bucket_id)
+    if until is not None:
+        remaining = until - time.monotonic()
+        if remaining > 0:
+            return remaining
+        _empty_until.pop(bucket_id)
+
+    rate = per_minute / 60
+    pipeline = _pipeline(datetime.utcnow(), burst, rate)
+    bucket = None
+    for _ in range(UPSERT_ATTEMPTS):
+        try:
+            bucket = await db.login_throttle.find_one_and_update(
+                {"_id": bucket_id}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+            )
+            break
+        except DuplicateKeyError:
+            # Another worker created the bucket at the same moment; the
+            # next upsert updates it (or recreates it if it has expired)
+            continue
+
+    # Every upsert lost a race: let the attempt through rather than fail the login
+    if bucket is None or bucket["allowed"]:
+        return 0.0
+    wait = (1 - bucket["tokens"]) / rate
+    _empty_until.set(bucket_id, time.monotonic() + wait)
+    return wait
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES)
+
+def client_address(peer: Optional[str], forwarded_for: Optional[str]) -> Optional[str]:
+    """
+    Find the client's address behind the trusted proxies (TRUSTED_PROXIES).
+
+    Each proxy appends the address it was connected from to
+    X-Forwarded-For, so the list is read from the right: the first entry
+    not added by a trusted proxy was appended by one for its client.
+    Anything further left was sent by that client and may be forged.
+
+    Args:
+        peer: Address of the connecting peer
+        forwarded_for: X-Forwarded-For header, if sent
+
+    Returns:
+        Client address, None if unknown
+    """
+    if not peer or not forwarded_for or not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    # Only proxies (or an empty header): the leftmost is closest to the client
+    return hops[0] if hops else peer
+
+def _username_bucket(username: str) -> str:
+    # Hashed: people sometimes type their password into the username field
+    return "user:" + hashlib.sha256(username.strip().lower().encode()).hexdigest()
+
+async def check_login(db: Database, client_ip: Optional[str], username: str) -> float:
+    """
+    Take a login attempt from the client IP's bucket, then from the username's.
+
+    An attempt rejected for its IP does not use up the username's tokens.
+    A burst of 0 disables that bucket.
+
+    Args:
+        db: MongoDB database instance
+        client_ip: Address of the client, None if unknown
+        username: Username or email as submitted
+
+    Returns:
+        0 if the attempt may proceed, otherwise seconds until it may be retried
+    """
+    if client_ip and settings.LOGIN_IP_BURST > 0:
+        wait = await take(db, f"ip:{client_ip}", settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE)
+        if wait:
+            return wait
+    if settings.LOGIN_USER_BURST > 0:
+        wait = await take(db, _username_bucket(username), settings.LOGIN_USER_BURST, settings.LOGIN_USER_PER_MINUTE)
+        if wait:
+            return wait
+    return 0.0
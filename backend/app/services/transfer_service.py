@@ -0,0 +1,148 @@
+# backend/app/services/transfer_service.py
+from datetime import datetime
+from typing import AsyncIterator, List, Tuple
+
+import slugify
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import ASCENDING, UpdateOne
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+
+from ..config import settings
+from ..core.serialization import dumps
+from ..schemas.post import PostImport
+from . import render_service
+
+# Derived fields are left out of exports and rebuilt on import
+EXPORT_PROJECTION = {"content_html": 0, "toc": 0, "word_count": 0, "reading_time": 0, "content_hash": 0}
+
+# Exported lines are coalesced into chunks of about this size
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+class ImportLineTooLongError(Exception):
+    """Raised when an import line exceeds MAX_UPLOAD_SIZE."""
+
+    def __init__(self, line: int):
+        super().__init__(f"Line {line} is too long")
+        self.line = line
+
+async def export_posts(db: Database) -> AsyncIterator[bytes]:
+    """
+    Stream every post as NDJSON straight from a MongoDB cursor.
+
+    Args:
+        db: MongoDB database instance
+
+    Yields:
+        Chunks of complete JSON lines
+    """
+    buffer = bytearray()
+    cursor = db.posts.find({}, EXPORT_PROJECTION).sort("_id", ASCENDING).batch_size(settings.IMPORT_BATCH_SIZE)
+    async for post in cursor:
+        buffer += dumps(post)
+        buffer += b"\n"
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    # Only each new chunk is split; the unfinished line is kept in parts and
+    # joined once, so a long line costs linear time
+    tail: List[bytes] = []
+    tail_size = 0
+    number = 0
+    async for chunk in chunks:
+        *ends, rest = chunk.split(b"\n")
+        for end in ends:
+            tail.append(end)
+            number += 1
+            yield number, b"".join(tail)
+            tail, tail_size = [], 0
+        if rest:
+            tail.append(rest)
+            tail_size += len(rest)
+            if tail_size > settings.MAX_UPLOAD_SIZE:
+                raise ImportLineTooLongError(number + 1)
+    if tail:
+        yield number + 1, b"".join(tail)
+
+async def _to_operation(item: PostImport, author_id: ObjectId) -> Tuple[str, UpdateOne]:
+    slug = item.slug or slugify.slugify(item.title)
+    now = datetime.utcnow()
+    fields = item.model_dump(include={"title", "content", "summary", "tags", "featured_image", "is_published"})
+    fields.update(await render_service.render_post(item.content))
+    fields["slug"] = slug
+    fields["updated_at"] = item.updated_at or now
+
+    on_insert = {
+        "author_id": ObjectId(item.author_id) if item.author_id and ObjectId.is_valid(item.author_id) else author_id,
+        "created_at": item.created_at or now,
+    }
+    if item.id and ObjectId.is_valid(item.id):
+        on_insert["_id"] = ObjectId(item.id)
+
+    return slug, UpdateOne({"slug": slug}, {"$set": fields, "$setOnInsert": on_insert}, upsert=True)
+
+async def _flush(db: Database, batch: List[Tuple[int, str, UpdateOne]], result: dict) -> None:
+    try:
+        written = await db.posts.bulk_write([op for _, _, op in batch], ordered=False)
+        details = written.bulk_api_result
+    except BulkWriteError as exc:
+        details = exc.details
+        for error in details["writeErrors"]:
+            line, slug, _ = batch[error["index"]]
+            result["errors"].append({"line": line, "slug": slug, "detail": error["errmsg"]})
+    result["inserted"] += details["nUpserted"]
+    result["updated"] += details["nMatched"]
+
+async def import_posts(db: Database, chunks: AsyncIterator[bytes], author_id: ObjectId) -> dict:
+    """
+    Upsert posts by slug from an NDJSON stream, in batches of IMPORT_BATCH_SIZE.
+
+    Lines that fail validation or writing are reported and skipped; the
+    rest of the stream is still imported. Posts are inserted with their
+    exported _id, author_id and created_at when present.
+
+    Args:
+        db: MongoDB database instance
+        chunks: Request body chunks
+        author_id: Author of posts whose line has no author_id
+
+    Returns:
+        Counts and per-line errors, shaped like PostImportResult
+
+    Raises:
+        ImportLineTooLongError: If a line exceeds MAX_UPLOAD_SIZE
+    """
+    result = {"received": 0, "inserted": 0, "updated": 0, "errors": []}
+    batch: List[Tuple[int, str, UpdateOne]] = []
+    slugs = set()
+
+    async for number, line in _lines(chunks):
+        if not line.strip():
+            continue
+        result["received"] += 1
+        try:
+            item = PostImport.model_validate_json(line)
+        except ValidationError as exc:
+            result["errors"].append({"line": number, "slug": None, "detail": str(exc)})
+            continue
+
+        slug, operation = await _to_operation(item, author_id)
+        if slug in slugs:
+            # Unordered upserts of one slug could both insert
+            await _flush(db, batch, result)
+            batch, slugs = [], set()
+        batch.append((number, slug, operation))
+        slugs.add(slug)
+
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            await _flush(db, batch, result)
+            batch, slugs = [], set()
+
+    if batch:
+        await _flush(db, batch, result)
+    return result
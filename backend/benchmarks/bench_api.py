@@ -0,0 +1,419 @@
+# backend/benchmarks/bench_api.py
+"""
+Load-test the API in-process over ASGI, against a seeded corpus.
+
+    cd backend && pip install -r benchmarks/requirements.txt
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --mongo-uri mongodb://localhost:27017 --baseline benchmarks/results/base.json
+
+Requests go through the whole app (middleware, dependencies, validation,
+serialization, compression) via httpx's ASGI transport, with no network
+or server in between. The database is an in-memory fake (mongomock-motor)
+by default; it scans and copies whole collections, so the corpus defaults
+to 1,000 posts there. Use --mongo-uri with a local mongod for absolute
+numbers and the 10,000-post corpus: a throwaway database is created there
+and dropped afterwards.
+
+Scenarios:
+
+- list:         GET /api/posts/, one of the first pages
+- list_summary: the same with view=summary
+- deep_page:    GET /api/posts/?page=N, N in the last tenth of the pages
+- deep_cursor:  GET /api/posts/?cursor=..., positioned as deep
+- search:       GET /api/posts/?search=..., common and rare terms
+- get_by_slug:  GET /api/posts/{slug}, random posts
+- login:        POST /api/auth/login/json (BCRYPT_ROUNDS applies; login
+                throttling is turned off so every attempt checks the password)
+- create:       POST /api/posts/ as admin, new posts
+
+Reads hit the response cache as they would in production; run with
+RESPONSE_CACHE_MAX_BYTES=0 to measure the uncached paths.
+
+Each run is written as JSON (p50/p95/p99 latency and throughput per
+scenario). With --baseline, the run is compared to an earlier one and the
+exit status is 1 if any scenario's p95 grew, or its throughput fell, by
+more than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app import dependencies
+from app.config import settings
+from app.core.security import get_password_hash
+from app.models.user import User
+from app.services import post_service, related_service, render_service, tag_service
+
+from . import corpus
+
+ADMIN_USERNAME = "bench-admin"
+ADMIN_PASSWORD = "bench-password"
+
+# Posts inserted per insert_many while seeding
+SEED_BATCH_SIZE = 1000
+
+# Listing page size, as the frontend requests
+PAGE_SIZE = 10
+
+Request = Tuple[str, str, dict]
+
+class Context:
+    """
+    What scenarios need to build their requests.
+    """
+    def __init__(self, slugs: List[str], published: int, deep_cursors: List[str], token: str, args):
+        self.slugs = slugs
+        self.published = published
+        self.deep_cursors = deep_cursors
+        self.token = token
+        self.args = args
+        self.created = 0
+
+def _list(ctx: Context, rng: random.Random) -> Request:
+    return "GET", "/api/posts/", {"params": {"page": rng.randint(1, 10), "page_size": PAGE_SIZE}}
+
+def _list_summary(ctx: Context, rng: random.Random) -> Request:
+    params = {"page": rng.randint(1, 10), "page_size": PAGE_SIZE, "view": "summary"}
+    return "GET", "/api/posts/", {"params": params}
+
+def _deep_page(ctx: Context, rng: random.Random) -> Request:
+    pages = max(1, (ctx.published + PAGE_SIZE - 1) // PAGE_SIZE)
+    page = rng.randint(max(1, pages * 9 // 10), pages)
+    return "GET", "/api/posts/", {"params": {"page": page, "page_size": PAGE_SIZE}}
+
+def _deep_cursor(ctx: Context, rng: random.Random) -> Request:
+    params = {"cursor": rng.choice(ctx.deep_cursors), "page_size": PAGE_SIZE}
+    return "GET", "/api/posts/", {"params": params}
+
+def _search(ctx: Context, rng: random.Random) -> Request:
+    term = corpus.search_terms(rng, 1)[0]
+    return "GET", "/api/posts/", {"params": {"search": term, "page_size": PAGE_SIZE}}
+
+def _get_by_slug(ctx: Context, rng: random.Random) -> Request:
+    return "GET", f"/api/posts/{rng.choice(ctx.slugs)}", {}
+
+def _login(ctx: Context, rng: random.Random) -> Request:
+    return "POST", "/api/auth/login/json", {"json": {"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}}
+
+def _create(ctx: Context, rng: random.Random) -> Request:
+    ctx.created += 1
+    post = corpus.make_post(rng, ctx.args.posts + ctx.created, ctx.args.content_size, datetime.utcnow())
+    body = {key: post[key] for key in ("title", "content", "summary", "tags", "is_published")}
+    body["slug"] = f"bench-{ctx.created}-{rng.getrandbits(32):08x}"
+    return "POST", "/api/posts/", {"json": body, "headers": {"Authorization": f"Bearer {ctx.token}"}}
+
+SCENARIOS: Dict[str, Callable[[Context, random.Random], Request]] = {
+    "list": _list,
+    "list_summary": _list_summary,
+    "deep_page": _deep_page,
+    "deep_cursor": _deep_cursor,
+    "search": _search,
+    "get_by_slug": _get_by_slug,
+    "login": _login,
+    "create": _create,
+}
+
+def _fake_client():
+    try:
+        import mongomock.collection
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("The in-memory backend needs mongomock-motor: pip install -r benchmarks/requirements.txt")
+
+    # pymongo 4.9+ passes a sort option with every bulk update, which
+    # mongomock does not accept; the app never sets it
+    builder = mongomock.collection.BulkOperationBuilder
+    for name in ("add_update", "add_replace"):
+        original = getattr(builder, name)
+
+        def without_sort(self, *args, sort=None, _original=original, **kwargs):
+            return _original(self, *args, **kwargs)
+
+        setattr(builder, name, without_sort)
+    return AsyncMongoMockClient()
+
+def connect(mongo_uri: Optional[str]):
+    """
+    Point the app at the benchmark database; its lifespan then reuses the same client.
+
+    Args:
+        mongo_uri: MongoDB to create a throwaway database in; None for the in-memory fake
+
+    Returns:
+        The benchmark database
+    """
+    if mongo_uri:
+        settings.MONGODB_URI = mongo_uri
+        settings.MONGODB_DB_NAME = f"bench_{os.getpid()}_{int(time.time())}"
+    else:
+        dependencies.client = _fake_client()
+        settings.MONGODB_DB_NAME = "bench"
+    return dependencies.connect()
+
+async def _drop(mongo_uri: str, name: str) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    client = AsyncIOMotorClient(mongo_uri)
+    try:
+        await client.drop_database(name)
+    finally:
+        client.close()
+
+async def seed(db, args) -> None:
+    """
+    Insert the admin user and the corpus, with rendered bodies, tag counts and related posts.
+
+    Args:
+        db: Benchmark database
+        args: Parsed command line
+    """
+    admin = User(
+        username=ADMIN_USERNAME,
+        email="bench-admin@example.com",
+        hashed_password=get_password_hash(ADMIN_PASSWORD),
+        is_admin=True,
+    )
+    await db.users.insert_one(admin.dict(by_alias=True))
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    batch = []
+    for index in range(args.posts):
+        post = corpus.make_post(rng, index, args.content_size, now)
+        post.update(render_service.render(post["content"]))
+        post["author_id"] = admin.id
+        batch.append(post)
+        if len(batch) >= SEED_BATCH_SIZE:
+            await db.posts.insert_many(batch)
+            batch = []
+    if batch:
+        await db.posts.insert_many(batch)
+
+    await tag_service.rebuild(db)
+    await related_service.refresh(db)
+
+async def _deep_cursors(db, published: int, count: int = 20) -> List[str]:
+    cursors = []
+    for position in sorted({published * 9 // 10 + i * published // (10 * count) for i in range(count)}):
+        cursor = db.posts.find({"is_published": True}, {"created_at": 1}).sort(post_service.LISTING_SORT)
+        docs = await cursor.skip(max(0, position - 1)).limit(1).to_list(1)
+        cursors.extend(post_service.encode_cursor(doc) for doc in docs)
+    return cursors
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if len(ordered) == 1:
+        return ordered[0]
+    return statistics.quantiles(ordered, n=100, method="inclusive")[round(fraction * 100) - 1]
+
+async def run_scenario(
+    client: httpx.AsyncClient, ctx: Context, name: str, requests: int, concurrency: int, warmup: int
+) -> dict:
+    """
+    Send `requests` requests of one scenario from `concurrency` concurrent clients.
+
+    Args:
+        client: ASGI client
+        ctx: Scenario context
+        name: Scenario name
+        requests: Requests to measure
+        concurrency: Requests in flight at once
+        warmup: Requests sent first and not measured
+
+    Returns:
+        Latency percentiles in milliseconds, throughput and error count
+    """
+    rng = random.Random(f"{ctx.args.seed}-{name}")
+    make_request = SCENARIOS[name]
+    latencies: List[float] = []
+    errors = 0
+
+    async def send(measured: bool) -> None:
+        nonlocal errors
+        method, url, kwargs = make_request(ctx, rng)
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - started
+        if measured:
+            latencies.append(elapsed)
+            if response.status_code >= 400:
+                errors += 1
+
+    for _ in range(warmup):
+        await send(False)
+
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            await send(True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "p50_ms": _percentile(ordered, 0.50) * 1000,
+        "p95_ms": _percentile(ordered, 0.95) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "throughput_rps": len(ordered) / wall,
+    }
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Find scenarios that regressed against a baseline run.
+
+    Args:
+        current: This run's results
+        baseline: Earlier results
+        tolerance: Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for name, result in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms")
+        if result["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {base['throughput_rps']:.1f} -> {result['throughput_rps']:.1f} req/s"
+            )
+        if result["errors"] > base["errors"]:
+            regressions.append(f"{name}: errors {base['errors']} -> {result['errors']}")
+    return regressions
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run(args) -> dict:
+    db = connect(args.mongo_uri)
+    from app.main import app
+
+    # All requests come from one client, which the login throttle would stop
+    settings.LOGIN_IP_BURST = 0
+    settings.LOGIN_USER_BURST = 0
+
+    try:
+        started = time.perf_counter()
+        await seed(db, args)
+        seconds = time.perf_counter() - started
+        print(f"seeded {args.posts} posts in {seconds:.1f}s", file=sys.stderr)
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+                response = await http.post(
+                    "/api/auth/login/json", json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}
+                )
+                response.raise_for_status()
+                published = await db.posts.count_documents({"is_published": True})
+                ctx = Context(
+                    slugs=[post["slug"] async for post in db.posts.find({"is_published": True}, {"slug": 1})],
+                    published=published,
+                    deep_cursors=await _deep_cursors(db, published),
+                    token=response.json()["access_token"],
+                    args=args,
+                )
+
+                scenarios = {}
+                for name in args.scenarios:
+                    scenarios[name] = await run_scenario(
+                        http, ctx, name, args.requests, args.concurrency, args.warmup
+                    )
+                    print(f"ran {name}", file=sys.stderr)
+    finally:
+        if args.mongo_uri:
+            await _drop(args.mongo_uri, db.name)
+
+    return {
+        "started_at": datetime.utcnow().isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": "mongodb" if args.mongo_uri else "fake",
+        "corpus": {"posts": args.posts, "content_size": args.content_size, "seed": args.seed},
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "scenarios": scenarios,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, help="posts in the corpus (default: 10000, 1000 with the fake)")
+    parser.add_argument("--content-size", type=int, default=4000, help="characters of Markdown per post")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the corpus and the requests")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per scenario")
+    parser.add_argument(
+        "--scenarios", type=lambda value: value.split(","), default=list(SCENARIOS),
+        help=f"comma-separated subset of {','.join(SCENARIOS)}",
+    )
+    parser.add_argument("--mongo-uri", help="use a throwaway database on this MongoDB instead of the fake")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/api-<time>.json)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    if args.posts is None:
+        args.posts = 10000 if args.mongo_uri else 1000
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(run(args))
+
+    print(f"{'scenario':>12} {'requests':>8} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+    for name, result in results["scenarios"].items():
+        print(
+            f"{name:>12} {result['requests']:>8} {result['errors']:>6} {result['p50_ms']:>9.2f} "
+            f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['throughput_rps']:>8.1f}"
+        )
+
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"api-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["corpus"] != results["corpus"] or baseline["backend"] != results["backend"]:
+            print("warning: the baseline used a different corpus or backend", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# backend/benchmarks/bench_serialization.py
+"""
+Compare the listing serialization paths on a page of raw post documents.
+
+    cd backend && python -m benchmarks.bench_serialization --posts 100
+
+- models: Post(**doc) for every document, then validation into PostList /
+  PostResponse and model_dump_json (what list_posts used to do)
+- direct: serialization.post_document + serialization.dumps
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.core import serialization
+from app.models.post import Post
+from app.schemas.post import PostList
+
+def make_docs(count: int, content_size: int) -> list:
+    author_id = ObjectId()
+    now = datetime.utcnow().replace(microsecond=0)
+    paragraph = "The Fourier transform of $f(x)$ is $\\hat f(\\xi)$. "
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Post number {i}",
+            "content": (paragraph * (content_size // len(paragraph) + 1))[:content_size],
+            "summary": "A short summary of the post",
+            "slug": f"post-number-{i}",
+            "author_id": author_id,
+            "tags": ["mathematics", "analysis"],
+            "featured_image": None,
+            "is_published": True,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+def via_models(docs: list) -> bytes:
+    posts = [Post(**doc) for doc in docs]
+    post_list = PostList(posts=posts, total=len(docs), page=1, page_size=len(docs), pages=1)
+    return post_list.model_dump_json(by_alias=True).encode()
+
+def direct(docs: list) -> bytes:
+    return serialization.dumps({
+        "posts": [serialization.post_document(doc) for doc in docs],
+        "total": len(docs),
+        "page": 1,
+        "page_size": len(docs),
+        "pages": 1,
+        "has_more": False,
+        "next_cursor": None,
+    })
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=100, help="posts per page")
+    parser.add_argument("--content-size", type=int, default=4000, help="characters of Markdown per post")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    docs = make_docs(args.posts, args.content_size)
+
+    # Both paths must produce the same posts
+    assert json.loads(via_models(docs))["posts"] == json.loads(direct(docs))["posts"], \
+        "serialization paths disagree"
+
+    results = {}
+    for name, func in (("models", via_models), ("direct", direct)):
+        seconds = min(timeit.repeat(lambda: func(docs), number=args.repeat, repeat=3)) / args.repeat
+        results[name] = seconds * 1000
+        print(f"{name:>7}: {results[name]:8.3f} ms per page of {args.posts} posts")
+    print(f"speedup: {results['models'] / results['direct']:.1f}x (orjson: {serialization.orjson is not None})")
+
+if __name__ == "__main__":
+    main()
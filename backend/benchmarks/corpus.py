@@ -0,0 +1,149 @@
+# backend/benchmarks/corpus.py
+"""
+Deterministic corpus of posts with realistic Markdown bodies.
+
+Bodies mix headings, paragraphs, lists, fenced code, inline and display
+math and tables, so rendering, search and serialization see the kind of
+content the blog actually holds. Words follow a Zipf distribution over
+VOCABULARY: the first words are in most posts, the last ones in few, which
+gives searches both broad and selective terms.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+VOCABULARY = """
+theorem proof function space measure integral series operator matrix vector
+model data network learning gradient descent convergence bound estimate norm
+probability distribution variance sample random process graph algorithm
+complexity optimization constraint energy field equation solution boundary
+transform fourier wavelet spectrum signal kernel regression classifier loss
+manifold curvature geodesic tensor symmetry group representation algebra ring
+module category functor homology topology compact continuous differentiable
+analytic harmonic eigenvalue eigenvector decomposition factorization rank
+lattice prime modular elliptic curve polynomial root field extension galois
+entropy information channel coding compression bayesian prior posterior
+likelihood inference markov chain monte carlo simulation stochastic martingale
+brownian diffusion heat wave schrodinger hamiltonian lagrangian variational
+attention transformer embedding token sequence recurrent convolution pooling
+dropout regularization overfitting benchmark dataset evaluation ablation
+quantum qubit entanglement circuit gate measurement decoherence hilbert banach
+sobolev distribution weak strong existence uniqueness stability perturbation
+asymptotic expansion approximation interpolation quadrature discretization
+finite element difference mesh solver preconditioner iterative sparse dense
+""".split()
+
+TAGS = [
+    "mathematics", "analysis", "algebra", "geometry", "probability", "statistics",
+    "machine-learning", "deep-learning", "optimization", "numerics", "physics",
+    "quantum", "information-theory", "topology", "number-theory", "research",
+    "teaching", "notes", "reading-list", "python",
+]
+
+_WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+_CODE = '''```python
+import numpy as np
+
+def {name}(x, steps=100, lr=1e-2):
+    for _ in range(steps):
+        x = x - lr * np.gradient(x)
+    return x
+```'''
+
+_TABLE = """| method | error | time (s) |
+|---|---|---|
+| {a} | {e1:.3f} | {t1:.2f} |
+| {b} | {e2:.3f} | {t2:.2f} |"""
+
+def _words(rng: random.Random, count: int) -> List[str]:
+    return rng.choices(VOCABULARY, weights=_WEIGHTS, k=count)
+
+def _sentence(rng: random.Random) -> str:
+    words = _words(rng, rng.randint(8, 20))
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), f"$\\|{words[0][0]}_n - {words[-1][0]}\\|_2$")
+    return " ".join(words).capitalize() + "."
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(3, 7)))
+
+def _block(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.55:
+        return _paragraph(rng)
+    if kind < 0.7:
+        return "## " + " ".join(_words(rng, rng.randint(2, 5))).title()
+    if kind < 0.8:
+        return "\n".join(f"- {' '.join(_words(rng, rng.randint(3, 8)))}" for _ in range(rng.randint(2, 5)))
+    if kind < 0.88:
+        return _CODE.format(name="_".join(_words(rng, 2)))
+    if kind < 0.95:
+        return "$$\n\\int_0^\\infty e^{-%s x^2} \\, dx = \\frac{\\sqrt{\\pi}}{2}\n$$" % rng.randint(1, 9)
+    a, b = _words(rng, 2)
+    return _TABLE.format(a=a, b=b, e1=rng.random(), e2=rng.random(), t1=rng.random() * 10, t2=rng.random() * 10)
+
+def markdown(rng: random.Random, size: int) -> str:
+    """
+    Generate a Markdown body of about `size` characters.
+
+    Args:
+        rng: Random source
+        size: Target length in characters
+
+    Returns:
+        Markdown text
+    """
+    blocks = ["# " + " ".join(_words(rng, 4)).title()]
+    length = len(blocks[0])
+    while length < size:
+        block = _block(rng)
+        blocks.append(block)
+        length += len(block) + 2
+    return "\n\n".join(blocks)
+
+def make_post(rng: random.Random, index: int, content_size: int, now: datetime) -> Dict:
+    """
+    Generate the fields of one post, as accepted by POST /api/posts/.
+
+    Args:
+        rng: Random source
+        index: Position in the corpus, used for a unique title and slug
+        content_size: Target body length in characters
+        now: Creation time of the newest post; post `index` is `index` minutes older
+
+    Returns:
+        Post fields plus created_at and updated_at
+    """
+    title = " ".join(_words(rng, rng.randint(3, 7))).title()
+    created_at = now - timedelta(minutes=index)
+    return {
+        "title": f"{title} {index}",
+        "slug": f"post-{index}",
+        "content": markdown(rng, content_size),
+        "summary": _sentence(rng),
+        "tags": rng.sample(TAGS, rng.randint(1, 4)),
+        "featured_image": None,
+        "is_published": rng.random() < 0.9,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+def search_terms(rng: random.Random, count: int) -> List[str]:
+    """
+    Pick search queries: single words across the frequency range, and word pairs.
+
+    Args:
+        rng: Random source
+        count: Number of queries
+
+    Returns:
+        Query strings
+    """
+    terms = []
+    for _ in range(count):
+        if rng.random() < 0.7:
+            terms.append(rng.choice(VOCABULARY))
+        else:
+            terms.append(" ".join(rng.sample(VOCABULARY, 2)))
+    return terms
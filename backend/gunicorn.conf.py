@@ -0,0 +1,32 @@
+# backend/gunicorn.conf.py
+# Loaded automatically by gunicorn from the working directory; command line
+# options (workers, bind, worker class) still come from the Dockerfiles.
+import os
+import shutil
+
+# Each worker writes its metrics here so /metrics can sum them
+PROMETHEUS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or "/tmp/prometheus-metrics"
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = PROMETHEUS_MULTIPROC_DIR
+# With --preload the master imports the app, creating metric files, before on_starting
+os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+# Import the app once in the master and fork the workers from it, sharing
+# its memory and import time (GUNICORN_PRELOAD=true, or --preload); each
+# worker still opens its own MongoDB client and warms up in the lifespan
+preload_app = os.environ.get("GUNICORN_PRELOAD", "false").lower() == "true"
+
+# Peers whose X-Forwarded-For/-Proto headers uvicorn applies (comma-separated
+# addresses). Never "*": uvicorn then takes the first X-Forwarded-For entry,
+# which the client writes. The login throttle finds the client IP itself,
+# behind the proxies listed in TRUSTED_PROXIES (see throttle_service).
+forwarded_allow_ips = os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+def on_starting(server):
+    """Start from empty metric files; old ones belong to dead processes."""
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+def child_exit(server, worker):
+    """Drop the live gauges of a worker that exited."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
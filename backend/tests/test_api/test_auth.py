@@ -0,0 +1,23 @@
+# backend/tests/test_api/test_auth.py
+from passlib.context import CryptContext
+
+from app.core.auth import principal_cache
+
+from ..conftest import ADMIN
+
+def test_rehash_at_login_invalidates_cached_principal(client, db, admin_headers):
+    user_id = client.get("/api/auth/me", headers=admin_headers).json()["_id"]
+    assert principal_cache.get(user_id) is not None
+    # A hash from before BCRYPT_ROUNDS changed, stored behind the cache's back
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash(ADMIN["password"])
+    client.portal.call(db.users.update_one, {"username": ADMIN["username"]}, {"$set": {"hashed_password": old_hash}})
+
+    response = client.post(
+        "/api/auth/login/json", json={"username": ADMIN["username"], "password": ADMIN["password"]}
+    )
+    user = client.portal.call(db.users.find_one, {"username": ADMIN["username"]})
+
+    assert response.status_code == 200
+    assert user["hashed_password"].startswith("$2b$04$")
+    assert principal_cache.get(user_id) is None
+    assert client.get("/api/auth/me", headers=admin_headers).status_code == 200
@@ -0,0 +1,58 @@
+# backend/tests/test_api/test_feeds.py
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.services import change_service
+
+from .test_posts import create_post
+
+def backdate(client, db, post_id, hours=1):
+    """Make a post and the last recorded write look an hour old."""
+    past = datetime.utcnow() - timedelta(hours=hours)
+
+    async def update():
+        await db.posts.update_one({"_id": ObjectId(post_id)}, {"$set": {"updated_at": past}})
+        await db.meta.update_one({"_id": change_service.VERSION_ID}, {"$set": {"at": past}})
+
+    client.portal.call(update)
+
+@pytest.mark.parametrize("path", ["/feed.xml", "/sitemap.xml"])
+@pytest.mark.parametrize("write", ["delete", "unpublish"])
+def test_removing_a_post_advances_last_modified(client, db, admin_headers, path, write):
+    post = create_post(client, admin_headers, "Short lived")
+    backdate(client, db, post["_id"])
+    last_modified = client.get(path).headers["last-modified"]
+
+    if write == "delete":
+        client.delete(f"/api/posts/{post['_id']}", headers=admin_headers)
+    else:
+        client.put(f"/api/posts/{post['_id']}", json={"is_published": False}, headers=admin_headers)
+    response = client.get(path, headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == 200
+    assert "Short lived" not in response.text and "short-lived" not in response.text
+
+@pytest.mark.parametrize("path", ["/feed.xml", "/sitemap.xml"])
+def test_feed_revalidates_until_a_write(client, admin_headers, path):
+    create_post(client, admin_headers, "Feed post", content="Feed text. " * 200)
+
+    streamed = client.get(path)
+    cached = client.get(path)
+    # The cached copy of the (long) feed is compressed, so its ETag is weak; either revalidates
+    assert cached.headers["etag"].removeprefix("W/") == streamed.headers["etag"]
+    for etag in (streamed.headers["etag"], cached.headers["etag"]):
+        again = client.get(path, headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+    by_date = client.get(path, headers={"If-Modified-Since": streamed.headers["last-modified"]})
+    assert by_date.status_code == 304
+
+    create_post(client, admin_headers, "Newer post")
+    changed = client.get(path, headers={"If-None-Match": cached.headers["etag"]})
+
+    assert changed.status_code == 200
+    assert changed.headers["etag"].removeprefix("W/") != cached.headers["etag"].removeprefix("W/")
+    assert "newer-post" in changed.text
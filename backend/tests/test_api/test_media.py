@@ -0,0 +1,72 @@
+# backend/tests/test_api/test_media.py
+import asyncio
+import os
+import uuid
+
+import pytest
+from PIL import Image
+
+from app.config import settings
+from app.services import media_service
+
+def image_path(name):
+    directory = os.path.join(settings.MEDIA_ROOT, media_service.IMAGES_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, name)
+
+def variants(client, name):
+    return client.get("/api/media/variants", params={"url": f"/media/images/{name}"})
+
+async def variants_done():
+    while media_service._pending:
+        await asyncio.sleep(0.01)
+
+@pytest.mark.parametrize("name", [
+    "{hex}-480w.webp",
+    "{hex}.variants.json",
+    "{hex}.pdf",
+    "{upper}.png",
+    "cat.png",
+])
+def test_only_uploaded_originals_are_accepted(client, name):
+    hex_name = uuid.uuid4().hex
+    name = name.format(hex=hex_name, upper=hex_name.upper())
+    Image.new("RGB", (800, 600)).save(image_path(name), "PNG")
+
+    assert variants(client, name).status_code == 400
+    assert not media_service._pending
+
+def test_variants_are_generated_once(client, monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_VARIANT_WIDTHS", [480])
+    name = f"{uuid.uuid4().hex}.png"
+    Image.new("RGB", (800, 600), "teal").save(image_path(name), "PNG")
+
+    assert variants(client, name).json()["status"] == "pending"
+    client.portal.call(variants_done)
+    ready = variants(client, name).json()
+
+    assert ready["status"] == "ready"
+    assert ready["srcset"]["image/webp"].endswith("480w, /media/images/" + name.replace(".png", "-800w.webp") + " 800w")
+    assert not media_service._pending
+
+def test_failed_image_is_not_retried(client, monkeypatch):
+    name = f"{uuid.uuid4().hex}.jpg"
+    with open(image_path(name), "wb") as f:
+        f.write(b"not a jpeg")
+
+    # Pillow may give up before the response is built
+    assert variants(client, name).json()["status"] in ("pending", "failed")
+    client.portal.call(variants_done)
+
+    calls = []
+    monkeypatch.setattr(media_service, "generate_variants", lambda filename: calls.append(filename))
+    assert [variants(client, name).json()["status"] for _ in range(3)] == ["failed"] * 3
+    assert calls == [] and not media_service._pending
+
+def test_queueing_is_bounded(client, monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_VARIANT_QUEUE_SIZE", 0)
+    name = f"{uuid.uuid4().hex}.png"
+    Image.new("RGB", (10, 10)).save(image_path(name), "PNG")
+
+    assert variants(client, name).json()["status"] == "unavailable"
+    assert not media_service._pending
@@ -0,0 +1,237 @@
+# backend/tests/test_api/test_posts.py
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.services import post_service
+
+def create_post(client, headers, title, **fields):
+    body = {"title": title, "content": f"Body of {title}", "is_published": True, **fields}
+    response = client.post("/api/posts/", json=body, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+def test_cursor_round_trip():
+    post = {"created_at": datetime(2024, 5, 1, 12, 30, 15, 250000), "_id": ObjectId()}
+    cursor = post_service.encode_cursor(post)
+
+    assert "=" not in cursor
+    assert post_service.decode_cursor(cursor) == (post["created_at"], post["_id"])
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bm8tc2VwYXJhdG9y", "MjAyNC0wNS0wMXxub3QtYW4taWQ"])
+def test_decode_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        post_service.decode_cursor(cursor)
+
+def test_listing_pages_by_cursor(client, admin_headers):
+    titles = [f"Post {index}" for index in range(5)]
+    for title in titles:
+        create_post(client, admin_headers, title)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"page_size": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/posts/", params=params).json()
+        seen.extend(post["title"] for post in page["posts"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == titles[::-1]
+
+def test_listing_rejects_malformed_cursor(client):
+    assert client.get("/api/posts/", params={"cursor": "garbage"}).status_code == 400
+
+def test_post_revalidates_with_304(client, admin_headers):
+    create_post(client, admin_headers, "Cached post")
+
+    first = client.get("/api/posts/cached-post")
+    etag = first.headers["etag"]
+    again = client.get("/api/posts/cached-post", headers={"If-None-Match": etag})
+
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+def test_update_changes_etag(client, admin_headers):
+    post = create_post(client, admin_headers, "Edited post")
+    etag = client.get("/api/posts/edited-post").headers["etag"]
+
+    client.put(f"/api/posts/{post['_id']}", json={"content": "New body"}, headers=admin_headers)
+    response = client.get("/api/posts/edited-post", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "New body" in response.json()["content"]
+
+def test_compressed_post_revalidates_with_same_etag(client, admin_headers):
+    create_post(client, admin_headers, "Long post", content="Compressible text. " * 200)
+    gzip_headers = {"Accept-Encoding": "gzip"}
+
+    first = client.get("/api/posts/long-post", headers=gzip_headers)
+    etag = first.headers["etag"]
+    again = client.get("/api/posts/long-post", headers={**gzip_headers, "If-None-Match": etag})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert etag.startswith("W/")
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+
+def test_post_slugged_export_is_public(client, admin_headers):
+    create_post(client, admin_headers, "Export")
+
+    post = client.get("/api/posts/export")
+    export = client.get("/api/posts/-/export", headers=admin_headers)
+
+    assert post.status_code == 200 and post.json()["title"] == "Export"
+    assert export.status_code == 200
+    assert b'"slug":"export"' in export.content.replace(b" ", b"")
+    assert client.get("/api/posts/-/export").status_code == 401
+
+def test_batch_reports_each_id_once_in_canonical_form(client, admin_headers):
+    post = create_post(client, admin_headers, "Batched post")
+    missing = str(ObjectId())
+
+    response = client.post("/api/posts/batch", headers=admin_headers, json={
+        "action": "unpublish",
+        "ids": [post["_id"].upper(), post["_id"], missing.upper(), "not-an-id"],
+    })
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"id": post["_id"], "status": "updated"},
+        {"id": missing, "status": "not_found"},
+        {"id": "not-an-id", "status": "invalid_id"},
+    ]
+
+def listed_titles(client, headers=None, **params):
+    response = client.get("/api/posts/", params=params, headers=headers or {})
+    assert response.status_code == 200, response.text
+    return [post["title"] for post in response.json()["posts"]]
+
+def test_cached_admin_listing_is_not_served_to_readers(client, admin_headers):
+    create_post(client, admin_headers, "Public post")
+    create_post(client, admin_headers, "Draft post", is_published=False)
+
+    admin_first = listed_titles(client, admin_headers)
+    reader_after = listed_titles(client)
+    reader_again = listed_titles(client)
+    admin_again = listed_titles(client, admin_headers)
+
+    assert admin_first == admin_again == ["Draft post", "Public post"]
+    assert reader_after == reader_again == ["Public post"]
+
+def test_cached_reader_post_is_not_served_to_admins(client, admin_headers):
+    create_post(client, admin_headers, "Draft post", is_published=False)
+
+    reader = client.get("/api/posts/draft-post")
+    admin = client.get("/api/posts/draft-post", headers=admin_headers)
+    reader_again = client.get("/api/posts/draft-post")
+
+    assert reader.status_code == reader_again.status_code == 404
+    assert admin.status_code == 200
+    assert admin.headers["vary"] == "Authorization"
+
+def test_delete_invalidates_cached_responses(client, admin_headers):
+    post = create_post(client, admin_headers, "Doomed post")
+    assert listed_titles(client) == ["Doomed post"]
+    assert client.get("/api/posts/doomed-post").status_code == 200
+
+    client.delete(f"/api/posts/{post['_id']}", headers=admin_headers)
+
+    assert listed_titles(client) == []
+    assert client.get("/api/posts/doomed-post").status_code == 404
+
+def test_batch_invalidates_cached_listing(client, admin_headers):
+    posts = [create_post(client, admin_headers, title) for title in ("First", "Second")]
+    assert listed_titles(client) == ["Second", "First"]
+
+    client.post("/api/posts/batch", headers=admin_headers, json={
+        "action": "unpublish", "ids": [posts[0]["_id"]],
+    })
+
+    assert listed_titles(client) == ["Second"]
+
+def test_import_invalidates_cached_listing(client, admin_headers):
+    create_post(client, admin_headers, "Existing")
+    assert listed_titles(client) == ["Existing"]
+
+    body = b'{"title": "Imported", "content": "From elsewhere", "is_published": true,' \
+           b' "created_at": "2030-01-01T00:00:00"}\n'
+    response = client.post("/api/posts/import", content=body, headers=admin_headers)
+
+    assert response.json()["inserted"] == 1
+    assert listed_titles(client) == ["Imported", "Existing"]
+
+def import_posts(client, headers, posts):
+    body = "".join(json.dumps(post) + "\n" for post in posts).encode()
+    response = client.post("/api/posts/import", content=body, headers=headers)
+    assert response.json()["inserted"] == len(posts), response.text
+
+def cursor_pages(client, **params):
+    seen, cursor = [], None
+    while True:
+        page = client.get("/api/posts/", params={**params, **({"cursor": cursor} if cursor else {})}).json()
+        seen.extend(post["title"] for post in page["posts"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+def test_cursor_pages_through_ties_with_tag_filter(client, admin_headers):
+    ids = sorted(str(ObjectId()) for _ in range(7))
+    posts = [
+        {
+            "_id": post_id,
+            "title": f"Post {index}",
+            "content": "Same instant",
+            "is_published": True,
+            "tags": ["python"] if index % 2 else ["rust"],
+            # All but the last share one created_at, so order falls back to _id
+            "created_at": "2024-01-01T00:00:00" if index < 6 else "2024-02-01T00:00:00",
+        }
+        for index, post_id in enumerate(ids)
+    ]
+    import_posts(client, admin_headers, posts)
+
+    assert cursor_pages(client, page_size=2, tag="python") == ["Post 5", "Post 3", "Post 1"]
+    assert cursor_pages(client, page_size=2) == [
+        "Post 6", "Post 5", "Post 4", "Post 3", "Post 2", "Post 1", "Post 0",
+    ]
+
+def test_count_none_skips_counting(client, admin_headers, monkeypatch):
+    for title in ("One", "Two", "Three"):
+        create_post(client, admin_headers, title)
+
+    async def no_count(*args, **kwargs):
+        raise AssertionError("count=none must not count")
+
+    monkeypatch.setattr(post_service, "count_posts", no_count)
+    first = client.get("/api/posts/", params={"page_size": 2, "count": "none"}).json()
+    last = client.get("/api/posts/", params={"page": 2, "page_size": 2, "count": "none"}).json()
+
+    assert (first["total"], first["pages"], first["has_more"]) == (None, None, True)
+    assert [post["title"] for post in first["posts"]] == ["Three", "Two"]
+    assert (last["total"], last["has_more"]) == (None, False)
+
+def test_count_estimated_only_without_filter(client, db, admin_headers, monkeypatch):
+    create_post(client, admin_headers, "Public")
+    create_post(client, admin_headers, "Draft", is_published=False)
+    collection = type(db.posts)
+    estimated_calls = []
+    original = collection.estimated_document_count
+
+    async def estimated_document_count(self, *args, **kwargs):
+        estimated_calls.append(self.name)
+        return await original(self, *args, **kwargs)
+
+    monkeypatch.setattr(collection, "estimated_document_count", estimated_document_count)
+    # Admins list every post, so the metadata count applies
+    admin = client.get("/api/posts/", params={"count": "estimated"}, headers=admin_headers).json()
+    # Readers only see published posts: a filter, so the count stays exact
+    reader = client.get("/api/posts/", params={"count": "estimated"}).json()
+
+    assert admin["total"] == 2 and reader["total"] == 1
+    assert estimated_calls == ["posts"]
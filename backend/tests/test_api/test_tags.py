@@ -0,0 +1,41 @@
+# backend/tests/test_api/test_tags.py
+from app.services import tag_service
+
+from .test_posts import create_post
+
+def counts(client, headers=None):
+    tags = client.get("/api/tags/", headers=headers or {}).json()["tags"]
+    return {tag["name"]: (tag["published"], tag["total"]) for tag in tags}
+
+def assert_matches_recount(client, db):
+    async def incremental_and_recounted():
+        incremental = await db.tags.find().sort("_id").to_list(None)
+        await tag_service.rebuild(db)
+        return incremental, await db.tags.find().sort("_id").to_list(None)
+
+    incremental, recounted = client.portal.call(incremental_and_recounted)
+    assert incremental == recounted
+
+def test_tag_counts_follow_retag_unpublish_and_delete(client, db, admin_headers):
+    first = create_post(client, admin_headers, "First", tags=["python", "web"])
+    draft = create_post(client, admin_headers, "Draft", tags=["python"], is_published=False)
+    third = create_post(client, admin_headers, "Third", tags=["rust"])
+
+    assert counts(client, admin_headers) == {"python": (1, 2), "web": (1, 1), "rust": (1, 1)}
+    assert counts(client) == {"python": (1, None), "web": (1, None), "rust": (1, None)}
+
+    client.post("/api/posts/batch", headers=admin_headers, json={
+        "action": "retag", "ids": [first["_id"], draft["_id"]], "add_tags": ["go"], "remove_tags": ["web"],
+    })
+    assert counts(client, admin_headers) == {"python": (1, 2), "go": (1, 2), "rust": (1, 1)}
+    assert_matches_recount(client, db)
+
+    client.put(f"/api/posts/{third['_id']}", json={"is_published": False}, headers=admin_headers)
+    assert counts(client, admin_headers)["rust"] == (0, 1)
+    assert "rust" not in counts(client)
+    assert_matches_recount(client, db)
+
+    client.delete(f"/api/posts/{draft['_id']}", headers=admin_headers)
+    client.delete(f"/api/posts/{third['_id']}", headers=admin_headers)
+    assert counts(client, admin_headers) == {"python": (1, 1), "go": (1, 1)}
+    assert_matches_recount(client, db)
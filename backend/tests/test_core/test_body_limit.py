@@ -0,0 +1,52 @@
+# backend/tests/test_core/test_body_limit.py
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core.body_limit import MULTIPART_OVERHEAD, BodyLimitMiddleware
+
+def limited_app(max_size):
+    app = FastAPI()
+    app.add_middleware(BodyLimitMiddleware, max_size=max_size, paths=["/upload"])
+    read = []
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        async for chunk in request.stream():
+            read.append(len(chunk))
+        return {"size": sum(read)}
+
+    @app.post("/other")
+    async def other(request: Request):
+        return {"size": len(await request.body())}
+
+    return app, read
+
+def test_rejects_declared_length_without_reading():
+    app, read = limited_app(10)
+    client = TestClient(app)
+
+    response = client.post("/upload", content=b"x" * 11)
+
+    assert response.status_code == 413
+    assert read == []
+    assert client.post("/upload", content=b"x" * 10).json() == {"size": 10}
+    assert client.post("/other", content=b"x" * 100).json() == {"size": 100}
+
+def test_stops_chunked_body_past_the_limit():
+    app, read = limited_app(10)
+    # An iterator is sent chunked, without Content-Length
+    chunks = iter([b"x" * 6] * 100)
+
+    response = TestClient(app).post("/upload", content=chunks)
+
+    assert response.status_code == 413
+    assert sum(read) <= 10
+
+def test_upload_over_limit_is_refused_before_authentication(client):
+    size = settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD + 1
+    files = {"file": ("big.png", b"\0" * size, "image/png")}
+
+    response = client.post("/api/posts/upload-image", files=files)
+
+    assert response.status_code == 413
@@ -0,0 +1,45 @@
+# backend/tests/test_core/test_media.py
+import asyncio
+import os
+
+from app.core.media import MediaFileResponse
+
+def run(response, extensions):
+    scope = {"type": "http", "method": "GET", "extensions": extensions}
+    messages = []
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            # What the server would sendfile(), while the file is still open
+            sent = os.pread(message["file"].fileno(), message["count"], message["offset"])
+            message = {**message, "sent": sent}
+        messages.append(message)
+
+    asyncio.run(response(scope, receive, send))
+    return messages
+
+def test_zerocopy_send_gets_the_open_file(tmp_path):
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(b"0123456789")
+    response = MediaFileResponse(str(path), 2, 5, 206, {}, "application/pdf")
+
+    start, body = run(response, {"http.response.zerocopysend": {}})
+
+    assert start["status"] == 206
+    assert body["type"] == "http.response.zerocopysend"
+    assert body["file"].name == str(path) and body["file"].closed
+    assert (body["offset"], body["count"], body["more_body"]) == (2, 5, False)
+    assert body["sent"] == b"23456"
+
+def test_chunks_without_zerocopy(tmp_path):
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(b"0123456789")
+    response = MediaFileResponse(str(path), 2, 5, 206, {}, "application/pdf")
+
+    messages = run(response, {})
+
+    assert b"".join(message.get("body", b"") for message in messages[1:]) == b"23456"
+    assert messages[-1]["more_body"] is False
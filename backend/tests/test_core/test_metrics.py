@@ -0,0 +1,19 @@
+# backend/tests/test_core/test_metrics.py
+from app.core import metrics
+
+def test_render_uses_process_registry_without_multiproc_dir(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+    body, _ = metrics.render()
+
+    assert b"password_hashes_total" in body
+
+def test_render_aggregates_working_directory_when_multiproc_dir_is_empty(tmp_path, monkeypatch):
+    # prometheus_client's workers write their files into "." in this case
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "")
+    monkeypatch.chdir(tmp_path)
+
+    body, _ = metrics.render()
+
+    # Only the (here empty) per-process files, never this process's registry
+    assert b"password_hashes_total" not in body
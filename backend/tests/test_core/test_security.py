@@ -0,0 +1,35 @@
+# backend/tests/test_core/test_security.py
+import asyncio
+import threading
+
+from prometheus_client import REGISTRY
+
+from app.core import security
+
+def sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name)
+
+def test_hasher_exports_pool_load(monkeypatch):
+    hasher = security.PasswordHasher(max_workers=1)
+    release = threading.Event()
+
+    def slow_hash(password: str) -> str:
+        release.wait(5)
+        return f"hashed:{password}"
+
+    monkeypatch.setattr(security.pwd_context, "hash", slow_hash)
+    completed = sample("password_hashes_total")
+
+    async def main():
+        hashes = [asyncio.ensure_future(hasher.hash(f"password-{index}")) for index in range(3)]
+        await asyncio.sleep(0.05)
+        busy = sample("password_hashes_in_flight"), sample("password_hashes_waiting")
+        release.set()
+        return busy, await asyncio.gather(*hashes)
+
+    busy, results = asyncio.run(main())
+
+    assert busy == (1, 2)
+    assert results == ["hashed:password-0", "hashed:password-1", "hashed:password-2"]
+    assert (sample("password_hashes_in_flight"), sample("password_hashes_waiting")) == (0, 0)
+    assert sample("password_hashes_total") == completed + 3
@@ -0,0 +1,50 @@
+# backend/tests/test_core/test_warmup.py
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.config import settings
+from app.core import warmup
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware, profile_names
+
+def requests_total():
+    return sum(
+        sample.value
+        for metric in REGISTRY.collect() if metric.name == "http_requests"
+        for sample in metric.samples if sample.name == "http_requests_total"
+    )
+
+def test_paths_start_with_the_frontend_listings(monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "WARMUP_PAGE_SIZES", [6, 10])
+    paths = warmup.warmup_paths(app, "a-post")
+
+    assert paths[:2] == [
+        "/api/posts/?page=1&page_size=6&view=summary",
+        "/api/posts/?page=1&page_size=10&view=summary",
+    ]
+    assert "/api/posts/a-post" in paths
+    assert len(paths) == len(set(paths))
+
+def test_warmup_requests_are_not_measured_or_profiled(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, sample_rate=1)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/warm")
+    async def warm():
+        return {"ok": True}
+
+    before = requests_total()
+    assert asyncio.run(warmup.request(app, "/warm")) == 200
+    assert requests_total() == before
+    assert profile_names() == []
+
+    TestClient(app).get("/warm")
+    assert requests_total() == before + 1
+    assert len(profile_names()) == 1
@@ -0,0 +1,88 @@
+# backend/tests/test_services/test_post_service.py
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.config import settings
+from app.services import change_service, post_service, render_service
+from app.services.search_service import search_index
+
+@pytest.fixture(autouse=True)
+def sync_every_request(monkeypatch):
+    monkeypatch.setattr(settings, "POSTS_SYNC_INTERVAL", 0)
+
+def search(client, query):
+    return [post["title"] for post in client.get("/api/posts/", params={"search": query}).json()["posts"]]
+
+def insert_elsewhere(client, db, title):
+    """Insert a post and log it the way another worker would, bypassing this worker's hooks."""
+    content = f"All about {title.lower()}."
+    post = {
+        "_id": ObjectId(),
+        "title": title,
+        "slug": title.lower().replace(" ", "-"),
+        "content": content,
+        "summary": None,
+        "tags": [],
+        "author_id": ObjectId(),
+        "is_published": True,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+        **render_service.render(content),
+    }
+
+    async def write():
+        await db.posts.insert_one(post)
+        await change_service.record(db, [post["_id"]])
+
+    client.portal.call(write)
+    return post
+
+def test_sync_reindexes_only_changed_posts(client, db, monkeypatch):
+    post = insert_elsewhere(client, db, "Wavelet notes")
+
+    async def no_rebuild(db):
+        raise AssertionError("a logged change must not rebuild the whole index")
+
+    monkeypatch.setattr(search_index, "rebuild", no_rebuild)
+    assert search(client, "wavelet") == ["Wavelet notes"]
+    assert post_service.version() == client.portal.call(change_service.current, db)
+
+    async def delete():
+        await db.posts.delete_one({"_id": post["_id"]})
+        await change_service.record(db, [post["_id"]])
+
+    client.portal.call(delete)
+    assert search(client, "wavelet") == []
+
+def test_sync_reloads_in_background_when_log_has_a_gap(client, db):
+    insert_elsewhere(client, db, "Fourier notes")
+    client.portal.call(db.post_changes.delete_many, {})
+
+    # The request is served from the current index while the reload runs
+    assert search(client, "fourier") == []
+
+    async def reloaded():
+        while post_service._reload is not None:
+            await asyncio.sleep(0.01)
+
+    client.portal.call(reloaded)
+    assert search(client, "fourier") == ["Fourier notes"]
+
+def test_change_log_reports_bulk_writes_as_unknown(client, db):
+    first = ObjectId()
+
+    async def writes():
+        start = await change_service.current(db)
+        await change_service.record(db, [first])
+        await change_service.record(db, [first, ObjectId()])
+        partial = await change_service.since(db, start, start + 2)
+        await change_service.record(db, None)
+        return partial, await change_service.since(db, start, start + 3)
+
+    partial, bulk = client.portal.call(writes)
+
+    assert len(partial) == 2 and first in partial
+    assert bulk is None
@@ -0,0 +1,51 @@
+# backend/tests/test_services/test_related_service.py
+from datetime import datetime, timedelta
+
+from app.services import related_service
+
+def create_post(client, headers, title, content, tags):
+    body = {"title": title, "content": content, "tags": tags, "is_published": True}
+    response = client.post("/api/posts/", json=body, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+def related(client, slug):
+    return [post["title"] for post in client.get(f"/api/posts/{slug}/related").json()["posts"]]
+
+def test_writes_update_the_cached_corpus(client, admin_headers, settle):
+    create_post(client, admin_headers, "Fourier series", "Fourier series and the heat equation.", ["analysis"])
+    create_post(client, admin_headers, "Neural networks", "Gradient descent trains neural networks.", ["ml"])
+    settle()
+    corpus = related_service._corpus
+
+    create_post(client, admin_headers, "Fourier transforms", "Fourier transforms solve the heat equation.", ["analysis"])
+    settle()
+
+    # Brought up to date in place, not rebuilt from every post
+    assert related_service._corpus is corpus
+    assert corpus.updated == 1
+    assert related(client, "fourier-transforms") == ["Fourier series"]
+    assert related(client, "fourier-series") == ["Fourier transforms"]
+
+def test_deleted_post_leaves_the_corpus(client, admin_headers, settle):
+    kept = create_post(client, admin_headers, "Heat equation", "The heat equation and Fourier series.", ["analysis"])
+    gone = create_post(client, admin_headers, "Heat kernel", "The heat kernel solves the heat equation.", ["analysis"])
+    settle()
+    assert related(client, "heat-equation") == ["Heat kernel"]
+
+    client.delete(f"/api/posts/{gone['_id']}", headers=admin_headers)
+    settle()
+
+    corpus = related_service._corpus
+    assert [str(post_id) for post_id in corpus.index] == [kept["_id"]]
+    assert corpus.published.sum() == 1
+    assert related(client, "heat-equation") == []
+
+def test_first_rebuild_is_claimed_by_one_worker(client, db):
+    # This worker's startup found no related posts and took the lease
+    assert not client.portal.call(related_service.claim_rebuild, db)
+
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    client.portal.call(db.meta.update_one, {"_id": related_service.REBUILD_LOCK_ID}, {"$set": {"expires_at": expired}})
+    claims = [client.portal.call(related_service.claim_rebuild, db) for _ in range(2)]
+    assert claims == [True, False]
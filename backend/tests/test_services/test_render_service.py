@@ -0,0 +1,44 @@
+# backend/tests/test_services/test_render_service.py
+import pytest
+
+from app.services import render_service
+
+def html(content):
+    return render_service.render(content)["content_html"]
+
+def test_math_is_kept_for_katex():
+    body = html("Euler: $e^{i\\pi} + 1 = 0$ and $$a < b$$")
+
+    assert '<span class="math math-inline">\\(e^{i\\pi} + 1 = 0\\)</span>' in body
+    assert '<span class="math math-display">\\[a &lt; b\\]</span>' in body
+
+@pytest.mark.parametrize("text", ["MATHPLACEHOLDER7X", "MATHPLACEHOLDER0X", "MATH0000000000000000P0X"])
+def test_placeholder_lookalikes_are_plain_text(text):
+    body = html(f"Costs $5 and {text}, not $x$.")
+
+    assert text in body
+    assert '<span class="math math-inline">\\(x\\)</span>' in body
+
+def test_math_in_code_is_left_as_written():
+    content = "Paragraph with $x$.\n\n    indented $y < z$\n\n```\nfenced $w$\n```\n\nInline `$v$` code."
+    body = html(content)
+
+    assert "indented $y &lt; z$" in body
+    assert "fenced $w$" in body
+    assert "<code>$v$</code>" in body
+    assert body.count('class="math') == 1
+
+def test_list_continuation_is_not_code():
+    body = html("- item\n\n    continued with $x$")
+
+    assert '<span class="math math-inline">\\(x\\)</span>' in body
+
+def test_heading_with_math_has_stable_id():
+    first = render_service.render("## Proof of $a^2$\n\ntext")
+    render_service._rendered.clear()
+    second = render_service.render("## Proof of $a^2$\n\ntext")
+
+    assert first["toc"] == second["toc"] == [
+        {"level": 2, "id": "proof-of-math0", "name": "Proof of $a^2$", "children": []}
+    ]
+    assert first["content_html"] == second["content_html"]
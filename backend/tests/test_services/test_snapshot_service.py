@@ -0,0 +1,72 @@
+# backend/tests/test_services/test_snapshot_service.py
+import asyncio
+import json
+
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.models.post import Post
+from app.services import render_service, snapshot_service
+
+def published(title, tags):
+    content = f"About {title}."
+    return Post(
+        title=title,
+        content=content,
+        slug=title.lower().replace(" ", "-"),
+        author_id=ObjectId(),
+        is_published=True,
+        tags=tags,
+        **render_service.render(content),
+    )
+
+async def finished() -> None:
+    while snapshot_service._task is not None:
+        await asyncio.sleep(0.01)
+
+def test_startup_writes_posts_missing_from_snapshot(mongo, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SNAPSHOT_ROOT", str(tmp_path))
+    # Written while no worker was running, so no write hook scheduled a build
+    post = published("Offline post", [])
+    asyncio.run(mongo.test.posts.insert_one(post.dict(by_alias=True)))
+
+    with TestClient(app) as client:
+        client.portal.call(finished)
+
+    written = json.loads((tmp_path / "posts" / "offline-post.json").read_text())
+    assert written["title"] == "Offline post"
+    assert written["content"] == "About Offline post."
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["posts"] == {str(post.id): "posts/offline-post.json"}
+
+def test_empty_schedule_still_builds(mongo, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SNAPSHOT_ROOT", str(tmp_path))
+
+    async def schedule() -> None:
+        snapshot_service.schedule_build(mongo.test, [])
+        assert snapshot_service._task is not None
+        await finished()
+
+    asyncio.run(schedule())
+    assert (tmp_path / "manifest.json").exists()
+
+def test_tags_with_colliding_slugs_keep_separate_listings(mongo, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SNAPSHOT_ROOT", str(tmp_path))
+    posts = [published("Pointers", ["C"]), published("Templates", ["C++"]), published("Rust notes", ["Rust"])]
+
+    async def build():
+        await mongo.test.posts.insert_many([post.dict(by_alias=True) for post in posts])
+        await snapshot_service.build(mongo.test)
+
+    asyncio.run(build())
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    tags = manifest["tags"]
+    assert tags["Rust"] == "tags/rust"
+    assert tags["C"] != tags["C++"] and tags["C"].startswith("tags/c-") and tags["C++"].startswith("tags/c-")
+    for tag, title in (("C", "Pointers"), ("C++", "Templates")):
+        listing = json.loads((tmp_path / tags[tag] / "page" / "1.json").read_text())
+        assert [post["title"] for post in listing["posts"]] == [title]
+    assert not (tmp_path / "tags" / "c").exists()
@@ -0,0 +1,123 @@
+# backend/tests/test_services/test_throttle_service.py
+import asyncio
+
+import httpx
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.services import throttle_service
+
+@pytest.fixture(autouse=True)
+def forget_empty_buckets():
+    throttle_service._empty_until.clear()
+    yield
+    throttle_service._empty_until.clear()
+
+def test_bucket_allows_burst_then_waits(mongo):
+    db = mongo.test
+
+    async def attempts():
+        return [await throttle_service.take(db, "ip:198.51.100.7", 3, 6) for _ in range(5)]
+
+    waits = asyncio.run(attempts())
+
+    assert waits[:3] == [0, 0, 0]
+    # One token every 10 seconds
+    assert 9 < waits[3] <= 10
+    assert 0 < waits[4] <= waits[3]
+
+def test_ip_rejection_keeps_username_tokens(mongo, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_IP_BURST", 1)
+    monkeypatch.setattr(settings, "LOGIN_USER_BURST", 2)
+    db = mongo.test
+
+    async def attempts():
+        first = await throttle_service.check_login(db, "198.51.100.7", "Admin")
+        second = await throttle_service.check_login(db, "198.51.100.7", "admin")
+        other_ip = await throttle_service.check_login(db, "203.0.113.9", " ADMIN ")
+        return first, second, other_ip, await db.login_throttle.find_one(
+            {"_id": throttle_service._username_bucket("admin")}
+        )
+
+    first, second, other_ip, user_bucket = asyncio.run(attempts())
+
+    assert first == 0 and second > 0 and other_ip == 0
+    assert user_bucket["tokens"] == pytest.approx(0, abs=0.01)
+
+class RacingCollection:
+    """Raises DuplicateKeyError on the first upsert, as when another worker creates the bucket first."""
+    def __init__(self, collection, losses: int):
+        self.collection = collection
+        self.losses = losses
+        self.calls = []
+
+    async def find_one_and_update(self, *args, **kwargs):
+        self.calls.append(kwargs.get("upsert", False))
+        if self.losses:
+            self.losses -= 1
+            await self.collection.find_one_and_update(*args, **kwargs)
+            raise DuplicateKeyError("E11000 duplicate key error")
+        return await self.collection.find_one_and_update(*args, **kwargs)
+
+class RacingDatabase:
+    def __init__(self, login_throttle):
+        self.login_throttle = login_throttle
+
+@pytest.mark.parametrize("losses", [1, throttle_service.UPSERT_ATTEMPTS])
+def test_take_survives_losing_the_upsert_race(mongo, losses):
+    collection = RacingCollection(mongo.test.login_throttle, losses)
+
+    wait = asyncio.run(throttle_service.take(RacingDatabase(collection), "ip:198.51.100.7", 5, 6))
+
+    assert wait == 0
+    assert all(collection.calls)
+
+def test_login_answers_429_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_USER_BURST", 2)
+    credentials = {"username": "nobody", "password": "wrong"}
+
+    statuses = [client.post("/api/auth/login/json", json=credentials).status_code for _ in range(3)]
+    rejected = client.post("/api/auth/login/json", json=credentials)
+
+    assert statuses == [401, 401, 429]
+    assert rejected.status_code == 429
+    assert 1 <= int(rejected.headers["retry-after"]) <= 12
+
+@pytest.mark.parametrize("peer, forwarded_for, expected", [
+    ("10.0.0.2", "198.51.100.7", "198.51.100.7"),
+    # Entries left of the one the proxy appended are the client's own
+    ("10.0.0.2", "203.0.113.1, 198.51.100.7", "198.51.100.7"),
+    ("10.0.0.2", "10.9.9.9, 198.51.100.7, 10.0.0.3", "198.51.100.7"),
+    ("10.0.0.2", "10.0.0.3", "10.0.0.3"),
+    # A peer that is not a proxy is the client, whatever it sends
+    ("198.51.100.7", "203.0.113.1", "198.51.100.7"),
+    ("10.0.0.2", None, "10.0.0.2"),
+])
+def test_client_address_is_appended_by_trusted_proxy(monkeypatch, peer, forwarded_for, expected):
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["10.0.0.0/8"])
+
+    assert throttle_service.client_address(peer, forwarded_for) == expected
+
+def test_spoofed_forwarded_for_shares_the_ip_bucket(client, monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["10.0.0.0/8"])
+    monkeypatch.setattr(settings, "LOGIN_IP_BURST", 2)
+    monkeypatch.setattr(settings, "LOGIN_USER_BURST", 0)
+
+    async def attempts():
+        # Connections from the proxy, which appends the visitor's address
+        transport = httpx.ASGITransport(app=app, client=("10.0.0.2", 40000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as proxied:
+            statuses = []
+            for index in range(4):
+                response = await proxied.post(
+                    "/api/auth/login/json",
+                    json={"username": f"user{index}", "password": "wrong"},
+                    headers={"X-Forwarded-For": f"203.0.113.{index}, 198.51.100.7"},
+                )
+                statuses.append(response.status_code)
+            return statuses
+
+    assert client.portal.call(attempts) == [401, 401, 429, 429]
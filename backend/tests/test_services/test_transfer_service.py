@@ -0,0 +1,33 @@
+# backend/tests/test_services/test_transfer_service.py
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services import transfer_service
+
+def lines(*chunks):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [line async for line in transfer_service._lines(source())]
+
+    return asyncio.run(collect())
+
+def test_lines_span_chunks():
+    assert lines(b'{"a"', b": 1}\n{", b'"b": 2}\n\n', b'{"c": 3}') == [
+        (1, b'{"a": 1}'),
+        (2, b'{"b": 2}'),
+        (3, b""),
+        (4, b'{"c": 3}'),
+    ]
+
+def test_lines_rejects_line_over_upload_size(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 8)
+
+    with pytest.raises(transfer_service.ImportLineTooLongError) as excinfo:
+        lines(b"ok\n1234", b"56789", b"\n")
+
+    assert excinfo.value.line == 2
@@ -1,5 +1,5 @@
 // frontend/src/pages/PostDetail.jsx
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
 import { postsApi } from '../services/api';
 import { useAuth } from '../context/AuthContext';
@@ -7,6 +7,7 @@ import { marked } from 'marked';
 import { markedHighlight } from 'marked-highlight';
 import hljs from 'highlight.js';
 import markedKatex from 'marked-katex-extension';
+import renderMathInElement from 'katex/dist/contrib/auto-render';
 import './PostDetail.css';
 
 const PostDetail = () => {
@@ -17,6 +18,7 @@ const PostDetail = () => {
   const [post, setPost] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const contentRef = useRef(null);
 
   useEffect(() => {
     marked.use(
@@ -54,6 +56,21 @@ const PostDetail = () => {
     fetchPost();
   }, [slug]);
 
+  // Server-rendered HTML leaves highlighting and math to the browser
+  useEffect(() => {
+    if (!post?.content_html || !contentRef.current) return;
+    contentRef.current.querySelectorAll('pre code').forEach((block) => {
+      hljs.highlightElement(block);
+    });
+    renderMathInElement(contentRef.current, {
+      delimiters: [
+        { left: '\\[', right: '\\]', display: true },
+        { left: '\\(', right: '\\)', display: false },
+      ],
+      throwOnError: false,
+    });
+  }, [post]);
+
   const handleDelete = async () => {
     if (window.confirm('Are you sure you want to delete this post? This action cannot be undone.')) {
       try {
@@ -71,9 +88,10 @@ const PostDetail = () => {
     return new Date(dateString).toLocaleDateString(undefined, options);
   };
 
-  const renderContent = (content) => {
-    if (!content) return '';
-    return { __html: marked.parse(content) };
+  const renderContent = (post) => {
+    if (post.content_html) return { __html: post.content_html };
+    if (!post.content) return { __html: '' };
+    return { __html: marked.parse(post.content) };
   };
 
   return (
@@ -93,6 +111,7 @@ const PostDetail = () => {
             <div className="post-meta">
               <time>{formatDate(post.created_at)}</time>
               {post.updated_at !== post.created_at && <span>Updated: {formatDate(post.updated_at)}</span>}
+              {post.reading_time > 0 && <span>{post.reading_time} min read</span>}
             </div>
             {post.tags?.length > 0 && (
               <div className="post-tags">
@@ -109,7 +128,7 @@ const PostDetail = () => {
             )}
           </header>
           {post.featured_image && <img src={post.featured_image} alt={post.title} className="post-image" />}
-          <div className="post-content" dangerouslySetInnerHTML={renderContent(post.content)} />
+          <div className="post-content" ref={contentRef} dangerouslySetInnerHTML={renderContent(post)} />
         </article>
       ) : null}
     </div>
@@ -37,9 +37,9 @@ api.interceptors.response.use(
 
 // Posts API
 export const postsApi = {
-  // Get all posts
-  getPosts: (page = 1, pageSize = 10, tag = null, search = null) => {
-    let params = { page, page_size: pageSize };
+  // Get all posts (without content unless view is 'full')
+  getPosts: (page = 1, pageSize = 10, tag = null, search = null, view = 'summary') => {
+    let params = { page, page_size: pageSize, view };
     if (tag) params.tag = tag;
     if (search) params.search = search;
     
@@ -84,4 +84,10 @@ export const authApi = {
   initAdmin: () => api.post('/auth/init-admin'),
 };
 
+// Tags API
+export const tagsApi = {
+  // Get tags with post counts, most used first
+  getTags: () => api.get('/tags/'),
+};
+
 export default api;
\ No newline at end of file